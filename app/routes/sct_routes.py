@@ -4,7 +4,7 @@
     This module consists of application views
 """
 import flask_excel
-from flask import render_template, request, url_for, redirect
+from flask import render_template, request, url_for, redirect, jsonify, Response, stream_with_context
 from math import ceil
 from datetime import datetime
 import random
@@ -13,6 +13,14 @@ from flask_login import current_user
 from app.utilities.sct_env import *
 from app.utilities.sct_security import get_user_role
 from app.utilities.sct_mail import send_mail
+from app.utilities.sct_utils import (
+    csv_chunks,
+    encode_row_key,
+    decode_row_key,
+    get_audit_range,
+    get_search_filter
+)
+from app.utilities.databases.sct_timeout import QueryTimeoutError
 
 
 def define_routes(app):
@@ -27,6 +35,45 @@ def define_routes(app):
     audit_db = app.config["SCT_AUDIT_DB"]
     uploads = app.config["SCT_UPLOAD_HANDLER"]
 
+    @app.errorhandler(QueryTimeoutError)
+    def query_timeout(e):
+        """
+        Generate cancelled query page, cancellation is audited
+
+        :param e: Query timeout error
+        :return: Error Page <HTML>
+        """
+        app.logger.warning("Function: {}, {}".format(request.endpoint, e))
+        if current_user.get_id():
+            user_name = current_user.email
+        else:
+            user_name = None
+        user_role = get_user_role(user_name)
+
+        if request.endpoint == "audit":
+            table_name = sct_audit_db_table
+            back_url = url_for('audit')
+        else:
+            table_name = request.args.get("table_name")
+            back_url = url_for('data', table_name=table_name)
+
+        audit_db.add_audit(sct_audit_db_table, user_name, "QUERY_TIMEOUT", table_name, "CANCELLED", {
+            "endpoint": request.endpoint,
+            "operation": e.operation,
+            "timeout": e.timeout,
+            "query_args": request.args.to_dict(flat=False)
+        })
+        return render_template("error.html",
+                               error_code=504,
+                               error_title="Query Cancelled",
+                               error_message="{}. Narrow the search or try again later.".format(e),
+                               retry_url=request.full_path,
+                               back_url=back_url,
+                               logged_in_user=user_name,
+                               logged_user_role=user_role,
+                               current_server_time=datetime.now().strftime("%d %B, %Y %H:%M:%S (%A)")
+                               ), 504
+
     @app.route("/data", methods=["GET"])
     def data():
         """
@@ -49,23 +96,43 @@ def define_routes(app):
 
         table_name = request.args.get("table_name") if request.args.get("table_name") else table_list[0]
         page_num = int(request.args.get("page_num")) if request.args.get("page_num") else 1
-        app.logger.info("Dataset - table_name = {}, page_num = {}".format(table_name, page_num))
-
-        search_col = request.args.get("search_col") if request.args.get("search_col") else None
-        search_op = request.args.get("search_op") if request.args.get("search_op") else None
-        search_val = request.args.get("search_val") if request.args.get("search_val") else None
-        app.logger.info("Search - Column: {}, Operator: {}, Value: {} ({})".format(
-            search_col,
-            search_op,
-            search_val,
-            str(type(search_val))
-        ))
-
-        if search_col and search_op and search_val:
-            table_details = audit_db.search_table_info(
-                table_name, search_col, search_op, search_val, page_num, int(sct_ui_pagesize))
-        else:
-            table_details = db.get_table_info(table_name, page_num, int(sct_ui_pagesize))
+        page_cursor = request.args.get("cursor") if request.args.get("cursor") else None
+        app.logger.info("Dataset - table_name = {}, page_num = {}, cursor = {}".format(
+            table_name, page_num, page_cursor))
+
+        search_filter = get_search_filter(request.args.getlist("search_col"), request.args.getlist("search_op"),
+                                          request.args.getlist("search_val"))
+        search_col, search_op, search_val = [[p[i] for p in search_filter] for i in range(3)]
+        search_match = request.args.get("search_match") if request.args.get("search_match") else "all"
+        app.logger.info("Search - Filter: {}, Match: {}".format(search_filter, search_match))
+
+        sort_col = request.args.get("sort_col") if request.args.get("sort_col") else None
+        sort_dir = ("desc" if request.args.get("sort_dir") == "desc" else "asc") if sort_col else None
+        app.logger.info("Sort - Column: {}, Direction: {}".format(sort_col, sort_dir))
+        if sort_col and sort_col not in db.get_table_columns(table_name)["view"]:
+            app.logger.warning("Invalid sort column {}, showing primary key order".format(sort_col))
+            return redirect(url_for(
+                'data', table_name=table_name, search_col=search_col, search_op=search_op,
+                search_val=search_val, search_match=search_match))
+
+        try:
+            if search_filter:
+                table_details = db.search_table_info(
+                    table_name, search_filter, page_num, int(sct_ui_pagesize), page_cursor, search_match,
+                    sort_col, sort_dir == "desc")
+            else:
+                table_details = db.get_table_info(table_name, page_num, int(sct_ui_pagesize), page_cursor,
+                                                  sort_col, sort_dir == "desc")
+        except ValueError as e:
+            if page_cursor:
+                app.logger.warning("Invalid page cursor {}, showing first page".format(page_cursor))
+                return redirect(url_for(
+                    'data', table_name=table_name, search_col=search_col, search_op=search_op,
+                    search_val=search_val, search_match=search_match, sort_col=sort_col, sort_dir=sort_dir))
+            if not search_filter:
+                raise
+            app.logger.warning("Invalid search filter {} ({}), showing table".format(search_filter, e))
+            return redirect(url_for('data', table_name=table_name, search_error=str(e)))
 
         app.logger.debug("Table details: {}".format(table_details))
 
@@ -73,6 +140,13 @@ def define_routes(app):
                       1 if page_num < 1 else ceil(table_details["table_count"] / sct_ui_pagesize))
         app.logger.info("Current Page: {}".format(current_pg))
 
+        # Rows of tables with primary key carry their key, so edit and delete target the row directly
+        pk_columns = table_details["pk_columns"]
+        if pk_columns and all(col in table_details["view_columns"] for col in pk_columns):
+            row_key_list = [encode_row_key([row[col] for col in pk_columns]) for row in table_details["table_data"]]
+        else:
+            row_key_list = []
+
         audit_db.add_audit(sct_audit_db_table, user_name, "READ_TABLE", table_name, "SUCCESS", {
             "page_num": page_num,
             "current_page": current_pg,
@@ -85,13 +159,30 @@ def define_routes(app):
                                table_name=table_name,
                                table_list=table_list,
                                table_count=table_details["table_count"],
+                               count_estimated=table_details["count_estimated"],
                                view_column_list=(table_details["view_columns"]).keys(),
                                insert_column_list=table_details["insert_columns"],
                                pk_column_list=table_details["pk_columns"],
+                               fk_column_list=table_details["fk_columns"],
+                               indexed_column_list=table_details["indexed_columns"],
                                data_list=table_details["table_data"],
+                               row_key_list=row_key_list,
+                               page_cursor=page_cursor,
+                               next_cursor=table_details["next_cursor"],
+                               prev_cursor=table_details["prev_cursor"],
+                               last_cursor=table_details["last_cursor"],
+                               search_filter=search_filter,
                                search_col=search_col,
                                search_op=search_op,
                                search_val=search_val,
+                               search_match=search_match,
+                               search_sampled=table_details.get("search_sampled"),
+                               search_prefix_columns=table_details.get("search_prefix_columns"),
+                               search_sample_size=sct_ui_search_sample_size,
+                               search_error=request.args.get("search_error"),
+                               sort_col=sort_col,
+                               sort_dir=sort_dir,
+                               sort_indexed=table_details["sort_indexed"],
                                logged_in_user=user_name,
                                logged_user_role=user_role,
                                current_server_time=datetime.now().strftime("%d %B, %Y %H:%M:%S (%A)")
@@ -121,24 +212,22 @@ def define_routes(app):
         page_num = int(request.args.get("page_num")) if request.args.get("page_num") else 1
         app.logger.info("Dataset - table_name = {}, page_num = {}".format(table_name, page_num))
 
-        search_col = request.args.get("search_col") if request.args.get("search_col") else None
-        search_op = request.args.get("search_op") if request.args.get("search_op") else None
-        search_val = request.args.get("search_val") if request.args.get("search_val") else None
-        app.logger.info("Search - Column: {}, Operator: {}, Value: {} ({})".format(
-            search_col,
-            search_op,
-            search_val,
-            str(type(search_val))
-        ))
+        search_filter = get_search_filter(request.args.getlist("search_col"), request.args.getlist("search_op"),
+                                          request.args.getlist("search_val"))
+        search_col, search_op, search_val = [[p[i] for p in search_filter] for i in range(3)]
+        search_match = request.args.get("search_match") if request.args.get("search_match") else "all"
+        app.logger.info("Search - Filter: {}, Match: {}".format(search_filter, search_match))
 
         audit_db.add_audit(sct_audit_db_table, user_name, "SEARCH_TABLE", table_name, "SUCCESS", {
             "Column": search_col,
             "Operator": search_op,
-            "Value": search_val
+            "Value": search_val,
+            "Match": search_match
         })
         return redirect(url_for(
             'data', table_name=table_name, search_col=search_col, search_op=search_op,
-            search_val=search_val))
+            search_val=search_val, search_match=search_match, sort_col=request.args.get("sort_col"),
+            sort_dir=request.args.get("sort_dir")))
 
     @app.route("/audit", methods=["GET"])
     def audit():
@@ -172,11 +261,48 @@ def define_routes(app):
             str(type(audit_search_val))
         ))
 
+        audit_from, audit_to = get_audit_range(request.args.get("audit_from"), request.args.get("audit_to"))
+        app.logger.info("Audit time range - From: {}, To: {}".format(audit_from, audit_to))
+
+        audit_text = request.args.get("audit_text") if request.args.get("audit_text") else None
+        audit_cursor = request.args.get("audit_cursor") if request.args.get("audit_cursor") else None
+        if audit_text:
+            app.logger.info("Text search - Text: {}, Cursor: {}".format(audit_text, audit_cursor))
+            try:
+                audit_details = audit_db.search_audit_text(
+                    sct_audit_db_table, audit_text, sct_ui_pagesize, audit_cursor, audit_from, audit_to)
+            except ValueError:
+                if not audit_cursor:
+                    raise
+                app.logger.warning("Invalid audit cursor {}, showing first page".format(audit_cursor))
+                return redirect(url_for('audit', audit_text=audit_text, audit_from=audit_from, audit_to=audit_to))
+            app.logger.debug("Audits: {}".format(audit_details))
+
+            audit_db.add_audit(sct_audit_db_table, user_name, "READ_AUDIT", sct_audit_db_table, "SUCCESS", {
+                "audit_text": audit_text,
+                "audit_cursor": audit_cursor,
+                "audit_count": len(audit_details["audits_data"])
+            })
+            return render_template("audits.html",
+                                   record_count=len(audit_details["audits_data"]),
+                                   table_list=table_list,
+                                   data_list=audit_details["audits_data"],
+                                   audit_text=audit_text,
+                                   audit_cursor=audit_cursor,
+                                   next_cursor=audit_details["next_cursor"],
+                                   audit_from=audit_from,
+                                   audit_to=audit_to,
+                                   logged_in_user=user_name,
+                                   logged_user_role=user_role,
+                                   current_server_time=datetime.now().strftime("%d %B, %Y %H:%M:%S (%A)")
+                                   )
+
         if audit_search_col and audit_search_op and audit_search_val:
             audit_details = audit_db.search_audits(
-                sct_audit_db_table, audit_search_col, audit_search_op, audit_search_val, page_num, sct_ui_pagesize)
+                sct_audit_db_table, audit_search_col, audit_search_op, audit_search_val, page_num, sct_ui_pagesize,
+                audit_from, audit_to)
         else:
-            audit_details = audit_db.get_audits(sct_audit_db_table, page_num, sct_ui_pagesize)
+            audit_details = audit_db.get_audits(sct_audit_db_table, page_num, sct_ui_pagesize, audit_from, audit_to)
         app.logger.debug("Audits: {}".format(audit_details))
         current_pg = (page_num if 0 < page_num <= ceil(audit_details["audits_count"] / sct_ui_pagesize) else
                       1 if page_num < 1 else ceil(audit_details["audits_count"] / sct_ui_pagesize))
@@ -197,6 +323,8 @@ def define_routes(app):
                                audit_search_col=audit_search_col,
                                audit_search_op=audit_search_op,
                                audit_search_val=audit_search_val,
+                               audit_from=audit_from,
+                               audit_to=audit_to,
                                logged_in_user=user_name,
                                logged_user_role=user_role,
                                current_server_time=datetime.now().strftime("%d %B, %Y %H:%M:%S (%A)")
@@ -227,20 +355,24 @@ def define_routes(app):
         audit_search_col = request.args.get("audit_search_col") if request.args.get("audit_search_col") else None
         audit_search_op = request.args.get("audit_search_op") if request.args.get("audit_search_op") else None
         audit_search_val = request.args.get("audit_search_val") if request.args.get("audit_search_val") else None
-        app.logger.info("Search - Column: {}, Operator: {}, Value: {}".format(
+        audit_text = request.args.get("audit_text") if request.args.get("audit_text") else None
+        app.logger.info("Search - Column: {}, Operator: {}, Value: {}, Text: {}".format(
             audit_search_col,
             audit_search_op,
-            audit_search_val
+            audit_search_val,
+            audit_text
         ))
 
         audit_db.add_audit(sct_audit_db_table, user_name, "SEARCH_AUDIT", sct_audit_db_table, "SUCCESS", {
             "Column": audit_search_col,
             "Operator": audit_search_op,
-            "Value": audit_search_val
+            "Value": audit_search_val,
+            "Text": audit_text
         })
         return redirect(url_for(
             'audit', audit_search_col=audit_search_col, audit_search_op=audit_search_op,
-            audit_search_val=audit_search_val))
+            audit_search_val=audit_search_val, audit_text=audit_text, audit_from=request.args.get("audit_from"),
+            audit_to=request.args.get("audit_to")))
 
     @app.route("/api/add", methods=["POST"])
     def api_add():
@@ -296,34 +428,55 @@ def define_routes(app):
         table_name = request.args.get("table_name")
         page_num = int(request.args.get("page_num"))
         element_id = int(request.form["id"])
-        app.logger.info("Deleted record detail - table_name = {}, page_num = {}, element_id = {}".format(table_name,
-                                                                                                         page_num,
-                                                                                                         element_id))
-        search_col = request.args.get("search_col") if request.args.get("search_col") else None
-        search_op = request.args.get("search_op") if request.args.get("search_op") else None
-        search_val = request.args.get("search_val") if request.args.get("search_val") else None
-        app.logger.info("Search - Column: {}, Operator: {}, Value: {} ({})".format(
-            search_col,
-            search_op,
-            search_val,
-            str(type(search_val))
-        ))
-
-        if search_col and search_op and search_val:
-            table_details = audit_db.search_table_info(
-                table_name, search_col, search_op, search_val, page_num, int(sct_ui_pagesize))
+        row_key = request.form.get("row_key") if request.form.get("row_key") else None
+        app.logger.info("Deleted record detail - table_name = {}, page_num = {}, element_id = {}, row_key = {}".format(
+            table_name, page_num, element_id, row_key))
+
+        if row_key:
+            # Row carries its primary key, delete it by key
+            pk_columns = db.get_table_columns(table_name)["pk_columns"]
+            try:
+                rec_to_delete = dict(zip(pk_columns, decode_row_key(row_key, len(pk_columns))))
+            except ValueError:
+                app.logger.warning("Invalid row key {} for table {}.".format(row_key, table_name))
+                return redirect(url_for('data', table_name=table_name))
         else:
-            table_details = db.get_table_info(table_name, page_num, int(sct_ui_pagesize))
-        app.logger.debug("Table details: {}".format(table_details))
-
-        rec_to_delete = table_details["table_data"][element_id]
+            search_filter = get_search_filter(request.args.getlist("search_col"), request.args.getlist("search_op"),
+                                              request.args.getlist("search_val"))
+            search_match = request.args.get("search_match") if request.args.get("search_match") else "all"
+            app.logger.info("Search - Filter: {}, Match: {}".format(search_filter, search_match))
+
+            # Row index refers to page as shown, so page is fetched in its shown order and position
+            page_cursor = request.args.get("cursor") if request.args.get("cursor") else None
+            sort_col = request.args.get("sort_col") if request.args.get("sort_col") else None
+            sort_desc = request.args.get("sort_dir") == "desc"
+            app.logger.info("Page - Cursor: {}, Sort: {} ({})".format(page_cursor, sort_col, sort_desc))
+
+            try:
+                if search_filter:
+                    table_details = db.search_table_info(
+                        table_name, search_filter, page_num, int(sct_ui_pagesize), page_cursor, search_match,
+                        sort_col, sort_desc)
+                else:
+                    table_details = db.get_table_info(table_name, page_num, int(sct_ui_pagesize), page_cursor,
+                                                      sort_col, sort_desc)
+            except ValueError as e:
+                app.logger.warning("Page of record {} of table {} can not be fetched: {}".format(
+                    element_id, table_name, e))
+                return redirect(url_for('data', table_name=table_name))
+            app.logger.debug("Table details: {}".format(table_details))
+
+            rec_to_delete = table_details["table_data"][element_id]
         app.logger.info("Deleted record: {}".format(rec_to_delete))
 
-        db.drop_table_record(table_name, **rec_to_delete)
+        rec_deleted = db.drop_table_record(table_name, **rec_to_delete)
+        if rec_deleted is None:
+            app.logger.warning("Record {} not found in table {}.".format(rec_to_delete, table_name))
+            return redirect(url_for('data', table_name=table_name))
         app.logger.info("Successfully deleted record.")
 
         audit_db.add_audit(sct_audit_db_table, user_name, "DELETE_ROW", table_name, "SUCCESS", {
-            "record_deleted": rec_to_delete
+            "record_deleted": rec_deleted
         })
         return redirect(url_for('data', table_name=table_name))
 
@@ -346,50 +499,137 @@ def define_routes(app):
         table_name = request.args.get("table_name")
         page_num = int(request.args.get("page_num"))
         element_id = int(request.form["id"])
-        app.logger.info("Update record detail - table_name = {}, page_num = {}, element_id = {}".format(table_name,
-                                                                                                        page_num,
-                                                                                                        element_id))
-
-        search_col = request.args.get("search_col") if request.args.get("search_col") else None
-        search_op = request.args.get("search_op") if request.args.get("search_op") else None
-        search_val = request.args.get("search_val") if request.args.get("search_val") else None
-        app.logger.info("Search - Column: {}, Operator: {}, Value: {} ({})".format(
-            search_col,
-            search_op,
-            search_val,
-            str(type(search_val))
-        ))
-
-        if search_col and search_op and search_val:
-            table_details = audit_db.search_table_info(
-                table_name, search_col, search_op, search_val, page_num, int(sct_ui_pagesize))
-        else:
-            table_details = db.get_table_info(table_name, page_num, int(sct_ui_pagesize))
-        app.logger.debug("Table details: {}".format(table_details))
-
-        rec_to_edit = table_details["table_data"][element_id]
-        app.logger.info("Edit record (Initial Version): {}".format(rec_to_edit))
-
-        parm_dict = dict()
-        for col in table_details["insert_columns"].keys():
-            if col not in table_details["pk_columns"] and len(request.form[col]):
-                app.logger.debug("Getting column value from HTTP request.")
-                parm_dict[col] = request.form[col]
-            else:
-                app.logger.debug("Getting column value from current DB data.")
-                parm_dict[col] = rec_to_edit[col]
-
-        app.logger.info("Edit record (Updated Version): {}".format(parm_dict))
-
-        db.edit_table_record(table_name, **parm_dict)
+        row_key = request.form.get("row_key") if request.form.get("row_key") else None
+        app.logger.info("Update record detail - table_name = {}, page_num = {}, element_id = {}, row_key = {}".format(
+            table_name, page_num, element_id, row_key))
+
+        if not row_key:
+            app.logger.warning("Record {} of table {} has no primary key, can not be edited.".format(
+                element_id, table_name))
+            return redirect(url_for('data', table_name=table_name))
+
+        column_details = db.get_table_columns(table_name)
+        pk_columns = column_details["pk_columns"]
+        try:
+            parm_dict = dict(zip(pk_columns, decode_row_key(row_key, len(pk_columns))))
+        except ValueError:
+            app.logger.warning("Invalid row key {} for table {}.".format(row_key, table_name))
+            return redirect(url_for('data', table_name=table_name))
+
+        # Columns left empty keep their current value
+        for col in column_details["insert"].keys():
+            if col not in pk_columns:
+                parm_dict[col] = request.form[col] if len(request.form[col]) else None
+        app.logger.info("Edit record (Requested Version): {}".format(parm_dict))
+
+        record_before, record_after = db.edit_table_record(table_name, **parm_dict)
+        if record_before is None:
+            app.logger.warning("Record {} not found in table {}.".format(row_key, table_name))
+            return redirect(url_for('data', table_name=table_name))
         app.logger.info("Successfully updated record.")
 
         audit_db.add_audit(sct_audit_db_table, user_name, "UPDATE_ROW", table_name, "SUCCESS", {
-            "record_before": rec_to_edit,
-            "record_after": parm_dict
+            "record_before": record_before,
+            "record_after": record_after
         })
         return redirect(url_for('data', table_name=table_name))
 
+    @app.route("/api/bulk", methods=["POST"])
+    def api_bulk():
+        """
+        Bulk row edit and delete API
+        .. admonition:: Note
+            Request body is JSON with table_name and a list of changes, each having operation (edit or delete),
+            row identified by row_key token or by primary key column values in key, and for edits new column
+            values in values (empty values keep current column value). All changes are applied in a single
+            transaction and recorded as a single audit.
+
+        :return: Change summary <JSON>
+        """
+        app.logger.info("Function: api_bulk, user {}".format(current_user.get_id()))
+        if current_user.get_id():
+            user_name = current_user.email
+            app.logger.info("Email: {}".format(user_name))
+        else:
+            user_name = None
+        user_role = get_user_role(user_name)
+        app.logger.info("User {} has assigned role {}".format(user_name, user_role))
+        if user_role not in ["ADMIN", "OPERATOR"]:
+            return jsonify({"error": "Unauthorized"}), 403
+
+        request_body = request.get_json(silent=True) or dict()
+        table_name = request_body.get("table_name")
+        changes = request_body.get("changes")
+        if not table_name or not isinstance(changes, list) or not changes:
+            return jsonify({"error": "Request must have table_name and a list of changes"}), 400
+        if len(changes) > sct_ui_bulk_change_size:
+            return jsonify({"error": "Max {} changes allowed per request".format(sct_ui_bulk_change_size)}), 400
+        app.logger.info("Bulk change - table_name = {}, changes = {}".format(table_name, len(changes)))
+
+        column_details = db.get_table_columns(table_name)
+        pk_columns = column_details["pk_columns"]
+        if not pk_columns:
+            return jsonify({"error": "Table {} has no primary key".format(table_name)}), 400
+
+        # Validate every change before touching table
+        row_changes = []
+        try:
+            for change in changes:
+                operation = change.get("operation") if isinstance(change, dict) else None
+                if operation not in ["edit", "delete"]:
+                    raise ValueError("Invalid operation {}".format(operation))
+                if change.get("row_key"):
+                    parm_dict = dict(zip(pk_columns, decode_row_key(change["row_key"], len(pk_columns))))
+                else:
+                    key = change.get("key") if isinstance(change.get("key"), dict) else dict()
+                    if sorted(key.keys()) != sorted(pk_columns):
+                        raise ValueError("Change must identify row by primary key {}".format(pk_columns))
+                    parm_dict = {col: key[col] for col in pk_columns}
+                if operation == "edit":
+                    values = change.get("values") if isinstance(change.get("values"), dict) else dict()
+                    for col in values.keys():
+                        if col not in column_details["insert"] or col in pk_columns:
+                            raise ValueError("Column {} can not be edited".format(col))
+                    for col in column_details["insert"].keys():
+                        if col not in pk_columns:
+                            parm_dict[col] = values[col] if values.get(col) not in [None, ""] else None
+                row_changes.append((operation, parm_dict))
+        except ValueError as e:
+            return jsonify({"error": "Change {}: {}".format(len(row_changes), e)}), 400
+
+        try:
+            results = db.change_table_records(table_name, row_changes)
+        except Exception as e:
+            app.logger.error("Bulk change of table {} failed: {}".format(table_name, e))
+            audit_db.add_audit(sct_audit_db_table, user_name, "BULK_CHANGE", table_name, "FAILED", {
+                "changes": len(row_changes),
+                "error": str(e)
+            })
+            return jsonify({"error": "Bulk change failed, no row was changed: {}".format(e)}), 500
+
+        records_updated, records_deleted, not_found = [], [], []
+        for i, ((operation, _), result) in enumerate(zip(row_changes, results)):
+            if operation == "edit" and result[0] is not None:
+                records_updated.append({"record_before": result[0], "record_after": result[1]})
+            elif operation == "delete" and result is not None:
+                records_deleted.append(result)
+            else:
+                not_found.append(i)
+        app.logger.info("Bulk change updated {}, deleted {}, not found {} records.".format(
+            len(records_updated), len(records_deleted), len(not_found)))
+
+        audit_db.add_audit(sct_audit_db_table, user_name, "BULK_CHANGE", table_name, "SUCCESS", {
+            "records_updated": records_updated,
+            "records_deleted": records_deleted,
+            "changes_not_found": not_found
+        })
+        return jsonify({
+            "table_name": table_name,
+            "updated": len(records_updated),
+            "deleted": len(records_deleted),
+            "not_found": not_found
+        })
+
     @app.route("/api/upload", methods=["POST"])
     def api_upload():
         """
@@ -420,6 +660,7 @@ def define_routes(app):
         uploads.save(request.files["file"], name=file_name)
         app.logger.info("Uploaded file saved as {}".format(file_name))
 
+        audit_db.add_bulk_job(sct_scheduler_job_table, table_name, file_name, user_name)
         audit_db.add_audit(sct_audit_db_table, user_name, "BULK_UPLOAD", table_name, "UPLOADED", {
             "file_name": file_name
         })
@@ -448,32 +689,137 @@ def define_routes(app):
         table_col_details = db.get_table_columns(table_name, False)
         app.logger.debug("Table columns details: {}".format(table_col_details))
 
-        if with_data:
-            op_type = "DOWNLOAD_DATA"
-            table_data = db.get_table_data(table_name,
-                                           table_col_details["view"].keys(),
-                                           table_col_details["pk_columns"],
-                                           sct_ui_download_size)
-            app.logger.debug("Table data: {}".format(table_data))
-
-            download_data = [table_col_details["view"].keys()]
-            for rw in table_data:
-                download_data.append(list(rw))
-        else:
-            op_type = "DOWNLOAD_TEMPLATE"
-            download_data = [table_col_details["insert"].keys()]
-        app.logger.debug("Download data: {}".format(download_data))
-
         file_name = "{}_{}_{}_{}.csv".format(sct_db_name,
                                              sct_db_schema,
                                              table_name,
                                              datetime.now().strftime("%Y%m%d_%H%M"))
         app.logger.info("Downloaded file name {}".format(file_name))
-        audit_db.add_audit(sct_audit_db_table, user_name, op_type, table_name, "SUCCESS", {
-            "file_name": file_name,
-            "total_rows": len(download_data)
+
+        if not with_data:
+            download_data = [table_col_details["insert"].keys()]
+            app.logger.debug("Download data: {}".format(download_data))
+            audit_db.add_audit(sct_audit_db_table, user_name, "DOWNLOAD_TEMPLATE", table_name, "SUCCESS", {
+                "file_name": file_name,
+                "total_rows": len(download_data)
+            })
+            return flask_excel.make_response_from_array(download_data, file_type="csv", status=200,
+                                                        file_name=file_name)
+
+        def download_stream():
+            counter = {"rows": 0}
+            status = "FAILED"
+            try:
+                yield from csv_chunks(list(table_col_details["view"].keys()),
+                                      db.stream_table_data(table_name,
+                                                           table_col_details["view"].keys(),
+                                                           table_col_details["pk_columns"],
+                                                           sct_ui_download_size,
+                                                           sct_ui_download_fetch_size),
+                                      counter)
+                status = "SUCCESS"
+            except QueryTimeoutError as e:
+                app.logger.warning("Download of {} cancelled: {}".format(table_name, e))
+                status = "CANCELLED"
+                raise
+            finally:
+                app.logger.info("Downloaded {} rows of {} ({})".format(counter["rows"], table_name, status))
+                audit_db.add_audit(sct_audit_db_table, user_name, "DOWNLOAD_DATA", table_name, status, {
+                    "file_name": file_name,
+                    # Header row counted, as for template download
+                    "total_rows": counter["rows"] + 1
+                })
+
+        return Response(stream_with_context(download_stream()), status=200, mimetype="text/csv",
+                        headers={"Content-Disposition": "attachment; filename={}".format(file_name)})
+
+    @app.route("/api/lookup", methods=["GET"])
+    def api_lookup():
+        """
+        FK column typeahead lookup API
+
+        :return: Lookup values <JSON>
+        """
+        app.logger.info("Function: api_lookup, user {}".format(current_user.get_id()))
+        if current_user.get_id():
+            user_name = current_user.email
+        else:
+            user_name = None
+        user_role = get_user_role(user_name)
+        if user_role == "NONE":
+            return jsonify({"error": "Unauthorized"}), 403
+
+        table_name = request.args.get("table_name")
+        column_name = request.args.get("column_name")
+        prefix = request.args.get("prefix") if request.args.get("prefix") else ""
+        page_num = int(request.args.get("page_num")) if request.args.get("page_num") else 1
+        app.logger.info("Lookup - table_name = {}, column_name = {}, prefix = {}, page_num = {}".format(
+            table_name, column_name, prefix, page_num))
+
+        try:
+            lookup_details = db.get_fk_lookup(table_name, column_name, prefix, page_num, sct_ui_lookup_size)
+        except ValueError:
+            return jsonify({"error": "Invalid lookup prefix {} for column {}".format(prefix, column_name)}), 400
+        app.logger.debug("Lookup details: {}".format(lookup_details))
+
+        return jsonify({
+            "table_name": table_name,
+            "column_name": column_name,
+            "prefix": prefix,
+            "page_num": page_num,
+            "values": lookup_details["values"],
+            "has_more": lookup_details["has_more"]
+        })
+
+    @app.route("/api/refresh", methods=["POST"])
+    def api_refresh():
+        """
+        Refresh cached table metadata API
+
+        :return: Table Page <HTML>
+        """
+        app.logger.info("Function: api_refresh, user {}".format(current_user.get_id()))
+        if current_user.get_id():
+            user_name = current_user.email
+            app.logger.info("Email: {}".format(user_name))
+        else:
+            user_name = None
+        user_role = get_user_role(user_name)
+        app.logger.info("User {} has assigned role {}".format(user_name, user_role))
+        if user_role != "ADMIN":
+            return "Schema refresh requires ADMIN role", 403
+
+        table_name = request.args.get("table_name") if request.args.get("table_name") else None
+        app.logger.info("Table to refresh {}".format(table_name if table_name else "ALL"))
+
+        refreshed = db.refresh_table_columns(table_name)
+        app.logger.info("Dropped {} cached table metadata.".format(refreshed))
+
+        audit_db.add_audit(sct_audit_db_table, user_name, "REFRESH_SCHEMA", table_name if table_name else "ALL",
+                           "SUCCESS", {
+                               "tables_refreshed": refreshed
+                           })
+        return redirect(url_for('data', table_name=table_name))
+
+    @app.route("/api/pool", methods=["GET"])
+    def api_pool():
+        """
+        Connection pool statistics API
+
+        :return: Pool statistics <JSON>
+        """
+        app.logger.info("Function: api_pool, user {}".format(current_user.get_id()))
+        if current_user.get_id():
+            user_name = current_user.email
+        else:
+            user_name = None
+        user_role = get_user_role(user_name)
+        if user_role != "ADMIN":
+            return jsonify({"error": "Unauthorized"}), 403
+
+        return jsonify({
+            "data": db.pool_stats(),
+            "audit": audit_db.pool_stats()
         })
-        return flask_excel.make_response_from_array(download_data, file_type="csv", status=200, file_name=file_name)
 
     @app.route("/register", methods=["GET"])
     def register():
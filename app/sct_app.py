@@ -20,7 +20,7 @@ from app.utilities.sct_logging import logger_conf_dict
 from app.routes.sct_routes import define_routes
 from app.utilities.sct_security import define_security
 from app.utilities.sct_mail import enable_email_support
-from app.utilities.sct_schedules import sct_scheduled_bulk_loader
+from app.utilities.sct_schedules import sct_scheduled_bulk_loader, sct_scheduled_audit_maintenance
 
 # Create Application
 # # Initiate application
@@ -43,7 +43,19 @@ app.config["SCT_UPLOAD_HANDLER"] = files_uploads
 # # Initiate scheduler
 def sct_scheduled_tasks():
     """SCT Scheduled Tasks"""
-    sct_scheduled_bulk_loader(app)
+    try:
+        sct_scheduled_bulk_loader(app)
+    finally:
+        (app.config["SCT_DATA_DB"]).release()
+        (app.config["SCT_AUDIT_DB"]).release()
+
+
+def sct_scheduled_audit_tasks():
+    """SCT Scheduled Audit Tasks"""
+    try:
+        sct_scheduled_audit_maintenance(app)
+    finally:
+        (app.config["SCT_AUDIT_DB"]).release()
 
 
 class Config:
@@ -54,7 +66,13 @@ class Config:
         "trigger": "interval",
         "seconds": int(sct_scheduler_interval_value)
     }
-    JOBS = [sct_sch_cfg]
+    sct_audit_sch_cfg = {
+        "id": "job2",
+        "func": sct_scheduled_audit_tasks,
+        "trigger": "interval",
+        "seconds": sct_audit_maintenance_interval
+    }
+    JOBS = [sct_sch_cfg, sct_audit_sch_cfg] if sct_audit_partition or sct_audit_retention_months > 0 else [sct_sch_cfg]
     SCHEDULER_API_ENABLED = True
 
 
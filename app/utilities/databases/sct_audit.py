@@ -0,0 +1,426 @@
+"""
+    sct_audit.py
+    -------
+    This module consists of audit policy, asynchronous audit writer and audit archival helpers shared by all SCT
+    database backends
+"""
+import os
+import re
+import csv
+import time
+import gzip
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from app.utilities.sct_env import (
+    sct_audit_queue_size,
+    sct_audit_queue_timeout,
+    sct_audit_batch_size,
+    sct_audit_flush_interval,
+    sct_audit_policy,
+    sct_audit_sample_rate,
+    sct_audit_aggregate_window,
+    sct_audit_archive_dir
+)
+
+logger = logging.getLogger(__name__)
+
+SCT_AUDIT_POLICIES = ["full", "sample", "aggregate"]
+SCT_AUDIT_READ_OPERATIONS = ["READ_TABLE", "SEARCH_TABLE", "READ_AUDIT", "SEARCH_AUDIT"]
+# # Audit table indexes (name suffix, columns), serving operation status, per table and per user audit lookups
+SCT_AUDIT_INDEXES = [
+    ("operation_status", "operation_performed, operation_status"),
+    ("table_time", "table_name, audit_time"),
+    ("user_time", "audit_user, audit_time"),
+    ("time", "audit_time")
+]
+
+
+def audit_indexes(audit_table: str) -> list:
+    """
+    Audit table index names and columns
+
+    :param audit_table: Audit table name
+    :return: List of (index name, comma separated columns)
+    """
+    return [("{}_{}_idx".format(audit_table, suffix), columns) for suffix, columns in SCT_AUDIT_INDEXES]
+
+
+def audit_text_terms(audit_text: str, max_terms: int = 16) -> list:
+    """
+    Words of an audit metadata text search, split the way full text indexes tokenize metadata
+
+    :param audit_text: Searched text
+    :param max_terms: Max words kept
+    :return: List of words, all of which a matching audit contains
+    """
+    return re.findall(r"[^\W_]+", audit_text or "")[:max_terms]
+
+
+def month_start(value: datetime, months: int = 0) -> datetime:
+    """
+    First instant of month of a time, shifted by a number of months
+
+    :param value: Time
+    :param months: Months to shift by, negative for past months
+    :return: Month start
+    """
+    month = value.year * 12 + value.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1)
+
+
+def audit_time_condition(audit_from: str = None, audit_to: str = None) -> str:
+    """
+    Audit time range condition, literal bounds letting partitioned audit tables be pruned while planning
+
+    :param audit_from: Oldest audit date (YYYY-MM-DD), included
+    :param audit_to: Newest audit date (YYYY-MM-DD), included
+    :return: SQL condition, empty if no bound is given
+    """
+    time_cond = []
+    if audit_from:
+        time_cond.append("audit_time >= '{}'".format(
+            datetime.strptime(audit_from, "%Y-%m-%d").strftime("%Y-%m-%d %H:%M:%S")))
+    if audit_to:
+        time_cond.append("audit_time < '{}'".format(
+            (datetime.strptime(audit_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")))
+    return " AND ".join(time_cond)
+
+
+def archive_audits(audit_table: str, period: str, write_fn, archive_dir: str = sct_audit_archive_dir) -> str:
+    """
+    Archive audits of a period to a gzip compressed CSV file, written under a temporary name until complete
+
+    :param audit_table: Audit table name
+    :param period: Period name
+    :param write_fn: Callable taking a text file object and writing audits as CSV into it
+    :param archive_dir: Archive directory, audits are not archived if empty
+    :return: Archive file path, None if audits are not archived
+    """
+    if not archive_dir:
+        return None
+    os.makedirs(archive_dir, exist_ok=True)
+    file_path = os.path.join(archive_dir, "{}_{}.csv.gz".format(audit_table, period))
+    archive_num = 1
+    while os.path.exists(file_path):
+        # Audits of period archived again, e.g. from default partition
+        file_path = os.path.join(archive_dir, "{}_{}_{}.csv.gz".format(audit_table, period, archive_num))
+        archive_num += 1
+    with gzip.open(file_path + ".tmp", "wt", newline="") as file:
+        write_fn(file)
+    os.replace(file_path + ".tmp", file_path)
+    return file_path
+
+
+def write_audit_csv(curs, file, fetch_size: int = 1000):
+    """
+    Write audits fetched by an executed cursor as CSV, header being cursor column names
+
+    :param curs: Executed DB API cursor
+    :param file: Text file object
+    :param fetch_size: Rows fetched per batch
+    :return: None
+    """
+    writer = csv.writer(file)
+    writer.writerow([col[0] for col in curs.description])
+    rows = curs.fetchmany(fetch_size)
+    while rows:
+        writer.writerows(rows)
+        rows = curs.fetchmany(fetch_size)
+
+
+class AuditQueueFullError(Exception):
+    """
+        Raised when an audit could not be queued within queue timeout.
+    """
+
+
+class AuditWriter:
+    """
+        Background audit writer.
+        .. admonition:: Note
+            Audits are queued in a bounded in memory queue and inserted by one thread with multi row inserts, a batch
+            being flushed once it reaches batch size or flush interval elapses. Requests wait while queue is full.
+            A failed batch is retried after flush interval, queued audits are flushed when writer is closed and at
+            the latest on interpreter exit.
+    """
+
+    def __init__(self, insert_fn, release_fn=None,
+                 queue_size: int = sct_audit_queue_size,
+                 timeout: float = sct_audit_queue_timeout,
+                 batch_size: int = sct_audit_batch_size,
+                 flush_interval: float = sct_audit_flush_interval):
+        """
+        AuditWriter constructor
+
+        :param insert_fn: Callable taking audit table name and list of audit rows, inserting and committing them
+        :param release_fn: Callable run by writer thread after every flush, returning its connection
+        :param queue_size: Max audits queued
+        :param timeout: Seconds to wait for room in full queue before failing
+        :param batch_size: Max audits inserted per batch
+        :param flush_interval: Seconds between flushes
+        """
+        self._insert = insert_fn
+        self._release = release_fn
+        self._timeout = float(timeout)
+        self._batch_size = max(int(batch_size), 1)
+        self._flush_interval = max(float(flush_interval), 0.01)
+        self._queue = queue.Queue(max(int(queue_size), 1))
+        self._closed = False
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "written": 0,
+            "batches": 0,
+            "failures": 0,
+            "lost": 0
+        }
+        self._thread = threading.Thread(target=self._run, name="sct-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, audit_table: str, audit_row: tuple):
+        """
+        Queue an audit, waiting while queue is full
+
+        :param audit_table: Audit table name
+        :param audit_row: Audit column values
+        :return: None
+        """
+        if self._closed:
+            self._insert(audit_table, [audit_row])
+            return
+        try:
+            self._queue.put((audit_table, audit_row), timeout=self._timeout)
+        except queue.Full:
+            raise AuditQueueFullError("Audit queue full for {} seconds (max size {})".format(
+                self._timeout, self._queue.maxsize))
+        with self._lock:
+            self._stats["queued"] += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until audits queued so far are written
+
+        :param timeout: Max seconds to wait, no limit if None
+        :return: True if queued audits were flushed within timeout
+        """
+        if self._closed:
+            return True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(max(deadline - time.monotonic(), 0) if deadline is not None else None)
+
+    def close(self):
+        """
+        Flush queued audits and stop writer, audits that can not be written then are given up on
+
+        :return: None
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stop.set()
+        try:
+            # Wakes writer waiting for audits, a full queue is read by writer anyway
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """
+        Audit writer statistics
+
+        :return: Dictionary of writer counters
+        """
+        with self._lock:
+            writer_stats = dict(self._stats)
+        writer_stats["pending"] = self._queue.qsize()
+        return writer_stats
+
+    def _run(self):
+        """
+        Writer loop, collects audits until batch is full or flush interval elapses
+
+        :return: None
+        """
+        pending = []
+        stop = False
+        while not stop:
+            waiters = []
+            deadline = time.monotonic() + self._flush_interval
+            while len(pending) < self._batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                pending.append(item)
+
+            stop = stop or self._stop.is_set()
+            if stop:
+                # Audits queued by requests racing close
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                    elif item is not None:
+                        pending.append(item)
+
+            pending = self._write(pending, final=stop)
+            for done in waiters:
+                done.set()
+            if pending:
+                self._stop.wait(self._flush_interval)
+
+    def _write(self, pending: list, final: bool = False) -> list:
+        """
+        Insert pending audits, one multi row insert per audit table
+
+        :param pending: List of (audit table, audit row) tuples
+        :param final: Whether audits not written are given up on
+        :return: Audits not written
+        """
+        while pending:
+            audit_table = pending[0][0]
+            rows = [row for tbl, row in pending if tbl == audit_table]
+            try:
+                self._insert(audit_table, rows)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failures"] += 1
+                    if final:
+                        self._stats["lost"] += len(pending)
+                logger.error("Could not write {} audits ({}){}.".format(
+                    len(rows), e, ", giving up" if final else ", retrying"))
+                return [] if final else pending
+            finally:
+                if self._release:
+                    self._release()
+            pending = [item for item in pending if item[0] != audit_table]
+            with self._lock:
+                self._stats["written"] += len(rows)
+                self._stats["batches"] += 1
+        return pending
+
+
+class AuditPolicy:
+    """
+        Per operation audit policy.
+        .. admonition:: Note
+            Read operations can be audited in full, sampled (one in N audits kept, carrying sample rate) or aggregated
+            into one counter audit per user, table, operation and status for every aggregation window. Counter audits
+            are written once their window has passed, with next audit or drain, and at the latest on interpreter
+            exit. Any other operation is always audited in full.
+    """
+
+    def __init__(self, write_fn,
+                 policy: str = sct_audit_policy,
+                 sample_rate: int = sct_audit_sample_rate,
+                 window: int = sct_audit_aggregate_window):
+        """
+        AuditPolicy constructor
+
+        :param write_fn: Callable writing an audit, taking same arguments as record
+        :param policy: Comma separated list of operation:policy
+        :param sample_rate: One in N audits kept by sample policy
+        :param window: Seconds covered by one counter audit of aggregate policy
+        """
+        self._write = write_fn
+        self._sample_rate = max(int(sample_rate), 1)
+        self._window = max(int(window), 1)
+        self._policies = dict()
+        for operation_policy in policy.split(","):
+            if ":" not in operation_policy:
+                continue
+            operation, mode = [p.strip() for p in operation_policy.split(":", 1)]
+            if operation.upper() not in SCT_AUDIT_READ_OPERATIONS or mode.lower() not in SCT_AUDIT_POLICIES:
+                logger.warning("Ignoring audit policy {}, only read operations can be sampled or aggregated.".format(
+                    operation_policy))
+                continue
+            self._policies[operation.upper()] = mode.lower()
+        self._lock = threading.Lock()
+        self._samples = dict()
+        self._counters = dict()
+        if "aggregate" in self._policies.values():
+            atexit.register(self.drain, True)
+
+    def policy(self, operation_performed: str) -> str:
+        """
+        Audit policy of an operation
+
+        :param operation_performed: Audit operation
+        :return: Policy, one of full, sample or aggregate
+        """
+        return self._policies.get(operation_performed, "full")
+
+    def record(self, audit_table: str, audit_user: str, operation_performed: str, table_name: str,
+               status: str, operation_metadata: dict):
+        """
+        Audit an operation as its policy requires
+
+        :param audit_table: Audit table name
+        :param audit_user: Audit user
+        :param operation_performed: Audit operation
+        :param table_name: Table impacted
+        :param status: Audit operation status
+        :param operation_metadata: Operation detail
+        :return: None
+        """
+        policy = self.policy(operation_performed)
+        if self._counters:
+            self.drain()
+
+        if policy == "sample":
+            with self._lock:
+                seen = self._samples.get(operation_performed, 0)
+                self._samples[operation_performed] = seen + 1
+            if seen % self._sample_rate:
+                return
+            operation_metadata = dict(operation_metadata, sample_rate=self._sample_rate)
+        elif policy == "aggregate":
+            window_start = int(time.time()) // self._window * self._window
+            key = (audit_table, audit_user, operation_performed, table_name, status, window_start)
+            with self._lock:
+                self._counters[key] = self._counters.get(key, 0) + 1
+            return
+
+        self._write(audit_table, audit_user, operation_performed, table_name, status, operation_metadata)
+
+    def drain(self, force: bool = False):
+        """
+        Write counter audits of passed aggregation windows
+
+        :param force: Whether to write counters of current window as well
+        :return: None
+        """
+        current_window = int(time.time()) // self._window * self._window
+        with self._lock:
+            passed = [key for key in self._counters.keys() if force or key[-1] < current_window]
+            counters = [(key, self._counters.pop(key)) for key in passed]
+        for key, count in counters:
+            audit_table, audit_user, operation_performed, table_name, status, window_start = key
+            self._write(audit_table, audit_user, operation_performed, table_name, status, {
+                "aggregated": True,
+                "audit_count": count,
+                "window_start": datetime.fromtimestamp(window_start).strftime("%Y-%m-%d %H:%M:%S"),
+                "window_seconds": self._window
+            })
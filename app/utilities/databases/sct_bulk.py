@@ -0,0 +1,108 @@
+"""
+    sct_bulk.py
+    -------
+    This module consists of CSV bulk loading helpers shared by all SCT database backends
+"""
+import io
+import csv
+
+from app.utilities.sct_utils import is_numeric_type
+
+
+class CsvBulkReader:
+    """
+        Validating reader of an uploaded CSV file.
+        .. admonition:: Note
+            Header columns are checked against insertable table columns once, every row is checked for its number
+            of values and for numeric values of numeric columns while it is read, so a file is validated in the
+            same single pass that loads it. Rows are available in batches, or as CSV text through read() for
+            loaders consuming a file object (Postgres COPY), in which case a validation error is kept in error
+            attribute as the loader may wrap it. Rows loaded by an earlier attempt are read past without being
+            checked or returned, but are counted in row_count.
+    """
+
+    def __init__(self, file, insert_columns: dict, skip_rows: int = 0):
+        """
+        CsvBulkReader constructor
+
+        :param file: Open CSV file, first line being header
+        :param insert_columns: Insertable column details of table, keyed by column name
+        :param skip_rows: Number of leading rows already loaded
+        """
+        self._reader = csv.reader(file)
+        self.columns = [c.strip() for c in next(self._reader, [])]
+        for col in self.columns:
+            if col not in insert_columns:
+                raise ValueError("Column {} can not be loaded into table".format(col))
+        self._numeric = [is_numeric_type(insert_columns[col]["type"]) for col in self.columns]
+        self.row_count = 0
+        self._skip_rows = skip_rows
+        self.error = None
+        self._rows = None
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def rows(self):
+        """
+        Validated rows of file
+
+        :return: Generator of rows, numeric empty values being None
+        """
+        for row in self._reader:
+            if not row:
+                continue
+            if self.row_count < self._skip_rows:
+                self.row_count += 1
+                continue
+            if len(row) != len(self.columns):
+                raise ValueError("Line {}: expected {} values, found {}".format(
+                    self._reader.line_num, len(self.columns), len(row)))
+            for c, numeric in enumerate(self._numeric):
+                if numeric:
+                    if not row[c].strip():
+                        row[c] = None
+                        continue
+                    try:
+                        float(row[c])
+                    except ValueError:
+                        raise ValueError("Line {}: invalid numeric value {} for column {}".format(
+                            self._reader.line_num, row[c], self.columns[c]))
+            self.row_count += 1
+            yield row
+
+    def batches(self, batch_size: int):
+        """
+        Validated rows of file in batches
+
+        :param batch_size: Max rows per batch
+        :return: Generator of row lists
+        """
+        batch = []
+        for row in self.rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def read(self, size: int = -1) -> str:
+        """
+        Validated rows of file as CSV text, file object protocol used by COPY
+
+        :param size: Min characters returned unless file is exhausted, whole file if negative
+        :return: CSV text, empty once file is exhausted
+        """
+        if self._rows is None:
+            self._rows = self.rows()
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        try:
+            for row in self._rows:
+                self._writer.writerow(row)
+                if 0 < size <= self._buffer.tell():
+                    break
+        except ValueError as e:
+            self.error = e
+            raise
+        return self._buffer.getvalue()
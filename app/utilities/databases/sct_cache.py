@@ -0,0 +1,213 @@
+"""
+    sct_cache.py
+    -------
+    This module consists of in memory caches shared by all SCT database backends
+"""
+import copy
+import time
+import threading
+from collections import OrderedDict
+
+from app.utilities.sct_env import (
+    sct_metadata_cache_size,
+    sct_metadata_cache_check_interval,
+    sct_lookup_cache_size,
+    sct_lookup_cache_ttl,
+    sct_count_cache_size,
+    sct_count_cache_ttl
+)
+
+
+class LruCache:
+    """
+        Bounded, thread safe, least recently used cache with optional entry expiry.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: int = 0):
+        """
+        LruCache constructor
+
+        :param max_size: Max number of entries kept in cache
+        :param ttl: Seconds after which an entry expires, entries never expire if 0
+        """
+        self._max_size = max(int(max_size), 1)
+        self._ttl = int(ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Fetch an entry, marking it as most recently used
+
+        :param key: Cache key
+        :param default: Value returned on cache miss
+        :return: Cached value
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            stored_at, value = self._entries[key]
+            if self._ttl and time.monotonic() - stored_at >= self._ttl:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Store an entry, evicting the least recently used entry when full
+
+        :param key: Cache key
+        :param value: Value to cache
+        :return: None
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match=None):
+        """
+        Drop cached entries
+
+        :param match: Predicate on key selecting entries to drop, all entries are dropped if not provided
+        :return: Number of entries dropped
+        """
+        with self._lock:
+            if match is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            keys = [k for k in self._entries.keys() if match(k)]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+
+class MetadataCache(LruCache):
+    """
+        Table metadata cache keyed by (database, schema, table), or by (database, schema) for backends caching
+        a whole schema model.
+        .. admonition:: Note
+            Every entry is tagged with the schema version it was loaded under, an entry whose version differs
+            from the current schema version is reloaded. The schema version itself is re-read at most once per
+            check interval, so a cache hit costs no query at all within the interval.
+    """
+
+    def __init__(self, max_size: int = sct_metadata_cache_size,
+                 check_interval: int = sct_metadata_cache_check_interval):
+        """
+        MetadataCache constructor
+
+        :param max_size: Max number of table metadata entries kept in cache
+        :param check_interval: Seconds for which a fetched schema version is trusted
+        """
+        super().__init__(max_size)
+        self._check_interval = int(check_interval)
+        self._version = None
+        self._version_time = 0.0
+
+    def schema_version(self, version_loader):
+        """
+        Current schema version, re-read from database once check interval expires
+
+        :param version_loader: Callable returning schema version from database
+        :return: Schema version
+        """
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._version_time < self._check_interval:
+                return self._version
+        version = version_loader()
+        with self._lock:
+            self._version = version
+            self._version_time = time.monotonic()
+        return version
+
+    def get_or_load(self, key: tuple, version_loader, metadata_loader, select=None) -> dict:
+        """
+        Fetch table metadata, loading it from database on miss or schema change
+
+        :param key: (database, schema, table) tuple, or (database, schema) for a whole schema model
+        :param version_loader: Callable returning schema version from database
+        :param metadata_loader: Callable returning metadata dictionary from database
+        :param select: Callable picking the part of a cached schema model to be returned
+        :return: Copy of metadata dictionary
+        """
+        version = self.schema_version(version_loader)
+        entry = self.get(key)
+        if not entry or entry[0] != version:
+            entry = (version, metadata_loader())
+            self.put(key, entry)
+        return copy.deepcopy(entry[1] if select is None else select(entry[1]))
+
+    def invalidate(self, match=None):
+        """
+        Drop cached entries and force schema version to be re-read
+
+        :param match: Predicate on key selecting entries to drop, all entries are dropped if not provided
+        :return: Number of entries dropped
+        """
+        with self._lock:
+            self._version = None
+            return super().invalidate(match)
+
+
+class LookupCache(LruCache):
+    """
+        Cache of FK lookup pages keyed by (database, schema, table, column, prefix, page, page_size).
+        .. admonition:: Note
+            Entries expire after TTL, and are dropped as soon as the referenced table is mutated through SCT.
+    """
+
+    def __init__(self, max_size: int = sct_lookup_cache_size, ttl: int = sct_lookup_cache_ttl):
+        """
+        LookupCache constructor
+
+        :param max_size: Max number of lookup pages kept in cache
+        :param ttl: Seconds after which a lookup page expires
+        """
+        super().__init__(max_size, ttl)
+
+    def invalidate_table(self, database: str, schema: str, table: str) -> int:
+        """
+        Drop every cached lookup page of a table
+
+        :param database: DB name
+        :param schema: DB Schema
+        :param table: Table name
+        :return: Number of entries dropped
+        """
+        return self.invalidate(lambda k: k[:3] == (database, schema, table))
+
+
+class CountCache(LruCache):
+    """
+        Cache of exact row counts keyed by (database, schema, table, search condition, search arguments).
+        .. admonition:: Note
+            Entries expire after TTL, and are dropped as soon as the table is mutated through SCT.
+    """
+
+    def __init__(self, max_size: int = sct_count_cache_size, ttl: int = sct_count_cache_ttl):
+        """
+        CountCache constructor
+
+        :param max_size: Max number of row counts kept in cache
+        :param ttl: Seconds after which a row count expires
+        """
+        super().__init__(max_size, ttl)
+
+    def invalidate_table(self, database: str, schema: str, table: str) -> int:
+        """
+        Drop every cached row count of a table
+
+        :param database: DB name
+        :param schema: DB Schema
+        :param table: Table name
+        :return: Number of entries dropped
+        """
+        return self.invalidate(lambda k: k[:3] == (database, schema, table))
@@ -31,6 +31,7 @@ def init_app_database(app):
 
     app.logger.info("Successfully initiated {} DB.".format(sct_db_type))
     app.config["SCT_DATA_DB"] = db
+    app.teardown_appcontext(db.release)
 
 
 def init_audit_database(app):
@@ -57,9 +58,17 @@ def init_audit_database(app):
             app.logger.error("Could not initiate audit DB. Exiting!")
             raise Exception("Could not initiate audit DB")
         app.config["SCT_AUDIT_DB"] = db
+        app.teardown_appcontext(db.release)
 
     if sct_audit_table_create.lower() == "yes":
         app.logger.info("Creating audit table {}".format(sct_audit_db_table))
         (app.config["SCT_AUDIT_DB"]).create_audit_table(sct_audit_db_table)
+    elif sct_audit_table_migrate.lower() == "yes":
+        app.logger.info("Migrating audit table {}".format(sct_audit_db_table))
+        (app.config["SCT_AUDIT_DB"]).migrate_audit_table(sct_audit_db_table)
+
+    if sct_audit_table_create.lower() == "yes" or sct_audit_table_migrate.lower() == "yes":
+        app.logger.info("Creating bulk load job table {}".format(sct_scheduler_job_table))
+        (app.config["SCT_AUDIT_DB"]).create_bulk_job_table(sct_scheduler_job_table)
 
     app.logger.info("Successfully initiated {} audit DB.".format(sct_db_type))
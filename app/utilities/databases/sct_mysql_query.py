@@ -12,6 +12,10 @@ SCT_QUERY_MYSQL_GET_PK_DETAIL = """
 SHOW FULL COLUMNS FROM {}
 """
 
+SCT_QUERY_MYSQL_GET_INDEX_DETAIL = """
+SHOW INDEX FROM {}
+"""
+
 SCT_QUERY_MYSQL_GET_FK_DETAIL = """
 SELECT
   TABLE_NAME,
@@ -26,7 +30,35 @@ WHERE
 """
 
 SCT_QUERY_MYSQL_GET_FK_LOOKUP = """
-SELECT DISTINCT {} FROM {}
+SELECT {0} FROM {1} WHERE {2} ORDER BY {0} LIMIT %s OFFSET %s
+"""
+
+SCT_QUERY_MYSQL_SEARCH_PREFIX = """
+{0} LIKE %s
+"""
+
+SCT_QUERY_MYSQL_SEARCH_CONTAINS = """
+{0} LIKE %s
+"""
+
+SCT_QUERY_MYSQL_SEARCH_SAMPLE = """
+{0} <= (SELECT max({0}) FROM (SELECT {0} FROM {1} ORDER BY {0} LIMIT {2}) sct_sample)
+"""
+
+SCT_QUERY_MYSQL_FK_LOOKUP_PREFIX = """
+{0} LIKE %s
+"""
+
+SCT_QUERY_MYSQL_FK_LOOKUP_SEEK = """
+{0} >= %s
+"""
+
+SCT_QUERY_MYSQL_GET_ROW = """
+SELECT {} FROM {} WHERE {}
+"""
+
+SCT_QUERY_MYSQL_LOCK_ROW = """
+SELECT {} FROM {} WHERE {} FOR UPDATE
 """
 
 SCT_QUERY_MYSQL_INSERT_ROW = """
@@ -48,14 +80,10 @@ ORDER BY audit_id LIMIT {} OFFSET {}
 
 SCT_QUERY_MYSQL_AUDIT_PUT = """
 INSERT INTO {0}(operation_performed, table_name, operation_status, audit_user, operation_metadata) VALUES (
-    '{1}', '{2}', '{3}', '{4}', '{5}'
+    %s, %s, %s, %s, %s
 )
 """
 
-SCT_QUERY_MYSQL_AUDIT_BULK_LOAD = """
-SELECT table_name, operation_status, operation_metadata FROM {} WHERE operation_performed = 'BULK_UPLOAD'
-"""
-
 SCT_QUERY_MYSQL_AUDIT_TABLE_CREATION = """
 create table if not exists sct_audits (
         audit_id int NOT NULL AUTO_INCREMENT primary key,
@@ -68,8 +96,142 @@ create table if not exists sct_audits (
 );
 """
 
+SCT_QUERY_MYSQL_AUDIT_INDEX_LIST = """
+SELECT DISTINCT INDEX_NAME FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+SCT_QUERY_MYSQL_AUDIT_INDEX_CREATION = """
+ALTER TABLE {0} ADD INDEX {1} ({2}), ALGORITHM=INPLACE, LOCK=NONE
+"""
+
+SCT_QUERY_MYSQL_AUDIT_FTS_INDEX_CREATION = """
+ALTER TABLE {0} ADD FULLTEXT INDEX {1} (operation_metadata), ALGORITHM=INPLACE, LOCK=SHARED
+"""
+
+SCT_QUERY_MYSQL_AUDIT_TEXT_MATCH = "MATCH (operation_metadata) AGAINST (%s IN BOOLEAN MODE)"
+
+SCT_QUERY_MYSQL_AUDIT_TEXT_LIKE = "operation_metadata LIKE %s"
+
+SCT_QUERY_MYSQL_AUDIT_TEXT_SEARCH = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {0}
+WHERE {1}
+ORDER BY audit_id DESC LIMIT %s
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PARTITIONED_TABLE_CREATION = """
+create table if not exists {0} (
+        audit_id int NOT NULL AUTO_INCREMENT,
+        audit_user VARCHAR (100) not null,
+        audit_time timestamp NOT NULL DEFAULT NOW(),
+        operation_performed VARCHAR (100) not null,
+        table_name VARCHAR (100) not null,
+        operation_status VARCHAR (15) not null,
+        operation_metadata VARCHAR (5000),
+        PRIMARY KEY (audit_id, audit_time)
+) PARTITION BY RANGE (UNIX_TIMESTAMP(audit_time)) (
+        PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PARTITION_LIST = """
+SELECT PARTITION_NAME FROM INFORMATION_SCHEMA.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PARTITION_CREATION = """
+ALTER TABLE {0} REORGANIZE PARTITION pmax INTO (
+    PARTITION {1} VALUES LESS THAN (UNIX_TIMESTAMP('{2}')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+)
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PARTITION_ARCHIVE = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {0} PARTITION ({1}) ORDER BY audit_id
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PARTITION_DROP = """
+ALTER TABLE {0} DROP PARTITION {1}
+"""
+
+SCT_QUERY_MYSQL_AUDIT_OLDEST = """
+SELECT min(audit_time) FROM {} WHERE audit_time < %s
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PERIOD_ARCHIVE = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {} WHERE audit_time >= %s AND audit_time < %s ORDER BY audit_id
+"""
+
+SCT_QUERY_MYSQL_AUDIT_PERIOD_DELETE = """
+DELETE FROM {} WHERE audit_time >= %s AND audit_time < %s
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_TABLE_CREATION = """
+create table if not exists {0} (
+        job_id int NOT NULL AUTO_INCREMENT primary key,
+        file_name VARCHAR (100) not null UNIQUE,
+        table_name VARCHAR (100) not null,
+        job_user VARCHAR (100) not null,
+        job_state VARCHAR (15) not null DEFAULT 'PENDING',
+        attempts int not null DEFAULT 0,
+        rows_loaded int,
+        job_error VARCHAR (5000),
+        created_time timestamp NOT NULL DEFAULT NOW(),
+        updated_time timestamp NOT NULL DEFAULT NOW(),
+        INDEX {0}_state_idx (job_state, updated_time)
+);
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_PUT = """
+INSERT INTO {}(table_name, file_name, job_user) VALUES (%s, %s, %s)
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_PENDING = """
+SELECT job_id, table_name, file_name, job_user, attempts + 1, COALESCE(rows_loaded, 0) FROM {}
+WHERE job_state = 'PENDING' OR (job_state = 'RUNNING' AND updated_time < NOW() - INTERVAL %s SECOND)
+ORDER BY job_id LIMIT %s FOR UPDATE SKIP LOCKED
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_CLAIM = """
+UPDATE {} SET job_state = 'RUNNING', attempts = attempts + 1, updated_time = NOW() WHERE job_id = %s
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_FINISH = """
+UPDATE {} SET job_state = %s, rows_loaded = COALESCE(%s, rows_loaded), job_error = %s, updated_time = NOW()
+WHERE job_id = %s
+"""
+
+SCT_QUERY_MYSQL_BULK_JOB_PROGRESS = """
+UPDATE {} SET rows_loaded = %s, updated_time = NOW() WHERE job_id = %s
+"""
+
 SCT_QUERY_MYSQL_AUDIT_SEARCH = """
 SELECT audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {}
 WHERE {}
 ORDER BY audit_id LIMIT {} OFFSET {}
-"""
\ No newline at end of file
+"""
+SCT_QUERY_MYSQL_GET_SCHEMA_VERSION = """
+SELECT
+  (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(':', TABLE_NAME, COLUMN_NAME, COLUMN_TYPE,
+          COLUMN_KEY, EXTRA, COLUMN_COMMENT))), 0))
+   FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE()),
+  (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(':', TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME,
+          REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME))), 0))
+   FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE())
+"""
+
+SCT_QUERY_MYSQL_ESTIMATE_COUNT = """
+SELECT TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+SCT_QUERY_MYSQL_SET_EXECUTION_TIME = """
+SET SESSION MAX_EXECUTION_TIME = %s
+"""
+SCT_QUERY_MARIADB_SET_STATEMENT_TIME = """
+SET SESSION max_statement_time = %s
+"""
+SCT_QUERY_MYSQL_RESET_EXECUTION_TIME = """
+SET SESSION MAX_EXECUTION_TIME = DEFAULT
+"""
+SCT_QUERY_MARIADB_RESET_STATEMENT_TIME = """
+SET SESSION max_statement_time = DEFAULT
+"""
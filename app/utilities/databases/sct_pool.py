@@ -0,0 +1,208 @@
+"""
+    sct_pool.py
+    -------
+    This module consists of DB API connection pool shared by client/server database backends
+"""
+import time
+import logging
+import threading
+
+from app.utilities.sct_env import (
+    sct_db_pool_min_size,
+    sct_db_pool_max_size,
+    sct_db_pool_timeout,
+    sct_db_pool_pre_ping,
+    sct_db_pool_retry,
+    sct_db_pool_backoff
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """
+        Raised when no connection could be checked out of pool within checkout timeout.
+    """
+
+
+class ConnectionPool:
+    """
+        Bounded DB API connection pool.
+        .. admonition:: Note
+            Connections are created lazily up to max size, idle connections are health checked on borrow and
+            replaced when broken. Connection creation is retried with exponential backoff.
+    """
+
+    def __init__(self, connect,
+                 min_size: int = sct_db_pool_min_size,
+                 max_size: int = sct_db_pool_max_size,
+                 timeout: float = sct_db_pool_timeout,
+                 pre_ping: bool = sct_db_pool_pre_ping,
+                 retry: int = sct_db_pool_retry,
+                 backoff: float = sct_db_pool_backoff):
+        """
+        ConnectionPool constructor
+
+        :param connect: Callable returning a new DB API connection
+        :param min_size: Connections opened while pool is created
+        :param max_size: Max connections open at a time
+        :param timeout: Seconds to wait for a free connection before failing checkout
+        :param pre_ping: Whether to health check a connection on borrow
+        :param retry: Number of retries while opening a connection
+        :param backoff: Seconds waited before first retry, doubled on every retry
+        """
+        self._connect = connect
+        self._max_size = max(int(max_size), 1)
+        self._timeout = float(timeout)
+        self._pre_ping = bool(pre_ping)
+        self._retry = max(int(retry), 0)
+        self._backoff = float(backoff)
+        self._idle = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "created": 0,
+            "discarded": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0
+        }
+        for _ in range(min(max(int(min_size), 0), self._max_size)):
+            self._idle.append(self._open())
+
+    def _open(self):
+        """
+        Open a new connection, retrying with exponential backoff
+
+        :return: DB API connection
+        """
+        attempt = 0
+        while True:
+            try:
+                con = self._connect()
+                with self._cond:
+                    self._stats["created"] += 1
+                return con
+            except Exception as e:
+                if attempt >= self._retry:
+                    raise
+                delay = self._backoff * (2 ** attempt)
+                logger.warning("Could not open DB connection ({}), retrying in {} seconds.".format(e, delay))
+                time.sleep(delay)
+                attempt += 1
+
+    @staticmethod
+    def _is_healthy(con) -> bool:
+        """
+        Check a connection by running a trivial query
+
+        :param con: DB API connection
+        :return: True if connection is usable
+        """
+        try:
+            curs = con.cursor()
+            curs.execute("SELECT 1")
+            curs.fetchall()
+            curs.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(con):
+        """
+        Close a connection ignoring errors
+
+        :param con: DB API connection
+        :return: None
+        """
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """
+        Check out a connection
+
+        :return: DB API connection
+        """
+        deadline = time.monotonic() + self._timeout
+        with self._cond:
+            while not self._idle and self._in_use >= self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        "No DB connection available within {} seconds (max size {})".format(
+                            self._timeout, self._max_size))
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+            con = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+
+        try:
+            if con is not None and self._pre_ping and not self._is_healthy(con):
+                logger.warning("Discarding broken DB connection.")
+                self._close(con)
+                with self._cond:
+                    self._stats["discarded"] += 1
+                con = None
+            if con is None:
+                con = self._open()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return con
+
+    def release(self, con, discard: bool = False):
+        """
+        Return a checked out connection, rolling back any open transaction
+
+        :param con: DB API connection
+        :param discard: Whether to close connection instead of keeping it for reuse
+        :return: None
+        """
+        if not discard:
+            try:
+                con.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append(con)
+            self._cond.notify()
+        if discard:
+            self._close(con)
+
+    def close(self):
+        """
+        Close every idle connection
+
+        :return: None
+        """
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for con in idle:
+            self._close(con)
+
+    def stats(self) -> dict:
+        """
+        Pool statistics
+
+        :return: Dictionary of pool counters
+        """
+        with self._cond:
+            pool_stats = dict(self._stats)
+            pool_stats.update({
+                "max_size": self._max_size,
+                "idle": len(self._idle),
+                "in_use": self._in_use
+            })
+        return pool_stats
@@ -4,23 +4,101 @@
     This module controls SCT Tool specific database interaction
 """
 import json
-import csv
+import uuid
+import hashlib
+import weakref
+import threading
 import psycopg2
+from contextlib import contextmanager
+from psycopg2.extras import execute_values
 from math import ceil
-from app.utilities.sct_utils import tuple_to_dict, tuple_to_list
+from datetime import datetime
+from app.utilities.sct_env import (
+    sct_count_exact_threshold,
+    sct_ui_download_fetch_size,
+    sct_ui_search_scan_policy,
+    sct_ui_search_scan_threshold,
+    sct_ui_search_sample_size,
+    sct_audit_async,
+    sct_audit_queue_timeout,
+    sct_audit_partition,
+    sct_audit_partition_ahead,
+    sct_audit_retention_months
+)
+from app.utilities.sct_utils import (
+    tuple_to_dict,
+    tuple_to_list,
+    is_numeric_type,
+    escape_like,
+    keyset_page,
+    decode_row_key,
+    encode_page_cursor,
+    decode_page_cursor,
+    get_count_strategy,
+    get_page_order,
+    build_search_condition,
+    is_search_indexed,
+    get_prefix_search_columns
+)
+from app.utilities.databases.sct_cache import MetadataCache, LookupCache, CountCache
+from app.utilities.databases.sct_pool import ConnectionPool
+from app.utilities.databases.sct_bulk import CsvBulkReader
+from app.utilities.databases.sct_timeout import QueryTimeoutError, get_query_timeout, timed_operation
+from app.utilities.databases.sct_audit import (
+    AuditWriter,
+    AuditPolicy,
+    audit_indexes,
+    audit_text_terms,
+    audit_time_condition,
+    archive_audits,
+    month_start
+)
 from app.utilities.databases.sct_postgres_query import (
-    SCT_QUERY_POSTGRES_GET_FK_DETAIL,
+    SCT_QUERY_POSTGRES_GET_SCHEMA_COLUMNS,
+    SCT_QUERY_POSTGRES_GET_SCHEMA_KEYS,
+    SCT_QUERY_POSTGRES_GET_SCHEMA_INDEXES,
+    SCT_QUERY_POSTGRES_SEARCH_PREFIX,
+    SCT_QUERY_POSTGRES_SEARCH_CONTAINS,
+    SCT_QUERY_POSTGRES_SEARCH_SAMPLE,
     SCT_QUERY_POSTGRES_GET_FK_LOOKUP,
-    SCT_QUERY_POSTGRES_GET_COLMN_DETAIL,
-    SCT_QUERY_POSTGRES_GET_PK_DETAIL,
+    SCT_QUERY_POSTGRES_FK_LOOKUP_PREFIX,
+    SCT_QUERY_POSTGRES_FK_LOOKUP_SEEK,
+    SCT_QUERY_POSTGRES_FK_LOOKUP_CAST,
+    SCT_QUERY_POSTGRES_GET_ROW,
     SCT_QUERY_POSTGRES_INSERT_ROW,
+    SCT_QUERY_POSTGRES_COPY_ROWS,
     SCT_QUERY_POSTGRES_DROP_ROW,
     SCT_QUERY_POSTGRES_UPDATE_ROW,
     SCT_QUERY_POSTGRES_AUDIT_GET,
     SCT_QUERY_POSTGRES_AUDIT_PUT,
-    SCT_QUERY_POSTGRES_AUDIT_BULK_LOAD,
+    SCT_QUERY_POSTGRES_BULK_JOB_TABLE_CREATION,
+    SCT_QUERY_POSTGRES_BULK_JOB_INDEX_CREATION,
+    SCT_QUERY_POSTGRES_BULK_JOB_PUT,
+    SCT_QUERY_POSTGRES_BULK_JOB_CLAIM,
+    SCT_QUERY_POSTGRES_BULK_JOB_FINISH,
+    SCT_QUERY_POSTGRES_BULK_JOB_PROGRESS,
     SCT_QUERY_POSTGRES_AUDIT_TABLE_CREATION,
-    SCT_QUERY_POSTGRES_AUDIT_SEARCH
+    SCT_QUERY_POSTGRES_AUDIT_INDEX_LIST,
+    SCT_QUERY_POSTGRES_AUDIT_INDEX_DROP,
+    SCT_QUERY_POSTGRES_AUDIT_INDEX_CREATION,
+    SCT_QUERY_POSTGRES_AUDIT_TSVECTOR,
+    SCT_QUERY_POSTGRES_AUDIT_TEXT_MATCH,
+    SCT_QUERY_POSTGRES_AUDIT_TEXT_SEARCH,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_INDEX_CREATION,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_TABLE_CREATION,
+    SCT_QUERY_POSTGRES_AUDIT_DEFAULT_PARTITION_CREATION,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITION_CREATION,
+    SCT_QUERY_POSTGRES_AUDIT_IS_PARTITIONED,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITION_LIST,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITION_ARCHIVE,
+    SCT_QUERY_POSTGRES_AUDIT_PARTITION_DROP,
+    SCT_QUERY_POSTGRES_AUDIT_OLDEST,
+    SCT_QUERY_POSTGRES_AUDIT_PERIOD_ARCHIVE,
+    SCT_QUERY_POSTGRES_AUDIT_PERIOD_DELETE,
+    SCT_QUERY_POSTGRES_AUDIT_SEARCH,
+    SCT_QUERY_POSTGRES_GET_SCHEMA_VERSION,
+    SCT_QUERY_POSTGRES_ESTIMATE_COUNT,
+    SCT_QUERY_POSTGRES_SET_STATEMENT_TIMEOUT
 )
 
 
@@ -48,12 +126,23 @@ class DbBackEnd:
         :param host: DB Hostname
         :param port: DB Port
         """
-        self._con = psycopg2.connect(database=database,
-                                     user=user,
-                                     password=password,
-                                     host=host,
-                                     port=port,
-                                     options="-c search_path={}".format(schema))
+        self._pool = ConnectionPool(lambda: psycopg2.connect(database=database,
+                                                             user=user,
+                                                             password=password,
+                                                             host=host,
+                                                             port=port,
+                                                             options="-c search_path={}".format(schema)))
+        self._local = threading.local()
+        self._database = database
+        self._schema = schema
+        self._metadata_cache = MetadataCache()
+        self._lookup_cache = LookupCache()
+        self._count_cache = CountCache()
+        self._audit_writer = None
+        self._audit_lock = threading.Lock()
+        self._audit_policy = AuditPolicy(self._write_audit)
+        self._prepared = weakref.WeakKeyDictionary()
+        self._prepared_lock = threading.Lock()
 
     def finalize(self, e=None):
         """
@@ -62,17 +151,91 @@ class DbBackEnd:
         :return: None
         """
         print("Closing DB Connection.")
-        if self.db_connection:
-            self.db_connection.close()
+        self._audit_policy.drain(force=True)
+        if self._audit_writer:
+            self._audit_writer.close()
+        self.release()
+        self._pool.close()
+
+    def release(self, e=None):
+        """
+        Returns connection checked out by current thread to pool, registered as application teardown
+
+        :param e: Teardown exception, connection is discarded if provided
+        :return: None
+        """
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            self._local.con = None
+            self._pool.release(con, discard=e is not None and self._is_connection_error(e))
+
+    @staticmethod
+    def _is_connection_error(e) -> bool:
+        """
+        Whether an exception means connection itself is broken
+
+        :param e: Exception
+        :return: True for connection errors
+        """
+        if isinstance(e, psycopg2.extensions.QueryCanceledError):
+            return False
+        return isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+    @contextmanager
+    def query_timeout(self, operation: str, con=None):
+        """
+        Cancel statements of an operation class running longer than its timeout
+        .. admonition:: Note
+            Timeout is set as transaction local statement_timeout, so it ends with the transaction of operation
+            and is restored to previous value when context exits inside that transaction. Statements run on
+            connection outside context keep timeout of session. A cancelled statement rolls back its transaction
+            and is raised as QueryTimeoutError.
+
+        :param operation: Operation class (browse, search, export, bulk_load)
+        :param con: Connection statements run on, connection of current thread if not provided
+        :return: Context manager
+        """
+        timeout = get_query_timeout(operation)
+        if not timeout:
+            yield
+            return
+        con = con if con is not None else self.db_connection
+        with con.cursor() as curs:
+            curs.execute(SCT_QUERY_POSTGRES_SET_STATEMENT_TIMEOUT, ("{}ms".format(int(timeout * 1000)),))
+            previous_timeout = curs.fetchone()[0]
+        try:
+            yield
+        except psycopg2.extensions.QueryCanceledError as e:
+            con.rollback()
+            raise QueryTimeoutError(operation, timeout) from e
+        finally:
+            if con.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+                with con.cursor() as curs:
+                    curs.execute(SCT_QUERY_POSTGRES_SET_STATEMENT_TIMEOUT, (previous_timeout,))
+
+    def pool_stats(self) -> dict:
+        """
+        Connection pool statistics
+
+        :return: Dictionary of pool counters
+        """
+        pool_stats = self._pool.stats()
+        if self._audit_writer:
+            pool_stats["audit_writer"] = self._audit_writer.stats()
+        return pool_stats
 
     @property
     def db_connection(self):
         """
-        DB Connection
+        DB Connection, checked out of pool once per thread until released
 
         :return: Postgres DB API Connection
         """
-        return self._con
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._pool.acquire()
+            self._local.con = con
+        return con
 
     @property
     def get_cursor(self):
@@ -106,7 +269,8 @@ class DbBackEnd:
 
         return list(table_list.difference(black_listed))
 
-    def get_table_data(self, table: str, project_list: list, order_list: list, limit: int, offset: int = 0):
+    def get_table_data(self, table: str, project_list: list, order_list: list, limit: int, offset: int = 0,
+                       seek: list = None, reverse: bool = False, descending: bool = False):
         """
         Fetch data for a table
 
@@ -115,24 +279,18 @@ class DbBackEnd:
         :param order_list: List of columns to order data by
         :param limit: Max rows fetched
         :param offset: Row batch, where each batch will be of size 50 at least
+        :param seek: Values of order columns, rows after (before if reverse) this position are fetched
+        :param reverse: Whether to fetch rows preceding seek position
+        :param descending: Whether order columns are sorted in descending order
         :return: List of rows
         """
-        curs = self.get_cursor
-        curs.execute(
-            """
-            SELECT {} FROM {} ORDER BY {} OFFSET {} LIMIT {}
-            """.format(
-                ",".join(project_list),
-                table,
-                ",".join(order_list),
-                offset,
-                limit
-            )
-        )
-        return curs.fetchall()
+        return self.search_table_data(table, project_list, order_list, None, limit, offset,
+                                      seek=seek, reverse=reverse, descending=descending)
 
     def search_table_data(self, table: str, project_list: list, order_list: list,
-                          search_con, limit: int, offset: int = 0):
+                          search_con, limit: int, offset: int = 0,
+                          qry_args: list = None, seek: list = None, reverse: bool = False,
+                          with_count: bool = False, descending: bool = False):
         """
         Search data for a table
 
@@ -142,53 +300,171 @@ class DbBackEnd:
         :param search_con: Searched Condition
         :param limit: Max rows fetched
         :param offset: Row batch, where each batch will be of size 50 at least
-        :return: List of rows
+        :param qry_args: Values bound to search condition placeholders
+        :param seek: Values of order columns, rows after (before if reverse) this position are fetched
+        :param reverse: Whether to fetch rows preceding seek position
+        :param with_count: Whether to append count of all searched rows, ignoring seek and limit, to every row
+        :param descending: Whether order columns are sorted in descending order
+        :return: List of rows, in order columns order
+        """
+        cond_list = ["({})".format(search_con)] if search_con else []
+        qry_args = list(qry_args) if qry_args else []
+        sql_qry = "SELECT {} FROM {}".format(",".join(project_list), table)
+        if with_count:
+            # Window count is computed over searched rows before seek condition applies to outer query
+            sql_qry = "SELECT {}, count(*) OVER () AS sct_total_count FROM {}".format(",".join(project_list), table)
+            if cond_list:
+                sql_qry = "{} WHERE {}".format(sql_qry, " AND ".join(cond_list))
+            sql_qry = "SELECT * FROM ({}) sct_page".format(sql_qry)
+            cond_list = []
+        if seek is not None:
+            cond_list.append("({}) {} ({})".format(
+                ",".join(order_list),
+                "<" if reverse != descending else ">",
+                ",".join(["%s"] * len(seek))
+            ))
+            qry_args.extend(seek)
+
+        curs = self.get_cursor
+        if cond_list:
+            sql_qry = "{} WHERE {}".format(sql_qry, " AND ".join(cond_list))
+        if order_list:
+            sql_qry = "{} ORDER BY {}".format(
+                sql_qry, ",".join(["{} {}".format(c, "DESC" if reverse != descending else "ASC") for c in order_list]))
+        sql_qry = "{} LIMIT %s OFFSET %s".format(sql_qry)
+
+        curs.execute(sql_qry, qry_args + [limit, offset])
+        rows = curs.fetchall()
+        return rows[::-1] if reverse else rows
+
+    def stream_table_data(self, table: str, project_list: list, order_list: list, limit: int = 0,
+                          fetch_size: int = sct_ui_download_fetch_size):
+        """
+        Stream data of a table in batches, holding at most one batch in memory
+        .. admonition:: Note
+            Rows are read through a named (server side) cursor on a connection of its own, which is returned to
+            pool once stream is exhausted or closed. Every fetch is bounded by export query timeout.
+
+        :param table: Table name
+        :param project_list: List of columns to project
+        :param order_list: List of columns to order data by
+        :param limit: Max rows fetched, all rows are fetched if 0
+        :param fetch_size: Rows fetched per batch
+        :return: Generator of row batches
+        """
+        sql_qry = "SELECT {} FROM {}".format(",".join(project_list), table)
+        if order_list:
+            sql_qry = "{} ORDER BY {}".format(sql_qry, ",".join(order_list))
+        if limit:
+            sql_qry = "{} LIMIT {}".format(sql_qry, int(limit))
+
+        con = self._pool.acquire()
+        broken = False
+        curs = None
+        try:
+            with self.query_timeout("export", con):
+                curs = con.cursor(name="sct_stream_{}".format(uuid.uuid4().hex))
+                curs.itersize = fetch_size
+                curs.execute(sql_qry)
+                while True:
+                    rows = curs.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield rows
+        except Exception as e:
+            broken = self._is_connection_error(e)
+            raise
+        finally:
+            try:
+                if curs is not None:
+                    curs.close()
+            except Exception:
+                broken = True
+            self._pool.release(con, discard=broken)
+
+    def get_schema_version(self) -> str:
+        """
+        Schema version, changes whenever a table, column, column default or comment, constraint or index in schema is
+        altered
+
+        :return: Schema version
         """
         curs = self.get_cursor
-        sql_qry = """
-            SELECT {} FROM {} WHERE {} ORDER BY {} OFFSET {} LIMIT {}
-            """.format(
-            ",".join(project_list),
-            table,
-            search_con,
-            ",".join(order_list),
-            offset,
-            limit
+        curs.execute(
+            SCT_QUERY_POSTGRES_GET_SCHEMA_VERSION.format(self._schema)
         )
+        return curs.fetchone()[0]
 
-        curs.execute(sql_qry)
-        return curs.fetchall()
+    def refresh_table_columns(self, table: str = None) -> int:
+        """
+        Drop cached table metadata
+        .. admonition:: Note
+            Metadata of whole schema is cached as one model, so refreshing a table reloads the schema.
+
+        :param table: Table name, all tables are refreshed if not provided
+        :return: Number of cached schema models dropped
+        """
+        return self._metadata_cache.invalidate(lambda k: k == (self._database, self._schema))
 
     def get_table_columns(self, table: str, load_fk_data: bool = False) -> dict:
         """
         Column list for a table
 
         :param table: Table name
-        :param load_fk_data: Whether to load FK column data for lookup
+        :param load_fk_data: Whether to load first page of FK column data for lookup
         :return: Metadata dictionary
         """
-        meta_dict = dict()
-        meta_dict["view"] = dict()
-        meta_dict["insert"] = dict()
-        meta_dict["fk_columns"] = dict()
+        meta_dict = self._metadata_cache.get_or_load((self._database, self._schema),
+                                                     self.get_schema_version,
+                                                     self._load_schema_columns,
+                                                     lambda model: model.get(table, {
+                                                         "view": dict(),
+                                                         "insert": dict(),
+                                                         "fk_columns": dict(),
+                                                         "pk_columns": [],
+                                                         "indexed_columns": [],
+                                                         "statements": dict()
+                                                     }))
+        if load_fk_data:
+            for fk in meta_dict["fk_columns"]:
+                meta_dict["fk_columns"][fk]["data"] = self.get_fk_lookup(table, fk)["values"]
+        return meta_dict
+
+    def _load_schema_columns(self) -> dict:
+        """
+        Column list for every table in schema, read from database catalog in three queries
+
+        :return: Dictionary of metadata dictionary keyed by table name
+        """
+        schema_dict = dict()
         curs = self.get_cursor
 
-        # Get Table Primary Keys
+        # Get Schema Primary and Foreign Keys
         curs.execute(
-            SCT_QUERY_POSTGRES_GET_PK_DETAIL.format(table)
+            SCT_QUERY_POSTGRES_GET_SCHEMA_KEYS.format(self._schema)
         )
-        meta_dict["pk_columns"] = [cd[0] for cd in curs.fetchall()]
+        key_list = curs.fetchall()
 
-        # Get Column List
+        # Get Schema Column List
         curs.execute(
-            SCT_QUERY_POSTGRES_GET_COLMN_DETAIL.format(table)
+            SCT_QUERY_POSTGRES_GET_SCHEMA_COLUMNS.format(self._schema)
         )
         for cd in curs.fetchall():
+            if cd[0] not in schema_dict:
+                schema_dict[cd[0]] = {
+                    "view": dict(),
+                    "insert": dict(),
+                    "fk_columns": dict(),
+                    "pk_columns": [kd[2] for kd in key_list if kd[0] == cd[0] and kd[1] == "p"],
+                    "indexed_columns": []
+                }
+            meta_dict = schema_dict[cd[0]]
             col_nm = cd[1]
             meta_dict["view"][col_nm] = {
                 "type": cd[3],
                 "description": cd[2],
-                "length": cd[4]
+                "length": cd[4],
+                "nullable": cd[6] == "YES"
             }
             if col_nm in meta_dict["pk_columns"] and cd[5] and "nextval" in cd[5]:
                 pass
@@ -201,126 +477,462 @@ class DbBackEnd:
                     "length": cd[4]
                 }
 
-            # Get Table Foreign Keys
-            curs.execute(SCT_QUERY_POSTGRES_GET_FK_DETAIL)
-            for fkd in curs.fetchall():
-                if fkd[2] == table:
-                    meta_dict["fk_columns"][fkd[3]] = {
-                        "table": fkd[4],
-                        "column": fkd[5],
-                        "data": []
-                    }
-            if load_fk_data:
-                for fk in meta_dict["fk_columns"]:
-                    curs.execute(
-                        SCT_QUERY_POSTGRES_GET_FK_LOOKUP.format(
-                            meta_dict["fk_columns"][fk].get("column"),
-                            meta_dict["fk_columns"][fk].get("table")
-                        )
-                    )
-                    meta_dict["fk_columns"][fk]["data"] = tuple_to_list(curs.fetchall())
-        return meta_dict
+        # Assign Table Foreign Keys
+        for kd in key_list:
+            if kd[1] == "f" and kd[0] in schema_dict:
+                schema_dict[kd[0]]["fk_columns"][kd[2]] = {
+                    "table": kd[3],
+                    "column": kd[4],
+                    "data": []
+                }
+
+        # Get Schema Leading Index Columns
+        curs.execute(
+            SCT_QUERY_POSTGRES_GET_SCHEMA_INDEXES.format(self._schema)
+        )
+        for idx in curs.fetchall():
+            if idx[0] in schema_dict:
+                schema_dict[idx[0]]["indexed_columns"].append(idx[1])
+
+        # Build Table Row Statements
+        for tbl, meta_dict in schema_dict.items():
+            meta_dict["statements"] = self._build_row_statements(tbl, meta_dict)
+
+        return schema_dict
+
+    def _build_row_statements(self, table: str, meta_dict: dict) -> dict:
+        """
+        Parameterized row statements of a table, built once per metadata load and cached with it
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary of table
+        :return: Dictionary of insert, delete, select and update (tables with primary key) statements and their columns
+        """
+        def params(start: int, count: int) -> list:
+            return ["${}".format(start + i + 1) for i in range(count)]
+        insert_columns = list(meta_dict["insert"].keys())
+        view_columns = list(meta_dict["view"].keys())
+        key_columns = meta_dict["pk_columns"] if meta_dict["pk_columns"] else view_columns
+        set_columns = [col for col in insert_columns if col not in meta_dict["pk_columns"]]
+
+        statements = {
+            "insert": {
+                "sql": SCT_QUERY_POSTGRES_INSERT_ROW.format(
+                    table,
+                    ",".join(insert_columns),
+                    ",".join(params(0, len(insert_columns)))
+                ),
+                "columns": insert_columns
+            },
+            "delete": {
+                "sql": SCT_QUERY_POSTGRES_DROP_ROW.format(
+                    table,
+                    " and ".join(["{}={}".format(col, prm)
+                                  for col, prm in zip(key_columns, params(0, len(key_columns)))]),
+                    ",".join(view_columns)
+                ),
+                "columns": key_columns
+            }
+        }
+        if meta_dict["pk_columns"]:
+            statements["select"] = {
+                "sql": SCT_QUERY_POSTGRES_GET_ROW.format(
+                    ",".join(view_columns),
+                    table,
+                    " and ".join(["{}={}".format(col, prm)
+                                  for col, prm in zip(meta_dict["pk_columns"],
+                                                      params(0, len(meta_dict["pk_columns"])))])
+                ),
+                "columns": meta_dict["pk_columns"]
+            }
+        if meta_dict["pk_columns"] and set_columns:
+            statements["update"] = {
+                "sql": SCT_QUERY_POSTGRES_UPDATE_ROW.format(
+                    table,
+                    ", ".join(["{0}=COALESCE({1}, sct_new.{0})".format(col, prm)
+                               for col, prm in zip(set_columns, params(0, len(set_columns)))]),
+                    ",".join(view_columns),
+                    " and ".join(["{}={}".format(col, prm) for col, prm in
+                                  zip(meta_dict["pk_columns"], params(len(set_columns), len(key_columns)))]),
+                    " and ".join(["sct_new.{0}=sct_old.{0}".format(col) for col in meta_dict["pk_columns"]]),
+                    ",".join(["sct_old.{}".format(col) for col in view_columns] +
+                             ["sct_new.{}".format(col) for col in view_columns])
+                ),
+                "columns": set_columns + meta_dict["pk_columns"]
+            }
+        return statements
+
+    @staticmethod
+    def _statement_args(statement: dict, meta_dict: dict, values: dict) -> list:
+        """
+        Values bound to a row mutation statement, empty values of numeric columns being bound as NULL
+
+        :param statement: Row mutation statement
+        :param meta_dict: Metadata dictionary of table
+        :param values: Column values keyed by column name
+        :return: List of statement arguments
+        """
+        return [None if values[col] == "" and is_numeric_type(meta_dict["view"][col]["type"]) else values[col]
+                for col in statement["columns"]]
+
+    def get_fk_lookup(self, table: str, column: str, prefix: str = "", batch: int = 1, page_size: int = 20) -> dict:
+        """
+        Page of values a FK column can take, read from referenced column in its index order
 
-    def get_table_info(self, table: str, batch: int = 1, page_size: int = 3) -> dict:
+        :param table: Table name
+        :param column: FK column name
+        :param prefix: Value prefix to filter by, used as lower bound for numeric columns
+        :param batch: Page number
+        :param page_size: Max values per page
+        :return: Lookup dictionary with values and whether more pages exist
+        """
+        table_details = self.get_table_columns(table)
+        fk_detail = table_details["fk_columns"].get(column)
+        if not fk_detail:
+            return {"values": [], "has_more": False}
+        batch = batch if batch > 0 else 1
+
+        cache_key = (self._database, self._schema, fk_detail["table"], fk_detail["column"], prefix, batch, page_size)
+        lookup_dict = self._lookup_cache.get(cache_key)
+        if lookup_dict is None:
+            col_type = str(table_details["view"][column]["type"])
+            qry_args = []
+            if not prefix:
+                lookup_cond = "1 = 1"
+            elif is_numeric_type(col_type):
+                lookup_cond = SCT_QUERY_POSTGRES_FK_LOOKUP_SEEK.format(fk_detail["column"])
+                qry_args.append(float(prefix))
+            elif "char" in col_type.lower() or "text" in col_type.lower():
+                lookup_cond = SCT_QUERY_POSTGRES_FK_LOOKUP_PREFIX.format(fk_detail["column"])
+                qry_args.extend([prefix, escape_like(prefix) + "%"])
+            else:
+                lookup_cond = SCT_QUERY_POSTGRES_FK_LOOKUP_CAST.format(fk_detail["column"])
+                qry_args.append(escape_like(prefix) + "%")
+
+            # Fetch one extra value to know whether a next page exists
+            curs = self.get_cursor
+            curs.execute(
+                SCT_QUERY_POSTGRES_GET_FK_LOOKUP.format(fk_detail["column"], fk_detail["table"], lookup_cond),
+                qry_args + [page_size + 1, (batch - 1) * page_size]
+            )
+            lookup_values = tuple_to_list(curs.fetchall())
+            lookup_dict = {
+                "values": lookup_values[:page_size],
+                "has_more": len(lookup_values) > page_size
+            }
+            self._lookup_cache.put(cache_key, lookup_dict)
+
+        return lookup_dict
+
+    def estimate_table_count(self, table: str):
+        """
+        Row count estimate of a table read from planner statistics (pg_class.reltuples)
+
+        :param table: Table name
+        :return: Estimated row count, None when table has no statistics
+        """
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_ESTIMATE_COUNT, [table])
+        estimate = curs.fetchone()
+        return int(estimate[0]) if estimate and estimate[0] is not None and estimate[0] >= 0 else None
+
+    def get_table_count(self, table: str, search_con=None, qry_args: list = None) -> tuple:
+        """
+        Row count of a table, computed as per count strategy of table
+        .. admonition:: Note
+            exact runs count(*) on every call, cached serves count(*) results for TTL or until table is mutated
+            through SCT, estimate reads catalog statistics for unfiltered counts falling back to cached for
+            filtered counts, small tables and tables without statistics. window counts rows along with page data
+            (see _get_counted_page), this count being its cached fallback.
+
+        :param table: Table name
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :return: Tuple of row count and whether it is an estimate
+        """
+        strategy = get_count_strategy(table)
+        if strategy == "estimate" and not search_con:
+            estimate = self.estimate_table_count(table)
+            if estimate is not None and estimate >= sct_count_exact_threshold:
+                return estimate, True
+
+        cache_key = self._count_cache_key(table, search_con, qry_args)
+        table_count = None if strategy == "exact" else self._count_cache.get(cache_key)
+        if table_count is None:
+            curs = self.get_cursor
+            if search_con and qry_args:
+                curs.execute("SELECT count(*) FROM {} WHERE {}".format(table, search_con), qry_args)
+            elif search_con:
+                curs.execute("SELECT count(*) FROM {} WHERE {}".format(table, search_con))
+            else:
+                curs.execute("SELECT count(*) FROM {}".format(table))
+            table_count = int(curs.fetchone()[0])
+            if strategy != "exact":
+                self._count_cache.put(cache_key, table_count)
+        return table_count, False
+
+    def _count_cache_key(self, table: str, search_con=None, qry_args: list = None) -> tuple:
+        """
+        Count cache key of a table search
+
+        :param table: Table name
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :return: Cache key
+        """
+        return self._database, self._schema, table, search_con, tuple(qry_args) if qry_args else ()
+
+    def _get_counted_page(self, table: str, meta_dict: dict, search_con, qry_args: list,
+                          batch_num: int, page_size: int, page_cursor: str = None) -> bool:
+        """
+        Fetch a page of table rows along with row count into metadata dictionary, in a single query using a
+        window count
+        .. admonition:: Note
+            Page past last row, as well as last page of a keyset paged table, is fetched after counting rows.
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary with columns
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :param batch_num: Page number, used when no page cursor is provided
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token
+        :return: Whether page was fetched, if not row count is needed first
+        """
+        project_list = [k for k in meta_dict["view_columns"].keys()]
+        key_list, keyset = meta_dict["order_columns"], meta_dict["keyset"]
+        offset = page_size * max(batch_num - 1, 0)
+
+        # Size of last page is only known from row count
+        if keyset and page_cursor and decode_page_cursor(page_cursor, len(key_list))[0] == "last":
+            return False
+
+        def fetch_rows(limit, seek, reverse, skip):
+            return self.search_table_data(table, project_list, key_list, search_con, limit, skip, qry_args, seek,
+                                          reverse, with_count=True, descending=meta_dict["sort_desc"])
+
+        if keyset:
+            page = keyset_page(fetch_rows, project_list, key_list, page_size, page_cursor, offset)
+            table_data = page["rows"]
+        else:
+            page = {}
+            table_data = fetch_rows(page_size, None, False, offset)
+        if not table_data:
+            return False
+
+        meta_dict["table_count"], meta_dict["count_estimated"] = int(table_data[0][-1]), False
+        self._count_cache.put(self._count_cache_key(table, search_con, qry_args), meta_dict["table_count"])
+        meta_dict["table_data"] = tuple_to_dict(project_list, table_data)
+        meta_dict["next_cursor"] = page.get("next_cursor")
+        meta_dict["prev_cursor"] = page.get("prev_cursor")
+        meta_dict["last_cursor"] = page.get("last_cursor")
+        return True
+
+    def _get_page(self, table: str, meta_dict: dict, search_con, qry_args: list,
+                  batch_num: int, page_size: int, page_cursor: str = None):
+        """
+        Fetch a page of table rows into metadata dictionary, seeking on order columns when table has a primary key
+        and falling back to offset paging otherwise, see get_page_order
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary with columns and count
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :param batch_num: Page number, used when no page cursor is provided
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token
+        :return: None
+        """
+        project_list = [k for k in meta_dict["view_columns"].keys()]
+        key_list = meta_dict["order_columns"]
+        offset = page_size * max(batch_num - 1, 0)
+
+        if meta_dict["keyset"]:
+            page = keyset_page(
+                lambda limit, seek, reverse, skip: self.search_table_data(
+                    table, project_list, key_list, search_con, limit, skip, qry_args, seek, reverse,
+                    descending=meta_dict["sort_desc"]),
+                project_list, key_list, page_size, page_cursor, offset,
+                meta_dict["table_count"] - page_size * (ceil(meta_dict["table_count"] / page_size) - 1))
+            table_data = page["rows"]
+        else:
+            page = {}
+            table_data = self.search_table_data(table, project_list, key_list, search_con,
+                                                page_size, offset, qry_args, descending=meta_dict["sort_desc"])
+
+        meta_dict["table_data"] = tuple_to_dict(project_list, table_data)
+        meta_dict["next_cursor"] = page.get("next_cursor")
+        meta_dict["prev_cursor"] = page.get("prev_cursor")
+        meta_dict["last_cursor"] = page.get("last_cursor")
+
+    @timed_operation("browse")
+    def get_table_info(self, table: str, batch: int = 1, page_size: int = 3, page_cursor: str = None,
+                       sort_column: str = None, sort_desc: bool = False) -> dict:
         """
         Table metadata
 
         :param table: Table name
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param page_cursor: Page cursor token, pages on order columns instead of batch when provided
+        :param sort_column: Column rows are sorted by, primary key order if not provided
+        :param sort_desc: Whether rows are sorted in descending order
         :return: Metadata dictionary
         """
         meta_dict = dict()
-        curs = self.get_cursor
 
         # Get Column Details
-        column_detail = self.get_table_columns(table, True)
+        column_detail = self.get_table_columns(table)
         meta_dict["view_columns"] = column_detail["view"]
         meta_dict["insert_columns"] = column_detail["insert"]
         meta_dict["pk_columns"] = column_detail["pk_columns"]
         meta_dict["fk_columns"] = column_detail["fk_columns"]
+        meta_dict["indexed_columns"] = column_detail["indexed_columns"]
+
+        # Page order, a sort no index leads with sorts every searched row on each page view
+        meta_dict["order_columns"], meta_dict["keyset"] = get_page_order(
+            meta_dict["view_columns"], meta_dict["pk_columns"], sort_column)
+        meta_dict["sort_desc"] = sort_desc
+        meta_dict["sort_indexed"] = not sort_column or sort_column in meta_dict["indexed_columns"]
+
+        # Get table data along with count in a single query
+        if get_count_strategy(table) == "window" and self._get_counted_page(
+                table, meta_dict, None, None, batch, page_size, page_cursor):
+            return meta_dict
 
         # Get Table Count
-        curs.execute(
-            """
-            SELECT count(*) FROM {}
-            """.format(table)
-        )
-        meta_dict["table_count"] = int(curs.fetchone()[0])
+        meta_dict["table_count"], meta_dict["count_estimated"] = self.get_table_count(table)
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["table_count"] / page_size) else
                      1 if batch < 1 else ceil(meta_dict["table_count"] / page_size))
 
         # Get table data
-        table_data = self.get_table_data(table,
-                                         meta_dict["view_columns"].keys(),
-                                         meta_dict["pk_columns"],
-                                         page_size,
-                                         (batch_num - 1) * page_size)
-        meta_dict["table_data"] = tuple_to_dict([k for k in meta_dict["view_columns"].keys()], table_data)
+        self._get_page(table, meta_dict, None, None, batch_num, page_size, page_cursor)
 
         return meta_dict
 
-    def search_table_info(self, table: str,
-                          search_col, search_op, search_val, batch: int = 1, page_size: int = 3) -> dict:
+    @timed_operation("search")
+    def search_table_info(self, table: str, search_filter: list, batch: int = 1, page_size: int = 3,
+                          page_cursor: str = None, search_match: str = "all", sort_column: str = None,
+                          sort_desc: bool = False) -> dict:
         """
         Search metadata
 
         :param table: Table name
-        :param search_col: Searched Table Column
-        :param search_op: Search Operation
-        :param search_val: Search Value
+        :param search_filter: List of predicates (column, operator, value), see build_search_condition
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param page_cursor: Page cursor token, pages on order columns instead of batch when provided
+        :param search_match: all to match every predicate, any to match at least one
+        :param sort_column: Column rows are sorted by, primary key order if not provided
+        :param sort_desc: Whether rows are sorted in descending order
         :return: Metadata dictionary
         """
         meta_dict = dict()
-        curs = self.get_cursor
 
         # Get Column Details
-        column_detail = self.get_table_columns(table, True)
+        column_detail = self.get_table_columns(table)
         meta_dict["view_columns"] = column_detail["view"]
         meta_dict["insert_columns"] = column_detail["insert"]
         meta_dict["pk_columns"] = column_detail["pk_columns"]
         meta_dict["fk_columns"] = column_detail["fk_columns"]
-
-        # Search condition
-        col_type = (str(meta_dict["view_columns"][search_col].get("type"))).lower()
-        if search_op == 'like':
-            if ("int" in col_type and "point" not in col_type) or ("double" in col_type or "numeric" in col_type):
-                search_cond = "{} = {}".format(search_col, search_val)
-            else:
-                search_cond = "{} {} '%{}%'".format(search_col, search_op, search_val)
-        else:
-            if ("int" in col_type and "point" not in col_type) or ("double" in col_type or "numeric" in col_type):
-                search_cond = "{} {} {}".format(search_col, search_op, search_val)
-            else:
-                search_cond = "{} {} '{}'".format(search_col, search_op, search_val)
+        meta_dict["indexed_columns"] = column_detail["indexed_columns"]
+
+        # Page order, a sort no index leads with sorts every searched row on each page view
+        meta_dict["order_columns"], meta_dict["keyset"] = get_page_order(
+            meta_dict["view_columns"], meta_dict["pk_columns"], sort_column)
+        meta_dict["sort_desc"] = sort_desc
+        meta_dict["sort_indexed"] = not sort_column or sort_column in meta_dict["indexed_columns"]
+
+        # Search condition, values are bound as query arguments
+        search_cond, qry_args = build_search_condition(search_filter, meta_dict["view_columns"], "%s", search_match,
+                                                       meta_dict["indexed_columns"], SCT_QUERY_POSTGRES_SEARCH_PREFIX,
+                                                       SCT_QUERY_POSTGRES_SEARCH_CONTAINS)
+        # like on a text column leading an index matches as prefix, reported with search
+        meta_dict["search_prefix_columns"] = get_prefix_search_columns(search_filter, meta_dict["view_columns"],
+                                                                       meta_dict["indexed_columns"])
+
+        # Search plan, a search no index serves is refused or sampled on a large table
+        meta_dict["search_sampled"] = False
+        if sct_ui_search_scan_policy in ["refuse", "sample"] and \
+                not is_search_indexed(search_filter, meta_dict["indexed_columns"], search_match):
+            row_estimate = self.estimate_table_count(table)
+            if row_estimate is None:
+                row_estimate = self._count_cache.get(self._count_cache_key(table))
+            if row_estimate is not None and row_estimate >= sct_ui_search_scan_threshold:
+                if sct_ui_search_scan_policy == "refuse" or len(meta_dict["pk_columns"]) != 1:
+                    raise ValueError("Search of table {} must use an indexed column ({})".format(
+                        table, ", ".join(meta_dict["indexed_columns"])))
+                search_cond = "({}) AND {}".format(search_cond, SCT_QUERY_POSTGRES_SEARCH_SAMPLE.format(
+                    meta_dict["pk_columns"][0], table, int(sct_ui_search_sample_size)).strip())
+                meta_dict["search_sampled"] = True
+
+        # Get table data along with count in a single query
+        if get_count_strategy(table) == "window" and self._get_counted_page(
+                table, meta_dict, search_cond, qry_args, batch, page_size, page_cursor):
+            return meta_dict
 
         # Get Table Count
-        if len(search_cond):
-            search_qry = "SELECT count(*) FROM {} WHERE {}".format(table, search_cond)
-        else:
-            search_qry = "SELECT count(*) FROM {}".format(table)
-        curs.execute(search_qry)
-        meta_dict["table_count"] = int(curs.fetchone()[0])
+        meta_dict["table_count"], meta_dict["count_estimated"] = self.get_table_count(table, search_cond, qry_args)
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["table_count"] / page_size) else
                      1 if batch < 1 else ceil(meta_dict["table_count"] / page_size))
 
         # Get table data
-        table_data = self.search_table_data(table,
-                                            meta_dict["view_columns"].keys(),
-                                            meta_dict["pk_columns"],
-                                            search_cond,
-                                            page_size,
-                                            page_size * (batch_num - 1))
-        meta_dict["table_data"] = tuple_to_dict([k for k in meta_dict["view_columns"].keys()], table_data)
+        self._get_page(table, meta_dict, search_cond, qry_args, batch_num, page_size, page_cursor)
 
         return meta_dict
 
+    def _prepared_cursor(self, statement: dict, qry_args: list):
+        """
+        Execute a row statement as server side prepared statement, prepared once per connection
+
+        :param statement: Row statement
+        :param qry_args: Statement arguments
+        :return: Executed cursor
+        """
+        con = self.db_connection
+        stmt_name = "sct_{}".format(hashlib.md5(statement["sql"].encode("utf-8")).hexdigest()[:16])
+        with self._prepared_lock:
+            prepared = self._prepared.setdefault(con, set())
+
+        curs = con.cursor()
+        if stmt_name not in prepared:
+            curs.execute("PREPARE {} AS {}".format(stmt_name, statement["sql"]))
+            prepared.add(stmt_name)
+        curs.execute("EXECUTE {} ({})".format(stmt_name, ",".join(["%s"] * len(qry_args))), qry_args)
+        return curs
+
+    def _execute_statement(self, statement: dict, qry_args: list) -> int:
+        """
+        Execute a row mutation statement
+
+        :param statement: Row mutation statement
+        :param qry_args: Statement arguments
+        :return: Number of rows affected
+        """
+        return self._prepared_cursor(statement, qry_args).rowcount
+
+    def get_table_record(self, table: str, row_key: str):
+        """
+        Fetch a single row of table by its primary key
+
+        :param table: Table name
+        :param row_key: Row key token of row, created by encode_row_key
+        :return: Dictionary of row column values, None if row is not found or table has no primary key
+        """
+        table_details = self.get_table_columns(table)
+        statement = table_details["statements"].get("select")
+        if statement is None:
+            return None
+
+        rows = self._prepared_cursor(
+            statement, decode_row_key(row_key, len(statement["columns"]))).fetchall()
+        result = tuple_to_dict(list(table_details["view"].keys()), rows)
+        return result[0] if result else None
+
     def add_table_record(self, table: str, **kwargs):
         """
         Add row to table
@@ -331,154 +943,305 @@ class DbBackEnd:
         """
         # Query preparation
         table_details = self.get_table_columns(table)
-        qry_args = []
-        for col in table_details["insert"].keys():
-            if (("int" in table_details["insert"][col]["type"] and
-                 "point" not in table_details["insert"][col]["type"]) or
-                    ("double" in table_details["insert"][col]["type"] or
-                     "numeric" in table_details["insert"][col]["type"])):
-                qry_args.append("{}".format(kwargs[col]))
-            else:
-                qry_args.append("'{}'".format(kwargs[col]))
-        insert_qry = SCT_QUERY_POSTGRES_INSERT_ROW.format(
-            table,
-            ",".join(table_details["insert"].keys()),
-            ",".join(qry_args)
-        )
+        statement = table_details["statements"]["insert"]
 
         # Trigger insert
-        curs = self.get_cursor
-        curs.execute(insert_qry)
+        self._execute_statement(statement, self._statement_args(statement, table_details, kwargs))
         self.db_connection.commit()
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+
+    def _drop_row(self, table_details: dict, values: dict):
+        """
+        Delete a row, deleted row being returned by same statement
+
+        :param table_details: Metadata dictionary of table
+        :param values: Key column values of row
+        :return: Dictionary of deleted row column values, None if no row is deleted
+        """
+        statement = table_details["statements"]["delete"]
+        rows = self._prepared_cursor(statement, self._statement_args(statement, table_details, values)).fetchall()
+        deleted = tuple_to_dict(list(table_details["view"].keys()), rows)
+        return deleted[0] if deleted else None
+
+    def _edit_row(self, table_details: dict, values: dict) -> tuple:
+        """
+        Update a row, row before and after update being returned by same statement
+
+        :param table_details: Metadata dictionary of table
+        :param values: Column values of row, None values keeping current column value
+        :return: Tuple of row column values before and after update, (None, None) if no row is updated
+        """
+        statement = table_details["statements"]["update"]
+
+        # Row is locked and its prior version is joined in to return both images
+        rows = self._prepared_cursor(statement, self._statement_args(statement, table_details, values)).fetchall()
+        view_count = len(table_details["view"])
+        before = [row[:view_count] for row in rows]
+        after = [row[view_count:] for row in rows]
+        if not before or not after:
+            return None, None
+        before, after = tuple_to_dict(list(table_details["view"].keys()), [before[0], after[0]])
+        return before, after
 
     def drop_table_record(self, table: str, **kwargs):
         """
-        Drop row from table
+        Drop row from table, deleted row being returned by same statement
 
         :param table: Table name
-        :param kwargs: List of column values of new record
-        :return: None
+        :param kwargs: Key column values of record
+        :return: Dictionary of deleted row column values, None if no row is deleted
         """
-        # Query preparation
         table_details = self.get_table_columns(table)
-        qry_args = []
-        if len(table_details["pk_columns"]):
-            for col_nm in table_details["pk_columns"]:
-                if (("int" in table_details["view"][col_nm]["type"] and
-                     "point" not in table_details["view"][col_nm]["type"]) or
-                        ("double" in table_details["view"][col_nm]["type"] or
-                         "numeric" in table_details["view"][col_nm]["type"])):
-                    qry_args.append("{}={}".format(col_nm, kwargs[col_nm]))
-                else:
-                    qry_args.append("{}='{}'".format(col_nm, kwargs[col_nm]))
-        else:
-            for col_nm in table_details["view"].keys():
-                if (("int" in table_details["view"][col_nm]["type"] and
-                     "point" not in table_details["view"][col_nm]["type"]) or
-                        ("double" in table_details["view"][col_nm]["type"] or
-                         "numeric" in table_details["view"][col_nm]["type"])):
-                    qry_args.append("{}={}".format(col_nm, kwargs[col_nm]))
-                else:
-                    qry_args.append("{}='{}'".format(col_nm, kwargs[col_nm]))
-
-        drop_qry = SCT_QUERY_POSTGRES_DROP_ROW.format(
-            table,
-            " and ".join(qry_args)
-        )
 
-        # Trigger insert
-        curs = self.get_cursor
-        curs.execute(drop_qry)
+        # Trigger delete
+        deleted = self._drop_row(table_details, kwargs)
         self.db_connection.commit()
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return deleted
 
     def edit_table_record(self, table: str, **kwargs):
         """
-        Edit row to table
+        Edit row to table, row before and after update being returned by same statement
 
         :param table: Table name
-        :param kwargs: List of column values of new record
-        :return: None
+        :param kwargs: Column values of record, None values keeping current column value
+        :return: Tuple of row column values before and after update, (None, None) if no row is updated
         """
-        # Query preparation
+        # Only tables with primary key can be edited
         table_details = self.get_table_columns(table)
+        if "update" not in table_details["statements"]:
+            return None, None
 
-        # Where Clause
-        qry_args = []
-        if len(table_details["pk_columns"]):
-            for col_nm in table_details["pk_columns"]:
-                if (("int" in table_details["view"][col_nm]["type"] and
-                     "point" not in table_details["view"][col_nm]["type"]) or
-                        ("double" in table_details["view"][col_nm]["type"] or
-                         "numeric" in table_details["view"][col_nm]["type"])):
-                    qry_args.append("{}={}".format(col_nm, kwargs[col_nm]))
-                else:
-                    qry_args.append("{}='{}'".format(col_nm, kwargs[col_nm]))
-        else:
-            return
+        # Trigger update
+        before, after = self._edit_row(table_details, kwargs)
+        self.db_connection.commit()
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return before, after
 
-        # Set Directive
-        set_args = []
-        for col in table_details["insert"].keys():
-            if col not in table_details["pk_columns"]:
-                if (("int" in table_details["insert"][col]["type"] and
-                     "point" not in table_details["insert"][col]["type"]) or
-                        ("double" in table_details["insert"][col]["type"] or
-                         "numeric" in table_details["insert"][col]["type"])):
-                    set_args.append("{}={}".format(col, kwargs[col]))
-                else:
-                    set_args.append("{}='{}'".format(col, kwargs[col]))
-
-        edit_qry = SCT_QUERY_POSTGRES_UPDATE_ROW.format(
-            table,
-            ", ".join(set_args),
-            " and ".join(qry_args)
-        )
+    def change_table_records(self, table: str, changes: list) -> list:
+        """
+        Apply row edits and deletes to table in a single transaction, rolled back as a whole on any failure
 
-        # Trigger insert
-        curs = self.get_cursor
-        curs.execute(edit_qry)
-        self.db_connection.commit()
+        :param table: Table name
+        :param changes: List of (operation, column values) tuples, operation being edit or delete
+        :return: List of row images per change, (before, after) tuple for edits and deleted row for deletes
+        """
+        table_details = self.get_table_columns(table)
+        if "update" not in table_details["statements"] and any(op == "edit" for op, _ in changes):
+            raise ValueError("Rows of table {} can not be edited".format(table))
+
+        try:
+            results = [self._edit_row(table_details, values) if op == "edit" else
+                       self._drop_row(table_details, values) for op, values in changes]
+            self.db_connection.commit()
+        except Exception:
+            self.db_connection.rollback()
+            raise
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return results
 
     def create_audit_table(self, audit_table: str):
         """
-        Create a Audit table
+        Create a Audit table, partitioned by month if audit partitioning is enabled
 
         :param audit_table: Audit table name
         :return: None
         """
         curs = self.get_cursor
-        query_str = SCT_QUERY_POSTGRES_AUDIT_TABLE_CREATION.format(
-            audit_table
-        )
+        if sct_audit_partition:
+            curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_TABLE_CREATION.format(audit_table))
+            # An existing Audit table is kept as is
+            if self._is_partitioned(audit_table):
+                curs.execute(SCT_QUERY_POSTGRES_AUDIT_DEFAULT_PARTITION_CREATION.format(audit_table))
+        else:
+            query_str = SCT_QUERY_POSTGRES_AUDIT_TABLE_CREATION.format(
+                audit_table
+            )
 
-        curs.execute(query_str)
+            curs.execute(query_str)
         self.db_connection.commit()
+        self.add_audit_partitions(audit_table)
+        self.migrate_audit_table(audit_table)
 
-    def get_audits(self, audit_table: str, batch: int = 1, page_size: int = 3) -> dict:
+    def migrate_audit_table(self, audit_table: str):
+        """
+        Add missing indexes, including full text index of metadata, to Audit table, built concurrently so audits
+        are written meanwhile
+        .. admonition:: Note
+            Indexes of a partitioned Audit table can not be built concurrently, they are created on every partition
+            in a single transaction instead.
+
+        :param audit_table: Audit table name
+        :return: None
+        """
+        con = self.db_connection
+        curs = con.cursor()
+        partitioned = self._is_partitioned(audit_table)
+        curs.execute(SCT_QUERY_POSTGRES_AUDIT_INDEX_LIST, (audit_table,))
+        existing = dict(curs.fetchall())
+        con.commit()
+
+        # Column indexes and full text index of metadata
+        indexes = [(index_name, "({})".format(columns)) for index_name, columns in audit_indexes(audit_table)]
+        indexes.append(("{}_metadata_fts_idx".format(audit_table),
+                        "USING gin ({})".format(SCT_QUERY_POSTGRES_AUDIT_TSVECTOR)))
+
+        if partitioned:
+            for index_name, columns in indexes:
+                curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_INDEX_CREATION.format(
+                    audit_table, index_name, columns))
+            con.commit()
+            return
+
+        # Concurrent index build can not run inside a transaction
+        autocommit = con.autocommit
+        con.autocommit = True
+        try:
+            for index_name, columns in indexes:
+                if existing.get(index_name):
+                    continue
+                if index_name in existing:
+                    # Left invalid by an interrupted concurrent build
+                    curs.execute(SCT_QUERY_POSTGRES_AUDIT_INDEX_DROP.format(index_name))
+                curs.execute(SCT_QUERY_POSTGRES_AUDIT_INDEX_CREATION.format(audit_table, index_name, columns))
+        finally:
+            con.autocommit = autocommit
+
+    def _is_partitioned(self, audit_table: str) -> bool:
+        """
+        Whether Audit table is a partitioned table
+
+        :param audit_table: Audit table name
+        :return: True if table is partitioned
+        """
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_AUDIT_IS_PARTITIONED, (audit_table,))
+        rec = curs.fetchone()
+        return bool(rec and rec[0])
+
+    def add_audit_partitions(self, audit_table: str, ahead: int = sct_audit_partition_ahead) -> list:
+        """
+        Create missing monthly partitions of a partitioned Audit table, from current month to months ahead
+
+        :param audit_table: Audit table name
+        :param ahead: Months of partitions created ahead of current month
+        :return: List of created partition names
+        """
+        if not self._is_partitioned(audit_table):
+            return []
+        con = self.db_connection
+        curs = con.cursor()
+        curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITION_LIST, (audit_table,))
+        existing = [rec[0] for rec in curs.fetchall()]
+
+        created = []
+        now = datetime.now()
+        for month in range(max(ahead, 0) + 1):
+            period_start = month_start(now, month)
+            partition = "{}_p{}".format(audit_table, period_start.strftime("%Y%m"))
+            if partition not in existing:
+                curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITION_CREATION.format(
+                    audit_table, partition, period_start, month_start(period_start, 1)))
+                created.append(partition)
+        con.commit()
+        return created
+
+    def archive_audit_table(self, audit_table: str, retention: int = sct_audit_retention_months) -> list:
+        """
+        Archive and remove audits of months older than retention
+        .. admonition:: Note
+            Monthly partitions of a partitioned Audit table are archived and dropped whole, audits left (in
+            default partition or in a table that is not partitioned) are archived and deleted month by month.
+
+        :param audit_table: Audit table name
+        :param retention: Months of audits kept besides current month, 0 keeps all audits
+        :return: List of archived periods (YYYYMM)
+        """
+        if retention <= 0:
+            return []
+        con = self.db_connection
+        curs = con.cursor()
+        cutoff = month_start(datetime.now(), -retention)
+        archived = []
+
+        if self._is_partitioned(audit_table):
+            curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITION_LIST, (audit_table,))
+            prefix = "{}_p".format(audit_table)
+            for partition in sorted(rec[0] for rec in curs.fetchall()):
+                period = partition[len(prefix):]
+                if (not partition.startswith(prefix) or not period.isdigit() or
+                        month_start(datetime.strptime(period, "%Y%m"), 1) > cutoff):
+                    continue
+                archive_audits(audit_table, period, lambda file: curs.copy_expert(
+                    SCT_QUERY_POSTGRES_AUDIT_PARTITION_ARCHIVE.format(partition), file))
+                curs.execute(SCT_QUERY_POSTGRES_AUDIT_PARTITION_DROP.format(partition))
+                con.commit()
+                archived.append(period)
+
+        while True:
+            curs.execute(SCT_QUERY_POSTGRES_AUDIT_OLDEST.format(audit_table), (cutoff,))
+            oldest = curs.fetchone()[0]
+            if oldest is None:
+                break
+            period_start, period_end = month_start(oldest), month_start(oldest, 1)
+            archive_audits(audit_table, period_start.strftime("%Y%m"), lambda file: curs.copy_expert(
+                SCT_QUERY_POSTGRES_AUDIT_PERIOD_ARCHIVE.format(audit_table, period_start, period_end), file))
+            curs.execute(SCT_QUERY_POSTGRES_AUDIT_PERIOD_DELETE.format(audit_table), (period_start, period_end))
+            con.commit()
+            archived.append(period_start.strftime("%Y%m"))
+
+        self._count_cache.invalidate_table(self._database, self._schema, audit_table)
+        return archived
+
+    def maintain_audit_table(self, audit_table: str) -> dict:
+        """
+        Create upcoming Audit table partitions and archive audits older than retention
+
+        :param audit_table: Audit table name
+        :return: Dictionary of created partitions and archived periods
+        """
+        return {
+            "partitions_created": self.add_audit_partitions(audit_table),
+            "periods_archived": self.archive_audit_table(audit_table)
+        }
+
+    @timed_operation("browse")
+    def get_audits(self, audit_table: str, batch: int = 1, page_size: int = 3,
+                   audit_from: str = None, audit_to: str = None) -> dict:
         """
         Get Audits
 
         :param audit_table: Audit table name
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
         :return: Audit data
         """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
         curs = self.get_cursor
         meta_dict = dict()
 
+        # Time range condition
+        time_cond = audit_time_condition(audit_from, audit_to)
+
         # Get Table Count
-        curs.execute(
-            """
-            SELECT count(*) FROM {}
-            """.format(audit_table)
-        )
-        meta_dict["audits_count"] = int(curs.fetchone()[0])
+        meta_dict["audits_count"] = self.get_table_count(audit_table, time_cond or None)[0]
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["audits_count"] / page_size) else
-                     1 if batch < 1 else ceil(meta_dict["audits_count"] / page_size))
+                     1 if batch < 1 else max(ceil(meta_dict["audits_count"] / page_size), 1))
 
-        adt_qry = SCT_QUERY_POSTGRES_AUDIT_GET.format(audit_table, (batch_num - 1) * page_size, page_size)
+        if time_cond:
+            adt_qry = SCT_QUERY_POSTGRES_AUDIT_SEARCH.format(audit_table, time_cond, (batch_num - 1) * page_size, page_size)
+        else:
+            adt_qry = SCT_QUERY_POSTGRES_AUDIT_GET.format(audit_table, (batch_num - 1) * page_size, page_size)
         curs.execute(adt_qry)
 
         audit_columns = ["audit_user", "audit_time", "operation_performed",
@@ -487,8 +1250,9 @@ class DbBackEnd:
 
         return meta_dict
 
+    @timed_operation("search")
     def search_audits(self, audit_table: str, audit_search_col: str, audit_search_op: str, audit_search_val: str,
-                      batch: int = 1, page_size: int = 3) -> dict:
+                      batch: int = 1, page_size: int = 3, audit_from: str = None, audit_to: str = None) -> dict:
         """
         Search Audits
 
@@ -498,8 +1262,13 @@ class DbBackEnd:
         :param audit_search_val: Audit table search value
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
         :return: Audit data
         """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
         curs = self.get_cursor
         meta_dict = dict()
 
@@ -515,18 +1284,16 @@ class DbBackEnd:
                 search_cond = "{} {} {}".format(audit_search_col, audit_search_op, audit_search_val)
             else:
                 search_cond = "{} {} '{}'".format(audit_search_col, audit_search_op, audit_search_val)
+        time_cond = audit_time_condition(audit_from, audit_to)
+        if time_cond:
+            search_cond = "{} AND {}".format(search_cond, time_cond)
 
         # Get Table Count
-        if len(search_cond):
-            search_qry = "SELECT count(*) FROM {} WHERE {}".format(audit_table, search_cond)
-        else:
-            search_qry = "SELECT count(*) FROM {}".format(audit_table)
-        curs.execute(search_qry)
-        meta_dict["audits_count"] = int(curs.fetchone()[0])
+        meta_dict["audits_count"] = self.get_table_count(audit_table, search_cond)[0]
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["audits_count"] / page_size) else
-                     1 if batch < 1 else ceil(meta_dict["audits_count"] / page_size))
+                     1 if batch < 1 else max(ceil(meta_dict["audits_count"] / page_size), 1))
 
         if len(search_cond):
             adt_qry = SCT_QUERY_POSTGRES_AUDIT_SEARCH.format(
@@ -541,108 +1308,235 @@ class DbBackEnd:
 
         return meta_dict
 
-    def add_audit(self, audit_table: str, status: str, audit_user: str, operation_performed: str,
-                  table_name: str, operation_metadata: str):
+    @timed_operation("search")
+    def search_audit_text(self, audit_table: str, audit_text: str, page_size: int = 3, page_cursor: str = None,
+                          audit_from: str = None, audit_to: str = None) -> dict:
         """
-        Insert a Audit record
+        Full text search of Audit metadata, newest audits first, seeking on audit id page after page
+        .. admonition:: Note
+            Words are matched through GIN index of metadata text search vector.
 
         :param audit_table: Audit table name
+        :param audit_text: Searched text, matching audits contain all its words
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token of next page, first page if None
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
+        :return: Audit data and next page cursor, None on last page
+        """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
+        meta_dict = {
+            "audits_data": [],
+            "next_cursor": None
+        }
+        terms = audit_text_terms(audit_text)
+        if not terms:
+            return meta_dict
+
+        # Match condition
+        search_cond = [SCT_QUERY_POSTGRES_AUDIT_TEXT_MATCH]
+        qry_args = [" ".join(terms)]
+        if page_cursor:
+            key_values = decode_page_cursor(page_cursor, 1)[1]
+            search_cond.append("audit_id < %s")
+            qry_args.append(int(key_values[0]))
+        time_cond = audit_time_condition(audit_from, audit_to)
+        if time_cond:
+            search_cond.append(time_cond)
+
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_AUDIT_TEXT_SEARCH.format(audit_table, " AND ".join(search_cond)),
+                     qry_args + [page_size + 1])
+        audit_rows = curs.fetchall()
+
+        audit_columns = ["audit_user", "audit_time", "operation_performed",
+                         "table_name", "operation_status", "operation_metadata"]
+        meta_dict["audits_data"] = tuple_to_dict(audit_columns, [rec[1:] for rec in audit_rows[:page_size]])
+        if len(audit_rows) > page_size:
+            meta_dict["next_cursor"] = encode_page_cursor("next", [audit_rows[page_size - 1][0]])
+        return meta_dict
+
+    def add_audit(self, audit_table: str, audit_user: str, operation_performed: str, table_name: str,
+                  status: str, operation_metadata: dict):
+        """
+        Insert a Audit record as audit policy of operation requires
+
+        :param audit_table: Audit table name
+        :param audit_user: Audit user
+        :param operation_performed: Audit operation
+        :param table_name: Table impacted
         :param status: Audit operation status
+        :param operation_metadata: Operation detail
+        :return: None
+        """
+        self._audit_policy.record(audit_table, audit_user, operation_performed, table_name, status,
+                                  operation_metadata)
+
+    def _write_audit(self, audit_table: str, audit_user: str, operation_performed: str, table_name: str,
+                     status: str, operation_metadata: dict):
+        """
+        Write a Audit record, queued for audit writer unless audits are written synchronously
+
+        :param audit_table: Audit table name
         :param audit_user: Audit user
         :param operation_performed: Audit operation
         :param table_name: Table impacted
+        :param status: Audit operation status
         :param operation_metadata: Operation detail
         :return: None
         """
-        curs = self.get_cursor
-        query_str = SCT_QUERY_POSTGRES_AUDIT_PUT.format(
-            audit_table,
-            audit_user if audit_user else "ANONYMOUS",
+        audit_row = (
             operation_performed,
             table_name,
             status,
-            json.dumps(operation_metadata)
+            audit_user if audit_user else "ANONYMOUS",
+            json.dumps(operation_metadata, default=str)
         )
 
-        curs.execute(query_str)
-        self.db_connection.commit()
+        audit_writer = self._get_audit_writer()
+        if audit_writer:
+            audit_writer.submit(audit_table, audit_row)
+        else:
+            self.insert_audits(audit_table, [audit_row])
 
-    def get_pending_bulk_loading(self, audit_table, max_failure):
+    def insert_audits(self, audit_table: str, audit_rows: list):
         """
-        List of files pending for processing
+        Insert Audit records with a single multi row insert
 
         :param audit_table: Audit table name
-        :param max_failure: Max number of failure before we discard a file
-        :return: dictionary with keys for table name and file to load
+        :param audit_rows: List of audit column values
+        :return: None
+        """
+        query_str = SCT_QUERY_POSTGRES_AUDIT_PUT.format(audit_table)
+        execute_values(self.get_cursor, query_str, audit_rows, page_size=len(audit_rows))
+        self.db_connection.commit()
+        self._count_cache.invalidate_table(self._database, self._schema, audit_table)
+
+    def _get_audit_writer(self):
+        """
+        Audit writer, started on first audit
+
+        :return: AuditWriter, None if audits are written synchronously
+        """
+        if not sct_audit_async:
+            return None
+        with self._audit_lock:
+            if self._audit_writer is None:
+                self._audit_writer = AuditWriter(self.insert_audits, self.release)
+        return self._audit_writer
+
+    def create_bulk_job_table(self, job_table: str):
+        """
+        Create a Bulk load job table
+
+        :param job_table: Bulk load job table name
+        :return: None
         """
-        # Fetch data
         curs = self.get_cursor
-        curs.execute(
-            SCT_QUERY_POSTGRES_AUDIT_BULK_LOAD.format(
-                audit_table
-            )
-        )
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_TABLE_CREATION.format(job_table))
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_INDEX_CREATION.format(job_table))
+        self.db_connection.commit()
 
-        # Group data
-        all_records = dict()
-        for rec in curs.fetchall():
-            table_name, file_name, action_name = (rec[0], json.loads(rec[2])["file_name"], rec[1])
-            if table_name not in all_records:
-                all_records[table_name] = dict()
-            if file_name not in all_records[table_name]:
-                all_records[table_name][file_name] = []
-            (all_records[table_name][file_name]).append(action_name)
-
-        # Filter out files that need to be considered
-        result_dict = dict()
-        for tbl in all_records.keys():
-            for fl in all_records[tbl]:
-                if ("SUCCESS" not in all_records[tbl][fl] and
-                        len([st for st in all_records[tbl][fl] if st == "FAILED"]) <= int(max_failure)):
-                    if tbl not in result_dict:
-                        result_dict[tbl] = [fl]
-                    else:
-                        result_dict[tbl].append(fl)
-
-        return result_dict
-
-    def bulk_load_table_records(self, table: str, file_path: str):
+    def add_bulk_job(self, job_table: str, table_name: str, file_name: str, job_user: str):
         """
-        Add row to table
+        Add a pending Bulk load job
 
-        :param table: Table name
-        :param file_path: File name to load table from
+        :param job_table: Bulk load job table name
+        :param table_name: Table to load
+        :param file_name: Uploaded file name
+        :param job_user: User uploading file
         :return: None
         """
-        total_rec = 0
         curs = self.get_cursor
-        table_details = self.get_table_columns(table)
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_PUT.format(job_table),
+                     (table_name, file_name, job_user or "ANONYMOUS"))
+        self.db_connection.commit()
+
+    def claim_bulk_jobs(self, job_table: str, max_jobs: int, timeout: int) -> list:
+        """
+        Claim pending Bulk load jobs, moving them to RUNNING state, jobs claimed by another scheduler are skipped
+
+        :param job_table: Bulk load job table name
+        :param max_jobs: Max jobs claimed
+        :param timeout: Seconds after which a RUNNING job is considered abandoned and claimed again
+        :return: List of claimed job dictionaries
+        """
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_CLAIM.format(job_table), (int(timeout), int(max_jobs)))
+        jobs = tuple_to_dict(["job_id", "table_name", "file_name", "job_user", "attempts", "rows_loaded"],
+                             curs.fetchall())
+        self.db_connection.commit()
+        return sorted(jobs, key=lambda job: job["job_id"])
+
+    def finish_bulk_job(self, job_table: str, job_id: int, job_state: str, rows_loaded: int = None,
+                        job_error: str = None):
+        """
+        Move a claimed Bulk load job out of RUNNING state
 
-        # Read in CSV
-        with open(file_path, mode='r') as file:
-            csv_file = csv.reader(file)
-            column_list = []
-            for i, row in enumerate(csv_file):
-                if not i:
-                    column_list = row
-                else:
-                    qry_args = []
-                    for c, col in enumerate(column_list):
-                        if (("int" in table_details["insert"][col]["type"] and
-                             "point" not in table_details["insert"][col]["type"]) or
-                                ("double" in table_details["insert"][col]["type"] or
-                                 "numeric" in table_details["insert"][col]["type"])):
-                            qry_args.append("{}".format(row[c]))
-                        else:
-                            qry_args.append("'{}'".format(row[c]))
-                    insert_qry = SCT_QUERY_POSTGRES_INSERT_ROW.format(
-                        table,
-                        ",".join(column_list),
-                        ",".join(qry_args)
-                    )
-
-                    curs.execute(insert_qry)
-                    total_rec = total_rec + 1
+        :param job_table: Bulk load job table name
+        :param job_id: Job id
+        :param job_state: New job state (SUCCESS, PENDING for retry, FAILED)
+        :param rows_loaded: Number of rows loaded, recorded progress is kept if not provided
+        :param job_error: Load error
+        :return: None
+        """
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_FINISH.format(job_table),
+                     (job_state, rows_loaded, job_error, job_id))
+        self.db_connection.commit()
 
+    def set_bulk_job_progress(self, job_table: str, job_id: int, rows_loaded: int):
+        """
+        Record rows of a claimed Bulk load job committed so far, a retry of job resumes past them
+
+        :param job_table: Bulk load job table name
+        :param job_id: Job id
+        :param rows_loaded: Number of file rows committed
+        :return: None
+        """
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_POSTGRES_BULK_JOB_PROGRESS.format(job_table), (rows_loaded, job_id))
         self.db_connection.commit()
-        return total_rec
+
+    @timed_operation("bulk_load")
+    def bulk_load_table_records(self, table: str, file_path: str, skip_rows: int = 0, progress=None):
+        """
+        Add rows of a CSV file to table, streaming file through COPY in one transaction
+
+        :param table: Table name
+        :param file_path: File name to load table from
+        :param skip_rows: Number of leading file rows committed by an earlier attempt
+        :param progress: Called with number of file rows committed once COPY is committed
+        :return: Number of file rows loaded, skipped rows included
+        """
+        table_details = self.get_table_columns(table)
+        con = self.db_connection
+        curs = con.cursor()
+
+        # Stream validated CSV into COPY, empty values of text columns are kept as empty strings
+        with open(file_path, mode='r', newline='') as file:
+            csv_file = CsvBulkReader(file, table_details["insert"], skip_rows)
+            text_columns = [col for col in csv_file.columns
+                            if not is_numeric_type(table_details["insert"][col]["type"])]
+            copy_qry = SCT_QUERY_POSTGRES_COPY_ROWS.format(
+                table,
+                ",".join(csv_file.columns),
+                ", FORCE_NOT_NULL ({})".format(",".join(text_columns)) if text_columns else ""
+            )
+            try:
+                if csv_file.columns:
+                    curs.copy_expert(copy_qry, csv_file)
+                con.commit()
+                if progress:
+                    progress(csv_file.row_count)
+            except Exception:
+                con.rollback()
+                if csv_file.error:
+                    raise csv_file.error
+                raise
+
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return csv_file.row_count
@@ -4,70 +4,99 @@
     This module consists of RDBMS Queries
 """
 
-SCT_QUERY_POSTGRES_GET_COLMN_DETAIL = """
-select st.relname as TableName, c.column_name, pgd.description, c.data_type, 
-            c.character_maximum_length, c.column_default
-            from pg_catalog.pg_statio_all_tables as st
-            inner join information_schema.columns c
-            on c.table_schema = st.schemaname
-            and c.table_name = st.relname
+SCT_QUERY_POSTGRES_GET_SCHEMA_COLUMNS = """
+select c.table_name, c.column_name, pgd.description, c.data_type,
+            c.character_maximum_length, c.column_default, c.is_nullable
+            from information_schema.columns c
+            inner join pg_catalog.pg_namespace n
+            on n.nspname = c.table_schema
+            inner join pg_catalog.pg_class t
+            on t.relnamespace = n.oid
+            and t.relname = c.table_name
             left join pg_catalog.pg_description pgd
-            on pgd.objoid=st.relid
-            and pgd.objsubid=c.ordinal_position
-            where st.relname = '{}'
-"""
-
-SCT_QUERY_POSTGRES_GET_PK_DETAIL = """
-SELECT c.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.constraint_column_usage AS ccu USING (constraint_schema, constraint_name)
-            JOIN information_schema.columns AS c ON c.table_schema = tc.constraint_schema
-              AND tc.table_name = c.table_name AND ccu.column_name = c.column_name
-            WHERE constraint_type = 'PRIMARY KEY' and tc.table_name = '{}'
-"""
-
-SCT_QUERY_POSTGRES_GET_FK_DETAIL = """
-            WITH unnested_confkey AS (
-              SELECT oid, unnest(confkey) as confkey
-              FROM pg_constraint
-            ),
-            unnested_conkey AS (
-              SELECT oid, unnest(conkey) as conkey
-              FROM pg_constraint
-            )
-            select
-              c.conname                   AS constraint_name,
-              c.contype                   AS constraint_type,
+            on pgd.objoid = t.oid
+            and pgd.objsubid = c.ordinal_position
+            where c.table_schema = '{}'
+            order by c.table_name, c.ordinal_position
+"""
+
+SCT_QUERY_POSTGRES_GET_SCHEMA_KEYS = """
+select
               tbl.relname                 AS constraint_table,
+              c.contype                   AS constraint_type,
               col.attname                 AS constraint_column,
               referenced_tbl.relname      AS referenced_table,
-              referenced_field.attname    AS referenced_column,
-              pg_get_constraintdef(c.oid) AS definition
+              referenced_field.attname    AS referenced_column
             FROM pg_constraint c
-            LEFT JOIN unnested_conkey con ON c.oid = con.oid
-            LEFT JOIN pg_class tbl ON tbl.oid = c.conrelid
-            LEFT JOIN pg_attribute col ON (col.attrelid = tbl.oid AND col.attnum = con.conkey)
+            JOIN pg_namespace n ON n.oid = c.connamespace
+            JOIN pg_class tbl ON tbl.oid = c.conrelid
+            CROSS JOIN LATERAL unnest(c.conkey, c.confkey) WITH ORDINALITY AS k(conkey, confkey, ord)
+            JOIN pg_attribute col ON (col.attrelid = c.conrelid AND col.attnum = k.conkey)
             LEFT JOIN pg_class referenced_tbl ON c.confrelid = referenced_tbl.oid
-            LEFT JOIN unnested_confkey conf ON c.oid = conf.oid
-            LEFT JOIN pg_attribute referenced_field ON (referenced_field.attrelid = c.confrelid 
-            AND referenced_field.attnum = conf.confkey)
-            WHERE c.contype = 'f';
+            LEFT JOIN pg_attribute referenced_field ON (referenced_field.attrelid = c.confrelid
+            AND referenced_field.attnum = k.confkey)
+            WHERE n.nspname = '{}' AND c.contype IN ('p', 'f')
+            ORDER BY tbl.relname, c.contype, c.conname, k.ord
+"""
+
+SCT_QUERY_POSTGRES_GET_SCHEMA_INDEXES = """
+select distinct t.relname, a.attname
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN pg_attribute a ON (a.attrelid = t.oid AND a.attnum = i.indkey[0])
+            WHERE n.nspname = '{}' AND i.indisvalid AND i.indpred IS NULL
+"""
+
+SCT_QUERY_POSTGRES_SEARCH_PREFIX = """
+{0} >= %s AND {0} LIKE %s ESCAPE '\\'
+"""
+
+SCT_QUERY_POSTGRES_SEARCH_CONTAINS = """
+{0} LIKE %s ESCAPE '\\'
+"""
+
+SCT_QUERY_POSTGRES_SEARCH_SAMPLE = """
+{0} <= (SELECT max({0}) FROM (SELECT {0} FROM {1} ORDER BY {0} LIMIT {2}) sct_sample)
 """
 
 SCT_QUERY_POSTGRES_GET_FK_LOOKUP = """
-SELECT DISTINCT {} FROM {}
+SELECT {0} FROM {1} WHERE {2} ORDER BY {0} LIMIT %s OFFSET %s
+"""
+
+SCT_QUERY_POSTGRES_FK_LOOKUP_PREFIX = """
+{0} >= %s AND {0} LIKE %s ESCAPE '\\'
+"""
+
+SCT_QUERY_POSTGRES_FK_LOOKUP_SEEK = """
+{0} >= %s
+"""
+
+SCT_QUERY_POSTGRES_FK_LOOKUP_CAST = """
+CAST({0} AS TEXT) LIKE %s ESCAPE '\\'
+"""
+
+SCT_QUERY_POSTGRES_GET_ROW = """
+SELECT {} FROM {} WHERE {}
 """
 
 SCT_QUERY_POSTGRES_INSERT_ROW = """
 INSERT INTO {}({}) VALUES({})
 """
 
+SCT_QUERY_POSTGRES_COPY_ROWS = """
+COPY {}({}) FROM STDIN WITH (FORMAT csv{})
+"""
+
 SCT_QUERY_POSTGRES_DROP_ROW = """
-DELETE FROM {} WHERE {}
+DELETE FROM {} WHERE {} RETURNING {}
 """
 
 SCT_QUERY_POSTGRES_UPDATE_ROW = """
-UPDATE {} SET {} WHERE {}
+UPDATE {0} AS sct_new SET {1}
+FROM (SELECT {2} FROM {0} WHERE {3} FOR UPDATE) AS sct_old
+WHERE {4}
+RETURNING {5}
 """
 
 SCT_QUERY_POSTGRES_AUDIT_GET = """
@@ -76,13 +105,7 @@ ORDER BY audit_id OFFSET {} LIMIT {}
 """
 
 SCT_QUERY_POSTGRES_AUDIT_PUT = """
-INSERT INTO {0}(operation_performed, table_name, operation_status, audit_user, operation_metadata) VALUES (
-    '{1}', '{2}', '{3}', '{4}', '{5}'
-)
-"""
-
-SCT_QUERY_POSTGRES_AUDIT_BULK_LOAD = """
-SELECT table_name, operation_status, operation_metadata FROM {} WHERE operation_performed = 'BULK_UPLOAD'
+INSERT INTO {0}(operation_performed, table_name, operation_status, audit_user, operation_metadata) VALUES %s
 """
 
 SCT_QUERY_POSTGRES_AUDIT_TABLE_CREATION = """
@@ -97,8 +120,160 @@ create table if not exists governance.sct_audits (
 );
 """
 
+SCT_QUERY_POSTGRES_AUDIT_INDEX_LIST = """
+SELECT i.relname, x.indisvalid FROM pg_catalog.pg_index x
+JOIN pg_catalog.pg_class i ON i.oid = x.indexrelid
+WHERE x.indrelid = to_regclass(%s)
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_INDEX_DROP = """
+DROP INDEX CONCURRENTLY IF EXISTS {}
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_INDEX_CREATION = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {1} ON {0} {2}
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_INDEX_CREATION = """
+CREATE INDEX IF NOT EXISTS {1} ON {0} {2}
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_TSVECTOR = "to_tsvector('simple', coalesce(operation_metadata, ''))"
+
+SCT_QUERY_POSTGRES_AUDIT_TEXT_MATCH = SCT_QUERY_POSTGRES_AUDIT_TSVECTOR + " @@ plainto_tsquery('simple', %s)"
+
+SCT_QUERY_POSTGRES_AUDIT_TEXT_SEARCH = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {0}
+WHERE {1}
+ORDER BY audit_id DESC LIMIT %s
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITIONED_TABLE_CREATION = """
+create table if not exists {0} (
+        audit_id serial,
+        audit_user VARCHAR (100) not null,
+        audit_time timestamp NOT NULL DEFAULT NOW(),
+        operation_performed VARCHAR (100) not null,
+        table_name VARCHAR (100) not null,
+        operation_status VARCHAR (15) not null,
+        operation_metadata VARCHAR (5000),
+        PRIMARY KEY (audit_id, audit_time)
+) PARTITION BY RANGE (audit_time);
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_DEFAULT_PARTITION_CREATION = """
+create table if not exists {0}_default PARTITION OF {0} DEFAULT
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITION_CREATION = """
+create table if not exists {1} PARTITION OF {0} FOR VALUES FROM ('{2}') TO ('{3}')
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_IS_PARTITIONED = """
+SELECT relkind = 'p' FROM pg_catalog.pg_class WHERE oid = to_regclass(%s)
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITION_LIST = """
+SELECT c.relname FROM pg_catalog.pg_inherits i
+JOIN pg_catalog.pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(%s)
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITION_ARCHIVE = """
+COPY (SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {} ORDER BY audit_id) TO STDOUT WITH (FORMAT csv, HEADER)
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PARTITION_DROP = """
+DROP TABLE {}
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_OLDEST = """
+SELECT min(audit_time) FROM {} WHERE audit_time < %s
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PERIOD_ARCHIVE = """
+COPY (SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {0} WHERE audit_time >= '{1}' AND audit_time < '{2}' ORDER BY audit_id)
+TO STDOUT WITH (FORMAT csv, HEADER)
+"""
+
+SCT_QUERY_POSTGRES_AUDIT_PERIOD_DELETE = """
+DELETE FROM {} WHERE audit_time >= %s AND audit_time < %s
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_TABLE_CREATION = """
+create table if not exists {0} (
+        job_id serial PRIMARY KEY,
+        file_name VARCHAR (100) not null UNIQUE,
+        table_name VARCHAR (100) not null,
+        job_user VARCHAR (100) not null,
+        job_state VARCHAR (15) not null DEFAULT 'PENDING',
+        attempts integer not null DEFAULT 0,
+        rows_loaded integer,
+        job_error VARCHAR (5000),
+        created_time timestamp NOT NULL DEFAULT NOW(),
+        updated_time timestamp NOT NULL DEFAULT NOW()
+);
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_INDEX_CREATION = """
+CREATE INDEX IF NOT EXISTS {0}_state_idx ON {0} (job_state, updated_time)
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_PUT = """
+INSERT INTO {}(table_name, file_name, job_user) VALUES (%s, %s, %s)
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_CLAIM = """
+UPDATE {0} SET job_state = 'RUNNING', attempts = attempts + 1, updated_time = NOW()
+WHERE job_id IN (
+    SELECT job_id FROM {0}
+    WHERE job_state = 'PENDING' OR (job_state = 'RUNNING' AND updated_time < NOW() - %s * INTERVAL '1 second')
+    ORDER BY job_id LIMIT %s FOR UPDATE SKIP LOCKED
+)
+RETURNING job_id, table_name, file_name, job_user, attempts, COALESCE(rows_loaded, 0)
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_FINISH = """
+UPDATE {} SET job_state = %s, rows_loaded = COALESCE(%s, rows_loaded), job_error = %s, updated_time = NOW()
+WHERE job_id = %s
+"""
+
+SCT_QUERY_POSTGRES_BULK_JOB_PROGRESS = """
+UPDATE {} SET rows_loaded = %s, updated_time = NOW() WHERE job_id = %s
+"""
+
 SCT_QUERY_POSTGRES_AUDIT_SEARCH = """
 SELECT audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {}
 WHERE {}
 ORDER BY audit_id OFFSET {} LIMIT {}
-"""
\ No newline at end of file
+"""
+SCT_QUERY_POSTGRES_GET_SCHEMA_VERSION = """
+SELECT md5(
+    coalesce((SELECT string_agg(c.oid::text || '.' || c.xmin::text, ',' ORDER BY c.oid)
+              FROM pg_class c WHERE c.relnamespace = n.oid AND c.relkind IN ('r', 'p', 'v')), '') ||
+    coalesce((SELECT string_agg(k.oid::text || '.' || k.xmin::text, ',' ORDER BY k.oid)
+              FROM pg_constraint k WHERE k.connamespace = n.oid), '') ||
+    coalesce((SELECT string_agg(i.indexrelid::text || '.' || i.xmin::text, ',' ORDER BY i.indexrelid)
+              FROM pg_index i JOIN pg_class c ON c.oid = i.indrelid WHERE c.relnamespace = n.oid), '') ||
+    coalesce((SELECT string_agg(a.attrelid::text || '.' || a.attnum::text || '.' || a.xmin::text, ','
+                                ORDER BY a.attrelid, a.attnum)
+              FROM pg_attribute a JOIN pg_class c ON c.oid = a.attrelid
+              WHERE c.relnamespace = n.oid AND c.relkind IN ('r', 'p', 'v')), '') ||
+    coalesce((SELECT string_agg(d.oid::text || '.' || d.xmin::text, ',' ORDER BY d.oid)
+              FROM pg_attrdef d JOIN pg_class c ON c.oid = d.adrelid WHERE c.relnamespace = n.oid), '') ||
+    coalesce((SELECT string_agg(d.objoid::text || '.' || d.objsubid::text || '.' || d.xmin::text, ','
+                                ORDER BY d.objoid, d.objsubid)
+              FROM pg_description d JOIN pg_class c ON c.oid = d.objoid
+              WHERE d.classoid = 'pg_class'::regclass AND c.relnamespace = n.oid), '')
+) FROM pg_namespace n WHERE n.nspname = '{}'
+"""
+
+SCT_QUERY_POSTGRES_ESTIMATE_COUNT = """
+SELECT c.reltuples::bigint FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = current_schema() AND c.relname = %s
+"""
+
+SCT_QUERY_POSTGRES_SET_STATEMENT_TIMEOUT = """
+SELECT current_setting('statement_timeout'), set_config('statement_timeout', %s, true)
+"""
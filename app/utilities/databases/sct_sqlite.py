@@ -4,28 +4,230 @@
     This module controls SCT Tool specific SQLite database interaction
 """
 import json
-import csv
+import time
+import queue
+import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
 from math import ceil
-
-from app.utilities.sct_utils import tuple_to_dict, tuple_to_list
+from datetime import datetime
+
+from app.utilities.sct_env import (
+    sct_count_exact_threshold,
+    sct_bulk_load_batch_size,
+    sct_ui_download_fetch_size,
+    sct_ui_search_scan_policy,
+    sct_ui_search_scan_threshold,
+    sct_ui_search_sample_size,
+    sct_sqlite_concurrent,
+    sct_sqlite_mmap_size,
+    sct_sqlite_cache_size,
+    sct_sqlite_synchronous,
+    sct_sqlite_busy_timeout,
+    sct_sqlite_write_batch_size,
+    sct_audit_async,
+    sct_audit_queue_timeout,
+    sct_audit_retention_months
+)
+from app.utilities.sct_utils import (
+    tuple_to_dict,
+    tuple_to_list,
+    is_numeric_type,
+    escape_like,
+    keyset_page,
+    decode_row_key,
+    encode_page_cursor,
+    decode_page_cursor,
+    get_count_strategy,
+    get_page_order,
+    build_search_condition,
+    is_search_indexed,
+    get_prefix_search_columns
+)
+from app.utilities.databases.sct_cache import MetadataCache, LookupCache, CountCache
+from app.utilities.databases.sct_pool import ConnectionPool
+from app.utilities.databases.sct_bulk import CsvBulkReader
+from app.utilities.databases.sct_timeout import (
+    SCT_QUERY_TIMEOUTS,
+    QueryTimeoutError,
+    get_query_timeout,
+    timed_operation
+)
+from app.utilities.databases.sct_audit import (
+    AuditWriter,
+    AuditPolicy,
+    audit_indexes,
+    audit_text_terms,
+    audit_time_condition,
+    archive_audits,
+    write_audit_csv,
+    month_start
+)
 from app.utilities.databases.sct_sqlite_query import (
+    SCT_QUERY_GET_INDEX_LIST,
+    SCT_QUERY_GET_INDEX_INFO,
+    SCT_QUERY_SEARCH_PREFIX,
+    SCT_QUERY_SEARCH_CONTAINS,
+    SCT_QUERY_SEARCH_SAMPLE,
     SCT_QUERY_AUDIT_GET,
     SCT_QUERY_AUDIT_PUT,
     SCT_QUERY_DROP_ROW,
+    SCT_QUERY_GET_ROW,
     SCT_QUERY_INSERT_ROW,
     SCT_QUERY_UPDATE_ROW,
+    SCT_QUERY_RETURNING,
     SCT_QUERY_GET_FK_DETAIL,
     SCT_QUERY_GET_FK_LOOKUP,
+    SCT_QUERY_FK_LOOKUP_PREFIX,
+    SCT_QUERY_FK_LOOKUP_SEEK,
     SCT_QUERY_GET_PK_DETAIL,
-    SCT_QUERY_AUDIT_BULK_LOAD,
+    SCT_QUERY_BULK_JOB_TABLE_CREATION,
+    SCT_QUERY_BULK_JOB_INDEX_CREATION,
+    SCT_QUERY_BULK_JOB_PUT,
+    SCT_QUERY_BULK_JOB_PENDING,
+    SCT_QUERY_BULK_JOB_CLAIM,
+    SCT_QUERY_BULK_JOB_FINISH,
+    SCT_QUERY_BULK_JOB_PROGRESS,
     SCT_QUERY_GET_COLUMN_DETAIL,
     SCT_QUERY_GET_TABLE_LIST,
     SCT_QUERY_AUDIT_TABLE_CREATION,
+    SCT_QUERY_AUDIT_INDEX_CREATION,
+    SCT_QUERY_AUDIT_FTS_REBUILD,
+    SCT_QUERY_AUDIT_FTS_DELETE_TRIGGER,
+    SCT_QUERY_AUDIT_FTS_INSERT_TRIGGER,
+    SCT_QUERY_AUDIT_FTS_TABLE_CREATION,
+    SCT_QUERY_AUDIT_FTS_EXISTS,
+    SCT_QUERY_AUDIT_TEXT_LIKE,
+    SCT_QUERY_AUDIT_TEXT_MATCH,
+    SCT_QUERY_AUDIT_TEXT_SEARCH,
+    SCT_QUERY_AUDIT_OLDEST,
+    SCT_QUERY_AUDIT_PERIOD_ARCHIVE,
+    SCT_QUERY_AUDIT_PERIOD_DELETE,
     SCT_QUERY_GET_AUTO_COLUMN_DETAIL,
-    SCT_QUERY_AUDIT_SEARCH
+    SCT_QUERY_AUDIT_SEARCH,
+    SCT_QUERY_GET_SCHEMA_VERSION,
+    SCT_QUERY_ESTIMATE_COUNT
 )
 
+logger = logging.getLogger(__name__)
+
+# RETURNING clause is supported from SQLite 3.35
+SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Window functions are supported from SQLite 3.25
+SQLITE_WINDOW = sqlite3.sqlite_version_info >= (3, 25, 0)
+# Virtual machine instructions run between query deadline checks
+SQLITE_PROGRESS_STEPS = 10000
+
+
+class SqliteWriter:
+    """
+        Single writer owning the SQLite write connection.
+        .. admonition:: Note
+            Mutations queued by concurrent requests are applied by one thread, a batch of queued mutations shares
+            one transaction and one commit. Every mutation runs in its own savepoint, so a failing mutation
+            does not roll back the rest of its batch.
+    """
+
+    def __init__(self, con, batch_size: int = sct_sqlite_write_batch_size):
+        """
+        SqliteWriter constructor
+
+        :param con: SQLite connection in autocommit mode, used only by writer thread from now on
+        :param batch_size: Max mutations committed together
+        """
+        self._con = con
+        self._batch_size = max(int(batch_size), 1)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sct-sqlite-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_size(self) -> int:
+        """
+        Mutations waiting to be applied
+
+        :return: Queue size
+        """
+        return self._queue.qsize()
+
+    def submit(self, write_fn):
+        """
+        Apply a mutation and wait for its commit
+
+        :param write_fn: Callable taking a writer cursor, it must not commit
+        :return: Value returned by write_fn
+        """
+        item = {"fn": write_fn, "done": threading.Event()}
+        self._queue.put(item)
+        item["done"].wait()
+        if "error" in item:
+            raise item["error"]
+        return item.get("result")
+
+    def close(self):
+        """
+        Apply queued mutations and stop writer
+
+        :return: None
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._con.close()
+
+    def _run(self):
+        """
+        Writer loop, drains queue in batches
+
+        :return: None
+        """
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._apply(batch)
+
+    def _apply(self, batch: list):
+        """
+        Apply a batch of mutations in one transaction
+
+        :param batch: Queued mutations
+        :return: None
+        """
+        try:
+            self._con.execute("BEGIN IMMEDIATE")
+            for item in batch:
+                self._con.execute("SAVEPOINT sct_write")
+                try:
+                    item["result"] = item["fn"](self._con.cursor())
+                    self._con.execute("RELEASE sct_write")
+                except Exception as e:
+                    self._con.execute("ROLLBACK TO sct_write")
+                    self._con.execute("RELEASE sct_write")
+                    item["error"] = e
+            self._con.execute("COMMIT")
+        except Exception as e:
+            if self._con.in_transaction:
+                self._con.execute("ROLLBACK")
+            for item in batch:
+                if "error" not in item:
+                    item.pop("result", None)
+                    item["error"] = e
+        finally:
+            for item in batch:
+                item["done"].set()
+
 
 class DbBackEnd:
     """
@@ -51,16 +253,130 @@ class DbBackEnd:
         :param host: DB Hostname
         :param port: DB Port
         """
-        self._con = sqlite3.connect(database, check_same_thread=False)
+        self._database = database
+        self._local = threading.local()
+        if sct_sqlite_concurrent and database != ":memory:":
+            self._con = None
+            self._writer = SqliteWriter(self._open_connection(writer=True))
+            self._pool = ConnectionPool(self._open_connection, pre_ping=False)
+        else:
+            self._con = self._watch_deadline(sqlite3.connect(database, check_same_thread=False))
+            self._writer = None
+            self._pool = None
+        self._schema = schema
+        self._metadata_cache = MetadataCache()
+        self._lookup_cache = LookupCache()
+        self._count_cache = CountCache()
+        self._audit_writer = None
+        self._audit_lock = threading.Lock()
+        self._audit_policy = AuditPolicy(self._write_audit)
+
+    def _open_connection(self, writer: bool = False):
+        """
+        Open a tuned SQLite connection for concurrent access
+
+        :param writer: Whether connection is the single write connection, reader connections are read only
+        :return: SQLite DB API Connection
+        """
+        con = sqlite3.connect(self._database,
+                              timeout=sct_sqlite_busy_timeout,
+                              check_same_thread=False,
+                              isolation_level=None if writer else "")
+        con.execute("PRAGMA mmap_size = {}".format(sct_sqlite_mmap_size))
+        con.execute("PRAGMA cache_size = {}".format(sct_sqlite_cache_size))
+        if writer:
+            con.execute("PRAGMA journal_mode = WAL")
+            con.execute("PRAGMA synchronous = {}".format(sct_sqlite_synchronous))
+        else:
+            con.execute("PRAGMA query_only = ON")
+        return self._watch_deadline(con)
+
+    def _watch_deadline(self, con):
+        """
+        Install progress handler interrupting statements run past query deadline of their thread
+
+        :param con: SQLite DB API Connection
+        :return: Same connection
+        """
+        if any(SCT_QUERY_TIMEOUTS.values()):
+            con.set_progress_handler(self._deadline_passed, SQLITE_PROGRESS_STEPS)
+        return con
+
+    def _deadline_passed(self) -> bool:
+        """
+        Progress handler, a true value interrupts running statement
+
+        :return: True once query deadline of current thread is over
+        """
+        deadline = getattr(self._local, "deadline", None)
+        return deadline is not None and time.monotonic() > deadline
+
+    @contextmanager
+    def query_timeout(self, operation: str, con=None):
+        """
+        Cancel statements of an operation class running longer than its timeout
+        .. admonition:: Note
+            Timeout covers all statements run by current thread within context, including mutations it queues to
+            single writer. An interrupted statement is raised as QueryTimeoutError.
+
+        :param operation: Operation class (browse, search, export, bulk_load)
+        :param con: Unused, deadline is kept per thread
+        :return: Context manager yielding monotonic deadline, None if operation has no timeout
+        """
+        timeout = get_query_timeout(operation)
+        outer_deadline = getattr(self._local, "deadline", None)
+        self._local.deadline = time.monotonic() + timeout if timeout else None
+        try:
+            yield self._local.deadline
+        except sqlite3.OperationalError as e:
+            if str(e) != "interrupted":
+                raise
+            raise QueryTimeoutError(operation, timeout) from e
+        finally:
+            self._local.deadline = outer_deadline
 
     @property
     def db_connection(self):
         """
-        DB Connection
+        DB Connection, in concurrent mode a read only connection checked out of pool once per thread
 
-        :return: Postgres DB API Connection
+        :return: SQLite DB API Connection
+        """
+        if not self._pool:
+            return self._con
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._pool.acquire()
+            self._local.con = con
+        return con
+
+    def _write(self, write_fn):
         """
-        return self._con
+        Run a mutation and commit it, in concurrent mode through single writer
+
+        :param write_fn: Callable taking a cursor, it must not commit
+        :return: Value returned by write_fn
+        """
+        if self._writer:
+            deadline = getattr(self._local, "deadline", None)
+            if deadline is None:
+                return self._writer.submit(write_fn)
+
+            # Writer thread runs mutation under deadline of submitting thread
+            def timed_write_fn(curs):
+                self._local.deadline = deadline
+                try:
+                    return write_fn(curs)
+                finally:
+                    self._local.deadline = None
+            return self._writer.submit(timed_write_fn)
+        try:
+            result = write_fn(self._con.cursor())
+        except Exception:
+            self._con.rollback()
+            raise
+        self._con.commit()
+        return result
 
     @property
     def get_cursor(self):
@@ -77,9 +393,46 @@ class DbBackEnd:
 
         :return: None
         """
-        if self.db_connection:
+        self._audit_policy.drain(force=True)
+        if self._audit_writer:
+            self._audit_writer.close()
+        if self._writer:
+            self.release()
+            self._writer.close()
+            self._pool.close()
+        elif self.db_connection:
             self.db_connection.close()
 
+    def release(self, e=None):
+        """
+        Returns read connection checked out by current thread to pool, registered as application teardown
+
+        :param e: Teardown exception
+        :return: None
+        """
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            self._local.con = None
+            self._pool.release(con)
+
+    def pool_stats(self) -> dict:
+        """
+        Connection statistics
+
+        :return: Dictionary of connection counters
+        """
+        if not self._pool:
+            return {
+                "max_size": 1,
+                "idle": 0,
+                "in_use": 1
+            }
+        pool_stats = self._pool.stats()
+        pool_stats["write_queue"] = self._writer.queue_size
+        if self._audit_writer:
+            pool_stats["audit_writer"] = self._audit_writer.stats()
+        return pool_stats
+
     def get_table_list(self, blk_listed_table: str = "", schema: str = None) -> list:
         """
         Return list of table name in DB
@@ -102,7 +455,8 @@ class DbBackEnd:
 
         return list(table_list.difference(black_listed))
 
-    def get_table_data(self, table: str, project_list: list, order_list: list, limit: int, offset: int = 0):
+    def get_table_data(self, table: str, project_list: list, order_list: list, limit: int, offset: int = 0,
+                       seek: list = None, reverse: bool = False, descending: bool = False):
         """
         Fetch data for a table
 
@@ -111,24 +465,18 @@ class DbBackEnd:
         :param order_list: List of columns to order data by
         :param limit: Max rows fetched
         :param offset: Row batch, where each batch will be of size 50 at least
+        :param seek: Values of order columns, rows after (before if reverse) this position are fetched
+        :param reverse: Whether to fetch rows preceding seek position
+        :param descending: Whether order columns are sorted in descending order
         :return: List of rows
         """
-        curs = self.get_cursor
-        sql_qry = """
-            SELECT {} FROM {} ORDER BY {} LIMIT {},{}
-            """.format(
-            ",".join(project_list),
-            table,
-            ",".join(order_list),
-            offset,
-            limit
-        )
-
-        curs.execute(sql_qry)
-        return curs.fetchall()
+        return self.search_table_data(table, project_list, order_list, None, limit, offset,
+                                      seek=seek, reverse=reverse, descending=descending)
 
     def search_table_data(self, table: str, project_list: list, order_list: list,
-                          search_con, limit: int, offset: int = 0):
+                          search_con, limit: int, offset: int = 0,
+                          qry_args: list = None, seek: list = None, reverse: bool = False,
+                          with_count: bool = False, descending: bool = False):
         """
         Search data for a table
 
@@ -138,29 +486,123 @@ class DbBackEnd:
         :param search_con: Searched Condition
         :param limit: Max rows fetched
         :param offset: Row batch, where each batch will be of size 50 at least
-        :return: List of rows
+        :param qry_args: Values bound to search condition placeholders
+        :param seek: Values of order columns, rows after (before if reverse) this position are fetched
+        :param reverse: Whether to fetch rows preceding seek position
+        :param with_count: Whether to append count of all searched rows, ignoring seek and limit, to every row
+        :param descending: Whether order columns are sorted in descending order
+        :return: List of rows, in order columns order
         """
+        cond_list = ["({})".format(search_con)] if search_con else []
+        qry_args = list(qry_args) if qry_args else []
+        sql_qry = "SELECT {} FROM {}".format(",".join(project_list), table)
+        if with_count:
+            # Window count is computed over searched rows before seek condition applies to outer query
+            sql_qry = "SELECT {}, count(*) OVER () AS sct_total_count FROM {}".format(",".join(project_list), table)
+            if cond_list:
+                sql_qry = "{} WHERE {}".format(sql_qry, " AND ".join(cond_list))
+            sql_qry = "SELECT * FROM ({}) sct_page".format(sql_qry)
+            cond_list = []
+        if seek is not None:
+            cond_list.append("({}) {} ({})".format(
+                ",".join(order_list),
+                "<" if reverse != descending else ">",
+                ",".join(["?"] * len(seek))
+            ))
+            qry_args.extend(seek)
+
         curs = self.get_cursor
-        sql_qry = """
-            SELECT {} FROM {} WHERE {} ORDER BY {} LIMIT {},{}
-            """.format(
-            ",".join(project_list),
-            table,
-            search_con,
-            ",".join(order_list),
-            offset,
-            limit
+        if cond_list:
+            sql_qry = "{} WHERE {}".format(sql_qry, " AND ".join(cond_list))
+        if order_list:
+            sql_qry = "{} ORDER BY {}".format(
+                sql_qry, ",".join(["{} {}".format(c, "DESC" if reverse != descending else "ASC") for c in order_list]))
+        sql_qry = "{} LIMIT ? OFFSET ?".format(sql_qry)
+
+        curs.execute(sql_qry, qry_args + [limit, offset])
+        rows = curs.fetchall()
+        return rows[::-1] if reverse else rows
+
+    def stream_table_data(self, table: str, project_list: list, order_list: list, limit: int = 0,
+                          fetch_size: int = sct_ui_download_fetch_size):
+        """
+        Stream data of a table in batches, holding at most one batch in memory
+        .. admonition:: Note
+            Rows are read by iterating a cursor of its own, on a pooled read only connection in concurrent mode.
+            Whole read is bounded by export query timeout.
+
+        :param table: Table name
+        :param project_list: List of columns to project
+        :param order_list: List of columns to order data by
+        :param limit: Max rows fetched, all rows are fetched if 0
+        :param fetch_size: Rows fetched per batch
+        :return: Generator of row batches
+        """
+        sql_qry = "SELECT {} FROM {}".format(",".join(project_list), table)
+        if order_list:
+            sql_qry = "{} ORDER BY {}".format(sql_qry, ",".join(order_list))
+        if limit:
+            sql_qry = "{} LIMIT {}".format(sql_qry, int(limit))
+
+        con = self._pool.acquire() if self._pool else self._con
+        curs = con.cursor()
+        try:
+            with self.query_timeout("export"):
+                curs.execute(sql_qry)
+                while True:
+                    rows = curs.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            curs.close()
+            if self._pool:
+                self._pool.release(con)
+
+    def get_schema_version(self) -> int:
+        """
+        Schema version, SQLite increments it whenever database schema is altered
+
+        :return: Schema version
+        """
+        curs = self.get_cursor
+        curs.execute(
+            SCT_QUERY_GET_SCHEMA_VERSION
         )
+        return curs.fetchone()[0]
 
-        curs.execute(sql_qry)
-        return curs.fetchall()
+    def refresh_table_columns(self, table: str = None) -> int:
+        """
+        Drop cached table metadata
+
+        :param table: Table name, all tables are refreshed if not provided
+        :return: Number of cached tables dropped
+        """
+        if table:
+            return self._metadata_cache.invalidate(lambda k: k == (self._database, self._schema, table))
+        return self._metadata_cache.invalidate()
 
     def get_table_columns(self, table: str, load_fk_data: bool = False) -> dict:
         """
         Column list for a table
 
         :param table: Table name
-        :param load_fk_data: Whether to load FK column data for lookup
+        :param load_fk_data: Whether to load first page of FK column data for lookup
+        :return: Metadata dictionary
+        """
+        meta_dict = self._metadata_cache.get_or_load((self._database, self._schema, table),
+                                                     self.get_schema_version,
+                                                     lambda: self._load_table_columns(table))
+        if load_fk_data:
+            for fk in meta_dict["fk_columns"]:
+                meta_dict["fk_columns"][fk]["data"] = self.get_fk_lookup(table, fk)["values"]
+        return meta_dict
+
+    def _load_table_columns(self, table: str) -> dict:
+        """
+        Column list for a table, read from database catalog
+
+        :param table: Table name
         :return: Metadata dictionary
         """
         meta_dict = dict()
@@ -174,7 +616,7 @@ class DbBackEnd:
         curs.execute(
             SCT_QUERY_GET_PK_DETAIL.format(table)
         )
-        meta_dict["pk_columns"] = [cd[1] for cd in curs.fetchall() if cd[5] == 1]
+        meta_dict["pk_columns"] = [cd[1] for cd in sorted(curs.fetchall(), key=lambda cd: cd[5]) if cd[5] > 0]
 
         # Get Column List
         curs.execute(
@@ -184,7 +626,8 @@ class DbBackEnd:
             meta_dict["view"][cd[1]] = {
                 "type": cd[2],
                 "description": "",
-                "length": 0
+                "length": 0,
+                "nullable": not cd[3] and not cd[5]
             }
 
         # Get Insert Columns
@@ -208,125 +651,442 @@ class DbBackEnd:
                 "column": fkd[4],
                 "data": []
             }
-            if load_fk_data:
-                curs.execute(
-                    SCT_QUERY_GET_FK_LOOKUP.format(
-                        fkd[4],
-                        fkd[2]
-                    )
-                )
-                meta_dict["fk_columns"][fkd[3]]["data"] = tuple_to_list(curs.fetchall())
+
+        # Get Leading Index Columns, INTEGER PRIMARY KEY being rowid has no index of its own
+        meta_dict["indexed_columns"] = meta_dict["pk_columns"][:1]
+        curs.execute(SCT_QUERY_GET_INDEX_LIST.format(table))
+        for idx in curs.fetchall():
+            if idx[4]:
+                continue
+            curs.execute(SCT_QUERY_GET_INDEX_INFO.format(idx[1]))
+            lead = [col[2] for col in curs.fetchall() if col[0] == 0 and col[2]]
+            if lead and lead[0] not in meta_dict["indexed_columns"]:
+                meta_dict["indexed_columns"].append(lead[0])
+
+        # Build Row Statements
+        meta_dict["statements"] = self._build_row_statements(table, meta_dict)
 
         return meta_dict
 
-    def get_table_info(self, table: str, batch: int = 1, page_size: int = 3) -> dict:
+    def _build_row_statements(self, table: str, meta_dict: dict) -> dict:
+        """
+        Parameterized row statements of a table, built once per metadata load and cached with it
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary of table
+        :return: Dictionary of insert, delete, image, select and update (tables with primary key) statements
+        """
+        insert_columns = list(meta_dict["insert"].keys())
+        view_columns = list(meta_dict["view"].keys())
+        key_columns = meta_dict["pk_columns"] if meta_dict["pk_columns"] else view_columns
+        returning = SCT_QUERY_RETURNING.format(",".join(view_columns)) if SQLITE_RETURNING else ""
+        set_columns = [col for col in insert_columns if col not in meta_dict["pk_columns"]]
+
+        statements = {
+            "insert": {
+                "sql": SCT_QUERY_INSERT_ROW.format(
+                    table,
+                    ",".join(insert_columns),
+                    ",".join(["?"] * len(insert_columns))
+                ),
+                "columns": insert_columns
+            },
+            "delete": {
+                "sql": SCT_QUERY_DROP_ROW.format(
+                    table,
+                    " and ".join(["{}={}".format(col, prm)
+                                  for col, prm in zip(key_columns, ["?"] * len(key_columns))])
+                ) + returning,
+                "columns": key_columns
+            },
+            "image": {
+                "sql": SCT_QUERY_GET_ROW.format(
+                    ",".join(view_columns),
+                    table,
+                    " and ".join(["{}={}".format(col, prm)
+                                  for col, prm in zip(key_columns, ["?"] * len(key_columns))])
+                ),
+                "columns": key_columns
+            }
+        }
+        if meta_dict["pk_columns"]:
+            statements["select"] = {
+                "sql": SCT_QUERY_GET_ROW.format(
+                    ",".join(view_columns),
+                    table,
+                    " and ".join(["{}={}".format(col, prm)
+                                  for col, prm in zip(meta_dict["pk_columns"],
+                                                      ["?"] * len(meta_dict["pk_columns"]))])
+                ),
+                "columns": meta_dict["pk_columns"]
+            }
+        if meta_dict["pk_columns"] and set_columns:
+            statements["update"] = {
+                "sql": SCT_QUERY_UPDATE_ROW.format(
+                    table,
+                    ", ".join(["{0}=COALESCE({1}, {0})".format(col, prm)
+                               for col, prm in zip(set_columns, ["?"] * len(set_columns))]),
+                    " and ".join(["{}={}".format(col, prm) for col, prm in
+                                  zip(meta_dict["pk_columns"], ["?"] * len(meta_dict["pk_columns"]))])
+                ) + returning,
+                "columns": set_columns + meta_dict["pk_columns"]
+            }
+        return statements
+
+    @staticmethod
+    def _statement_args(statement: dict, meta_dict: dict, values: dict) -> list:
+        """
+        Values bound to a row mutation statement, empty values of numeric columns being bound as NULL
+
+        :param statement: Row mutation statement
+        :param meta_dict: Metadata dictionary of table
+        :param values: Column values keyed by column name
+        :return: List of statement arguments
+        """
+        return [None if values[col] == "" and is_numeric_type(meta_dict["view"][col]["type"]) else values[col]
+                for col in statement["columns"]]
+
+    def get_fk_lookup(self, table: str, column: str, prefix: str = "", batch: int = 1, page_size: int = 20) -> dict:
+        """
+        Page of values a FK column can take, read from referenced column in its index order
+
+        :param table: Table name
+        :param column: FK column name
+        :param prefix: Value prefix to filter by, used as lower bound for numeric columns
+        :param batch: Page number
+        :param page_size: Max values per page
+        :return: Lookup dictionary with values and whether more pages exist
+        """
+        table_details = self.get_table_columns(table)
+        fk_detail = table_details["fk_columns"].get(column)
+        if not fk_detail:
+            return {"values": [], "has_more": False}
+        batch = batch if batch > 0 else 1
+
+        cache_key = (self._database, self._schema, fk_detail["table"], fk_detail["column"], prefix, batch, page_size)
+        lookup_dict = self._lookup_cache.get(cache_key)
+        if lookup_dict is None:
+            col_type = str(table_details["view"][column]["type"])
+            qry_args = []
+            if not prefix:
+                lookup_cond = "1 = 1"
+            elif is_numeric_type(col_type):
+                lookup_cond = SCT_QUERY_FK_LOOKUP_SEEK.format(fk_detail["column"])
+                qry_args.append(float(prefix))
+            else:
+                lookup_cond = SCT_QUERY_FK_LOOKUP_PREFIX.format(fk_detail["column"])
+                qry_args.extend([prefix, escape_like(prefix) + "%"])
+
+            # Fetch one extra value to know whether a next page exists
+            curs = self.get_cursor
+            curs.execute(
+                SCT_QUERY_GET_FK_LOOKUP.format(fk_detail["column"], fk_detail["table"], lookup_cond),
+                qry_args + [page_size + 1, (batch - 1) * page_size]
+            )
+            lookup_values = tuple_to_list(curs.fetchall())
+            lookup_dict = {
+                "values": lookup_values[:page_size],
+                "has_more": len(lookup_values) > page_size
+            }
+            self._lookup_cache.put(cache_key, lookup_dict)
+
+        return lookup_dict
+
+    def estimate_table_count(self, table: str):
+        """
+        Row count estimate of a table read from ANALYZE statistics (sqlite_stat1)
+
+        :param table: Table name
+        :return: Estimated row count, None when table has no statistics
+        """
+        try:
+            curs = self.get_cursor
+            curs.execute(SCT_QUERY_ESTIMATE_COUNT, [table])
+            stat = curs.fetchone()
+        except sqlite3.Error:
+            return None
+        return int(str(stat[0]).split()[0]) if stat else None
+
+    def get_table_count(self, table: str, search_con=None, qry_args: list = None) -> tuple:
+        """
+        Row count of a table, computed as per count strategy of table
+        .. admonition:: Note
+            exact runs count(*) on every call, cached serves count(*) results for TTL or until table is mutated
+            through SCT, estimate reads catalog statistics for unfiltered counts falling back to cached for
+            filtered counts, small tables and tables without statistics. window counts rows along with page data
+            (see _get_counted_page), this count being its cached fallback.
+
+        :param table: Table name
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :return: Tuple of row count and whether it is an estimate
+        """
+        strategy = get_count_strategy(table)
+        if strategy == "estimate" and not search_con:
+            estimate = self.estimate_table_count(table)
+            if estimate is not None and estimate >= sct_count_exact_threshold:
+                return estimate, True
+
+        cache_key = self._count_cache_key(table, search_con, qry_args)
+        table_count = None if strategy == "exact" else self._count_cache.get(cache_key)
+        if table_count is None:
+            curs = self.get_cursor
+            if search_con and qry_args:
+                curs.execute("SELECT count(*) FROM {} WHERE {}".format(table, search_con), qry_args)
+            elif search_con:
+                curs.execute("SELECT count(*) FROM {} WHERE {}".format(table, search_con))
+            else:
+                curs.execute("SELECT count(*) FROM {}".format(table))
+            table_count = int(curs.fetchone()[0])
+            if strategy != "exact":
+                self._count_cache.put(cache_key, table_count)
+        return table_count, False
+
+    def _count_cache_key(self, table: str, search_con=None, qry_args: list = None) -> tuple:
+        """
+        Count cache key of a table search
+
+        :param table: Table name
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :return: Cache key
+        """
+        return self._database, self._schema, table, search_con, tuple(qry_args) if qry_args else ()
+
+    def _get_counted_page(self, table: str, meta_dict: dict, search_con, qry_args: list,
+                          batch_num: int, page_size: int, page_cursor: str = None) -> bool:
+        """
+        Fetch a page of table rows along with row count into metadata dictionary, in a single query using a
+        window count
+        .. admonition:: Note
+            Page past last row, as well as last page of a keyset paged table, is fetched after counting rows, as
+            are all pages before SQLite 3.25 which lacks window functions.
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary with columns
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :param batch_num: Page number, used when no page cursor is provided
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token
+        :return: Whether page was fetched, if not row count is needed first
+        """
+        if not SQLITE_WINDOW:
+            return False
+        project_list = [k for k in meta_dict["view_columns"].keys()]
+        key_list, keyset = meta_dict["order_columns"], meta_dict["keyset"]
+        offset = page_size * max(batch_num - 1, 0)
+
+        # Size of last page is only known from row count
+        if keyset and page_cursor and decode_page_cursor(page_cursor, len(key_list))[0] == "last":
+            return False
+
+        def fetch_rows(limit, seek, reverse, skip):
+            return self.search_table_data(table, project_list, key_list, search_con, limit, skip, qry_args, seek,
+                                          reverse, with_count=True, descending=meta_dict["sort_desc"])
+
+        if keyset:
+            page = keyset_page(fetch_rows, project_list, key_list, page_size, page_cursor, offset)
+            table_data = page["rows"]
+        else:
+            page = {}
+            table_data = fetch_rows(page_size, None, False, offset)
+        if not table_data:
+            return False
+
+        meta_dict["table_count"], meta_dict["count_estimated"] = int(table_data[0][-1]), False
+        self._count_cache.put(self._count_cache_key(table, search_con, qry_args), meta_dict["table_count"])
+        meta_dict["table_data"] = tuple_to_dict(project_list, table_data)
+        meta_dict["next_cursor"] = page.get("next_cursor")
+        meta_dict["prev_cursor"] = page.get("prev_cursor")
+        meta_dict["last_cursor"] = page.get("last_cursor")
+        return True
+
+    def _get_page(self, table: str, meta_dict: dict, search_con, qry_args: list,
+                  batch_num: int, page_size: int, page_cursor: str = None):
+        """
+        Fetch a page of table rows into metadata dictionary, seeking on order columns when table has a primary key
+        and falling back to offset paging otherwise, see get_page_order
+
+        :param table: Table name
+        :param meta_dict: Metadata dictionary with columns and count
+        :param search_con: Searched Condition
+        :param qry_args: Values bound to search condition placeholders
+        :param batch_num: Page number, used when no page cursor is provided
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token
+        :return: None
+        """
+        project_list = [k for k in meta_dict["view_columns"].keys()]
+        key_list = meta_dict["order_columns"]
+        offset = page_size * max(batch_num - 1, 0)
+
+        if meta_dict["keyset"]:
+            page = keyset_page(
+                lambda limit, seek, reverse, skip: self.search_table_data(
+                    table, project_list, key_list, search_con, limit, skip, qry_args, seek, reverse,
+                    descending=meta_dict["sort_desc"]),
+                project_list, key_list, page_size, page_cursor, offset,
+                meta_dict["table_count"] - page_size * (ceil(meta_dict["table_count"] / page_size) - 1))
+            table_data = page["rows"]
+        else:
+            page = {}
+            table_data = self.search_table_data(table, project_list, key_list, search_con,
+                                                page_size, offset, qry_args, descending=meta_dict["sort_desc"])
+
+        meta_dict["table_data"] = tuple_to_dict(project_list, table_data)
+        meta_dict["next_cursor"] = page.get("next_cursor")
+        meta_dict["prev_cursor"] = page.get("prev_cursor")
+        meta_dict["last_cursor"] = page.get("last_cursor")
+
+    @timed_operation("browse")
+    def get_table_info(self, table: str, batch: int = 1, page_size: int = 3, page_cursor: str = None,
+                       sort_column: str = None, sort_desc: bool = False) -> dict:
         """
         Table metadata
 
         :param table: Table name
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param page_cursor: Page cursor token, pages on order columns instead of batch when provided
+        :param sort_column: Column rows are sorted by, primary key order if not provided
+        :param sort_desc: Whether rows are sorted in descending order
         :return: Metadata dictionary
         """
         meta_dict = dict()
-        curs = self.get_cursor
 
         # Get Column Details
-        column_detail = self.get_table_columns(table, True)
+        column_detail = self.get_table_columns(table)
         meta_dict["view_columns"] = column_detail["view"]
         meta_dict["insert_columns"] = column_detail["insert"]
         meta_dict["pk_columns"] = column_detail["pk_columns"]
         meta_dict["fk_columns"] = column_detail["fk_columns"]
+        meta_dict["indexed_columns"] = column_detail["indexed_columns"]
+
+        # Page order, a sort no index leads with sorts every searched row on each page view
+        meta_dict["order_columns"], meta_dict["keyset"] = get_page_order(
+            meta_dict["view_columns"], meta_dict["pk_columns"], sort_column)
+        meta_dict["sort_desc"] = sort_desc
+        meta_dict["sort_indexed"] = not sort_column or sort_column in meta_dict["indexed_columns"]
+
+        # Get table data along with count in a single query
+        if get_count_strategy(table) == "window" and self._get_counted_page(
+                table, meta_dict, None, None, batch, page_size, page_cursor):
+            return meta_dict
 
         # Get Table Count
-        curs.execute(
-            """
-            SELECT count(*) FROM {}
-            """.format(table)
-        )
-        meta_dict["table_count"] = int(curs.fetchone()[0])
+        meta_dict["table_count"], meta_dict["count_estimated"] = self.get_table_count(table)
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["table_count"] / page_size) else
                      1 if batch < 1 else ceil(meta_dict["table_count"] / page_size))
 
         # Get table data
-        table_data = self.get_table_data(table,
-                                         meta_dict["view_columns"].keys(),
-                                         meta_dict["pk_columns"],
-                                         page_size,
-                                         page_size * (batch_num - 1))
-        meta_dict["table_data"] = tuple_to_dict([k for k in meta_dict["view_columns"].keys()], table_data)
+        self._get_page(table, meta_dict, None, None, batch_num, page_size, page_cursor)
 
         return meta_dict
 
-    def search_table_info(self, table: str,
-                          search_col, search_op, search_val, batch: int = 1, page_size: int = 3) -> dict:
+    @timed_operation("search")
+    def search_table_info(self, table: str, search_filter: list, batch: int = 1, page_size: int = 3,
+                          page_cursor: str = None, search_match: str = "all", sort_column: str = None,
+                          sort_desc: bool = False) -> dict:
         """
         Search metadata
 
         :param table: Table name
-        :param search_col: Searched Table Column
-        :param search_op: Search Operation
-        :param search_val: Search Value
+        :param search_filter: List of predicates (column, operator, value), see build_search_condition
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param page_cursor: Page cursor token, pages on order columns instead of batch when provided
+        :param search_match: all to match every predicate, any to match at least one
+        :param sort_column: Column rows are sorted by, primary key order if not provided
+        :param sort_desc: Whether rows are sorted in descending order
         :return: Metadata dictionary
         """
         meta_dict = dict()
-        curs = self.get_cursor
 
         # Get Column Details
-        column_detail = self.get_table_columns(table, True)
+        column_detail = self.get_table_columns(table)
         meta_dict["view_columns"] = column_detail["view"]
         meta_dict["insert_columns"] = column_detail["insert"]
         meta_dict["pk_columns"] = column_detail["pk_columns"]
         meta_dict["fk_columns"] = column_detail["fk_columns"]
-
-        # Search condition
-        col_type = str(meta_dict["view_columns"][search_col].get("type"))
-        if search_op == 'like':
-            if (("int" in col_type.lower() and
-                 "point" not in col_type.lower()) or
-                    ("double" in col_type.lower() or
-                     "numeric" in col_type.lower() or
-                     "float" in col_type.lower())):
-                search_cond = "{} = {}".format(search_col, search_val)
-            else:
-                search_cond = "{} {} '%{}%'".format(search_col, search_op, search_val)
-        else:
-            if (("int" in col_type.lower() and
-                 "point" not in col_type.lower()) or
-                    ("double" in col_type.lower() or
-                     "numeric" in col_type.lower() or
-                     "float" in col_type.lower())):
-                search_cond = "{} {} {}".format(search_col, search_op, search_val)
-            else:
-                search_cond = "{} {} '{}'".format(search_col, search_op, search_val)
+        meta_dict["indexed_columns"] = column_detail["indexed_columns"]
+
+        # Page order, a sort no index leads with sorts every searched row on each page view
+        meta_dict["order_columns"], meta_dict["keyset"] = get_page_order(
+            meta_dict["view_columns"], meta_dict["pk_columns"], sort_column)
+        meta_dict["sort_desc"] = sort_desc
+        meta_dict["sort_indexed"] = not sort_column or sort_column in meta_dict["indexed_columns"]
+
+        # Search condition, values are bound as query arguments
+        search_cond, qry_args = build_search_condition(search_filter, meta_dict["view_columns"], "?", search_match,
+                                                       meta_dict["indexed_columns"], SCT_QUERY_SEARCH_PREFIX,
+                                                       SCT_QUERY_SEARCH_CONTAINS)
+        # like on a text column leading an index matches as prefix, reported with search
+        meta_dict["search_prefix_columns"] = get_prefix_search_columns(search_filter, meta_dict["view_columns"],
+                                                                       meta_dict["indexed_columns"])
+
+        # Search plan, a search no index serves is refused or sampled on a large table
+        meta_dict["search_sampled"] = False
+        if sct_ui_search_scan_policy in ["refuse", "sample"] and \
+                not is_search_indexed(search_filter, meta_dict["indexed_columns"], search_match):
+            row_estimate = self.estimate_table_count(table)
+            if row_estimate is None:
+                row_estimate = self._count_cache.get(self._count_cache_key(table))
+            if row_estimate is not None and row_estimate >= sct_ui_search_scan_threshold:
+                if sct_ui_search_scan_policy == "refuse" or len(meta_dict["pk_columns"]) != 1:
+                    raise ValueError("Search of table {} must use an indexed column ({})".format(
+                        table, ", ".join(meta_dict["indexed_columns"])))
+                search_cond = "({}) AND {}".format(search_cond, SCT_QUERY_SEARCH_SAMPLE.format(
+                    meta_dict["pk_columns"][0], table, int(sct_ui_search_sample_size)).strip())
+                meta_dict["search_sampled"] = True
+
+        # Get table data along with count in a single query
+        if get_count_strategy(table) == "window" and self._get_counted_page(
+                table, meta_dict, search_cond, qry_args, batch, page_size, page_cursor):
+            return meta_dict
 
         # Get Table Count
-        if len(search_cond):
-            search_qry = "SELECT count(*) FROM {} WHERE {}".format(table, search_cond)
-        else:
-            search_qry = "SELECT count(*) FROM {}".format(table)
-        curs.execute(search_qry)
-        meta_dict["table_count"] = int(curs.fetchone()[0])
+        meta_dict["table_count"], meta_dict["count_estimated"] = self.get_table_count(table, search_cond, qry_args)
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["table_count"] / page_size) else
                      1 if batch < 1 else ceil(meta_dict["table_count"] / page_size))
 
         # Get table data
-        table_data = self.search_table_data(table,
-                                            meta_dict["view_columns"].keys(),
-                                            meta_dict["pk_columns"],
-                                            search_cond,
-                                            page_size,
-                                            page_size * (batch_num - 1))
-        meta_dict["table_data"] = tuple_to_dict([k for k in meta_dict["view_columns"].keys()], table_data)
+        self._get_page(table, meta_dict, search_cond, qry_args, batch_num, page_size, page_cursor)
 
         return meta_dict
 
+    def _execute_statement(self, statement: dict, qry_args: list) -> int:
+        """
+        Execute a row mutation statement and commit it, SQLite reuses compiled statement from its statement cache
+
+        :param statement: Row mutation statement
+        :param qry_args: Statement arguments
+        :return: Number of rows affected
+        """
+        return self._write(lambda curs: curs.execute(statement["sql"], qry_args).rowcount)
+
+    def get_table_record(self, table: str, row_key: str):
+        """
+        Fetch a single row of table by its primary key
+
+        :param table: Table name
+        :param row_key: Row key token of row, created by encode_row_key
+        :return: Dictionary of row column values, None if row is not found or table has no primary key
+        """
+        table_details = self.get_table_columns(table)
+        statement = table_details["statements"].get("select")
+        if statement is None:
+            return None
+
+        rows = self.get_cursor.execute(
+            statement["sql"], decode_row_key(row_key, len(statement["columns"]))).fetchall()
+        result = tuple_to_dict(list(table_details["view"].keys()), rows)
+        return result[0] if result else None
+
     def add_table_record(self, table: str, **kwargs):
         """
         Add row to table
@@ -337,121 +1097,108 @@ class DbBackEnd:
         """
         # Query preparation
         table_details = self.get_table_columns(table)
-        qry_args = []
-        for col in table_details["insert"].keys():
-            col_type = str(table_details["insert"][col]["type"])
-            if (("int" in col_type.lower() and
-                 "point" not in col_type.lower()) or
-                    ("double" in col_type.lower() or
-                     "numeric" in col_type.lower() or
-                     "float" in col_type.lower())):
-                qry_args.append("{}".format(kwargs[col]))
-            else:
-                qry_args.append("'{}'".format(kwargs[col]))
-        insert_qry = SCT_QUERY_INSERT_ROW.format(
-            table,
-            ",".join(table_details["insert"].keys()),
-            ",".join(qry_args)
-        )
+        statement = table_details["statements"]["insert"]
 
         # Trigger insert
-        curs = self.get_cursor
-        curs.execute(insert_qry)
-        self.db_connection.commit()
+        self._execute_statement(statement, self._statement_args(statement, table_details, kwargs))
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+
+    def _drop_row(self, curs, table_details: dict, values: dict):
+        """
+        Delete a row, deleted row being returned by same statement (read first before SQLite 3.35)
+
+        :param curs: Cursor of write transaction
+        :param table_details: Metadata dictionary of table
+        :param values: Key column values of row
+        :return: Dictionary of deleted row column values, None if no row is deleted
+        """
+        statement = table_details["statements"]["delete"]
+        qry_args = self._statement_args(statement, table_details, values)
+        if SQLITE_RETURNING:
+            rows = curs.execute(statement["sql"], qry_args).fetchall()
+        else:
+            rows = curs.execute(table_details["statements"]["image"]["sql"], qry_args).fetchall()
+            curs.execute(statement["sql"], qry_args)
+        deleted = tuple_to_dict(list(table_details["view"].keys()), rows)
+        return deleted[0] if deleted else None
+
+    def _edit_row(self, curs, table_details: dict, values: dict) -> tuple:
+        """
+        Update a row, row before and after update being read in same transaction as update
+
+        :param curs: Cursor of write transaction
+        :param table_details: Metadata dictionary of table
+        :param values: Column values of row, None values keeping current column value
+        :return: Tuple of row column values before and after update, (None, None) if no row is updated
+        """
+        statement = table_details["statements"]["update"]
+        image = table_details["statements"]["image"]
+        key_args = self._statement_args(image, table_details, values)
+
+        before = curs.execute(image["sql"], key_args).fetchall()
+        after = []
+        if before:
+            after = curs.execute(statement["sql"], self._statement_args(statement, table_details, values)).fetchall()
+            if not SQLITE_RETURNING:
+                after = curs.execute(image["sql"], key_args).fetchall()
+        if not before or not after:
+            return None, None
+        before, after = tuple_to_dict(list(table_details["view"].keys()), [before[0], after[0]])
+        return before, after
 
     def drop_table_record(self, table: str, **kwargs):
         """
-        Drop row from table
+        Drop row from table, deleted row being returned by same statement
 
         :param table: Table name
-        :param kwargs: List of column values of new record
-        :return: None
+        :param kwargs: Key column values of record
+        :return: Dictionary of deleted row column values, None if no row is deleted
         """
-        # Query preparation
         table_details = self.get_table_columns(table)
-        qry_args = []
-        if len(table_details["pk_columns"]):
-            for col in table_details["pk_columns"]:
-                col_type = str(table_details["view"][col]["type"])
-                if (("int" in col_type.lower() and
-                     "point" not in col_type.lower()) or
-                        ("double" in col_type.lower() or
-                         "numeric" in col_type.lower() or
-                         "float" in col_type.lower())):
-                    qry_args.append("{}={}".format(col, kwargs[col]))
-                else:
-                    qry_args.append("{}='{}'".format(col, kwargs[col]))
-        else:
-            for col in table_details["view"].keys():
-                col_type = str(table_details["view"][col]["type"])
-                if (("int" in col_type.lower() and
-                     "point" not in col_type.lower()) or
-                        ("double" in col_type.lower() or
-                         "numeric" in col_type.lower() or
-                         "float" in col_type.lower())):
-                    qry_args.append("{}={}".format(col, kwargs[col]))
-                else:
-                    qry_args.append("{}='{}'".format(col, kwargs[col]))
-
-        drop_qry = SCT_QUERY_DROP_ROW.format(
-            table,
-            " and ".join(qry_args)
-        )
 
-        # Trigger insert
-        curs = self.get_cursor
-        curs.execute(drop_qry)
-        self.db_connection.commit()
+        # Trigger delete
+        deleted = self._write(lambda curs: self._drop_row(curs, table_details, kwargs))
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return deleted
 
     def edit_table_record(self, table: str, **kwargs):
         """
-        Edit row to table
+        Edit row to table, row before and after update being read in same transaction as update
 
         :param table: Table name
-        :param kwargs: List of column values of new record
-        :return: None
+        :param kwargs: Column values of record, None values keeping current column value
+        :return: Tuple of row column values before and after update, (None, None) if no row is updated
         """
-        # Query preparation
+        # Only tables with primary key can be edited
         table_details = self.get_table_columns(table)
-        qry_args = []
-        if len(table_details["pk_columns"]):
-            for col in table_details["pk_columns"]:
-                col_type = str(table_details["view"][col]["type"])
-                if (("int" in col_type.lower() and
-                     "point" not in col_type.lower()) or
-                        ("double" in col_type.lower() or
-                         "numeric" in col_type.lower() or
-                         "float" in col_type.lower())):
-                    qry_args.append("{}={}".format(col, kwargs[col]))
-                else:
-                    qry_args.append("{}='{}'".format(col, kwargs[col]))
-        else:
-            return
-
-        # Set Directive
-        set_args = []
-        for col in table_details["insert"].keys():
-            if col not in table_details["pk_columns"]:
-                col_type = str(table_details["view"][col]["type"])
-                if (("int" in col_type.lower() and
-                     "point" not in col_type.lower()) or
-                        ("double" in col_type.lower() or
-                         "numeric" in col_type.lower() or
-                         "float" in col_type.lower())):
-                    set_args.append("{}={}".format(col, kwargs[col]))
-                else:
-                    set_args.append("{}='{}'".format(col, kwargs[col]))
-
-        edit_qry = SCT_QUERY_UPDATE_ROW.format(
-            table,
-            ", ".join(set_args),
-            " and ".join(qry_args)
-        )
+        if "update" not in table_details["statements"]:
+            return None, None
 
-        # Trigger insert
-        curs = self.get_cursor
-        curs.execute(edit_qry)
-        self.db_connection.commit()
+        # Trigger update
+        before, after = self._write(lambda curs: self._edit_row(curs, table_details, kwargs))
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return before, after
+
+    def change_table_records(self, table: str, changes: list) -> list:
+        """
+        Apply row edits and deletes to table in a single transaction, rolled back as a whole on any failure
+
+        :param table: Table name
+        :param changes: List of (operation, column values) tuples, operation being edit or delete
+        :return: List of row images per change, (before, after) tuple for edits and deleted row for deletes
+        """
+        table_details = self.get_table_columns(table)
+        if "update" not in table_details["statements"] and any(op == "edit" for op, _ in changes):
+            raise ValueError("Rows of table {} can not be edited".format(table))
+
+        results = self._write(lambda curs: [self._edit_row(curs, table_details, values) if op == "edit" else
+                                            self._drop_row(curs, table_details, values) for op, values in changes])
+        self._lookup_cache.invalidate_table(self._database, self._schema, table)
+        self._count_cache.invalidate_table(self._database, self._schema, table)
+        return results
 
     def create_audit_table(self, audit_table: str):
         """
@@ -460,39 +1207,118 @@ class DbBackEnd:
         :param audit_table: Audit table name
         :return: None
         """
-        curs = self.get_cursor
         query_str = SCT_QUERY_AUDIT_TABLE_CREATION.format(
             audit_table
         )
 
-        curs.execute(query_str)
-        self.db_connection.commit()
+        self._write(lambda curs: curs.execute(query_str))
+        self.migrate_audit_table(audit_table)
+
+    def migrate_audit_table(self, audit_table: str):
+        """
+        Add missing indexes to Audit table, and FTS5 table of metadata kept in sync by triggers
+        .. admonition:: Note
+            FTS5 table is filled with existing audits when it is created, it is skipped with a warning if SQLite
+            is built without FTS5, text search then scans metadata instead.
+
+        :param audit_table: Audit table name
+        :return: None
+        """
+        def create_indexes(curs):
+            for index_name, columns in audit_indexes(audit_table):
+                curs.execute(SCT_QUERY_AUDIT_INDEX_CREATION.format(audit_table, index_name, columns))
+
+        def create_fts(curs):
+            curs.execute(SCT_QUERY_AUDIT_FTS_EXISTS, ("{}_fts".format(audit_table),))
+            created = not curs.fetchone()[0]
+            curs.execute(SCT_QUERY_AUDIT_FTS_TABLE_CREATION.format(audit_table))
+            curs.execute(SCT_QUERY_AUDIT_FTS_INSERT_TRIGGER.format(audit_table))
+            curs.execute(SCT_QUERY_AUDIT_FTS_DELETE_TRIGGER.format(audit_table))
+            if created:
+                curs.execute(SCT_QUERY_AUDIT_FTS_REBUILD.format(audit_table))
+
+        self._write(create_indexes)
+        try:
+            self._write(create_fts)
+        except sqlite3.OperationalError as e:
+            logger.warning("Audit text search index not created: {}".format(e))
+
+    def archive_audit_table(self, audit_table: str, retention: int = sct_audit_retention_months) -> list:
+        """
+        Archive and delete audits of months older than retention, one month at a time
 
-    def get_audits(self, audit_table: str, batch: int = 1, page_size: int = 3) -> dict:
+        :param audit_table: Audit table name
+        :param retention: Months of audits kept besides current month, 0 keeps all audits
+        :return: List of archived periods (YYYYMM)
+        """
+        if retention <= 0:
+            return []
+        curs = self.get_cursor
+        cutoff = month_start(datetime.now(), -retention).strftime("%Y-%m-%d %H:%M:%S")
+        delete_qry = SCT_QUERY_AUDIT_PERIOD_DELETE.format(audit_table)
+        archived = []
+
+        while True:
+            curs.execute(SCT_QUERY_AUDIT_OLDEST.format(audit_table), (cutoff,))
+            oldest = curs.fetchone()[0]
+            if oldest is None:
+                break
+            oldest = datetime.strptime(str(oldest)[:19], "%Y-%m-%d %H:%M:%S")
+            period_start, period_end = [month_start(oldest, m).strftime("%Y-%m-%d %H:%M:%S") for m in (0, 1)]
+            curs.execute(SCT_QUERY_AUDIT_PERIOD_ARCHIVE.format(audit_table), (period_start, period_end))
+            archive_audits(audit_table, oldest.strftime("%Y%m"),
+                           lambda file: write_audit_csv(curs, file, sct_ui_download_fetch_size))
+            self._write(lambda write_curs: write_curs.execute(delete_qry, (period_start, period_end)))
+            archived.append(oldest.strftime("%Y%m"))
+
+        self._count_cache.invalidate_table(self._database, self._schema, audit_table)
+        return archived
+
+    def maintain_audit_table(self, audit_table: str) -> dict:
+        """
+        Archive audits older than retention, SQLite Audit tables are never partitioned
+
+        :param audit_table: Audit table name
+        :return: Dictionary of created partitions and archived periods
+        """
+        return {
+            "partitions_created": [],
+            "periods_archived": self.archive_audit_table(audit_table)
+        }
+
+    @timed_operation("browse")
+    def get_audits(self, audit_table: str, batch: int = 1, page_size: int = 3,
+                   audit_from: str = None, audit_to: str = None) -> dict:
         """
         Get Audits
 
         :param audit_table: Audit table name
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
         :return: Audit data
         """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
         curs = self.get_cursor
         meta_dict = dict()
 
+        # Time range condition
+        time_cond = audit_time_condition(audit_from, audit_to)
+
         # Get Table Count
-        curs.execute(
-            """
-            SELECT count(*) FROM {}
-            """.format(audit_table)
-        )
-        meta_dict["audits_count"] = int(curs.fetchone()[0])
+        meta_dict["audits_count"] = self.get_table_count(audit_table, time_cond or None)[0]
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["audits_count"] / page_size) else
-                     1 if batch < 1 else ceil(meta_dict["audits_count"] / page_size))
+                     1 if batch < 1 else max(ceil(meta_dict["audits_count"] / page_size), 1))
 
-        adt_qry = SCT_QUERY_AUDIT_GET.format(audit_table, (batch_num - 1) * page_size, page_size)
+        if time_cond:
+            adt_qry = SCT_QUERY_AUDIT_SEARCH.format(audit_table, time_cond, (batch_num - 1) * page_size, page_size)
+        else:
+            adt_qry = SCT_QUERY_AUDIT_GET.format(audit_table, (batch_num - 1) * page_size, page_size)
         curs.execute(adt_qry)
 
         audit_columns = ["audit_user", "audit_time", "operation_performed",
@@ -501,8 +1327,9 @@ class DbBackEnd:
 
         return meta_dict
 
+    @timed_operation("search")
     def search_audits(self, audit_table: str, audit_search_col: str, audit_search_op: str, audit_search_val: str,
-                      batch: int = 1, page_size: int = 3) -> dict:
+                      batch: int = 1, page_size: int = 3, audit_from: str = None, audit_to: str = None) -> dict:
         """
         Search Audits
 
@@ -512,8 +1339,13 @@ class DbBackEnd:
         :param audit_search_val: Audit table search value
         :param batch: Row batch, where each batch will be of size 50 at least
         :param page_size: Max record per page
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
         :return: Audit data
         """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
         curs = self.get_cursor
         meta_dict = dict()
 
@@ -528,18 +1360,16 @@ class DbBackEnd:
                 search_cond = "{} {} {}".format(audit_search_col, audit_search_op, audit_search_val)
             else:
                 search_cond = "{} {} '{}'".format(audit_search_col, audit_search_op, audit_search_val)
+        time_cond = audit_time_condition(audit_from, audit_to)
+        if time_cond:
+            search_cond = "{} AND {}".format(search_cond, time_cond)
 
         # Get Table Count
-        if len(search_cond):
-            search_qry = "SELECT count(*) FROM {} WHERE {}".format(audit_table, search_cond)
-        else:
-            search_qry = "SELECT count(*) FROM {}".format(audit_table)
-        curs.execute(search_qry)
-        meta_dict["audits_count"] = int(curs.fetchone()[0])
+        meta_dict["audits_count"] = self.get_table_count(audit_table, search_cond)[0]
 
         # Get rows in batches of 50 records
         batch_num = (batch if 0 < batch < ceil(meta_dict["audits_count"] / page_size) else
-                     1 if batch < 1 else ceil(meta_dict["audits_count"] / page_size))
+                     1 if batch < 1 else max(ceil(meta_dict["audits_count"] / page_size), 1))
 
         if len(search_cond):
             adt_qry = SCT_QUERY_AUDIT_SEARCH.format(
@@ -554,109 +1384,231 @@ class DbBackEnd:
 
         return meta_dict
 
-    def add_audit(self, audit_table: str, status: str, audit_user: str, operation_performed: str,
-                  table_name: str, operation_metadata: dict):
+    @timed_operation("search")
+    def search_audit_text(self, audit_table: str, audit_text: str, page_size: int = 3, page_cursor: str = None,
+                          audit_from: str = None, audit_to: str = None) -> dict:
         """
-        Insert a Audit record
+        Full text search of Audit metadata, newest audits first, seeking on audit id page after page
+        .. admonition:: Note
+            Words are matched through FTS5 table of metadata, or with LIKE if SQLite lacks FTS5.
 
         :param audit_table: Audit table name
+        :param audit_text: Searched text, matching audits contain all its words
+        :param page_size: Max record per page
+        :param page_cursor: Page cursor token of next page, first page if None
+        :param audit_from: Oldest audit date (YYYY-MM-DD)
+        :param audit_to: Newest audit date (YYYY-MM-DD)
+        :return: Audit data and next page cursor, None on last page
+        """
+        self._audit_policy.drain()
+        if self._audit_writer:
+            self._audit_writer.flush(sct_audit_queue_timeout)
+        meta_dict = {
+            "audits_data": [],
+            "next_cursor": None
+        }
+        terms = audit_text_terms(audit_text)
+        if not terms:
+            return meta_dict
+
+        # Match condition
+        curs = self.get_cursor
+        curs.execute(SCT_QUERY_AUDIT_FTS_EXISTS, ("{}_fts".format(audit_table),))
+        if curs.fetchone()[0]:
+            search_cond = [SCT_QUERY_AUDIT_TEXT_MATCH.format(audit_table)]
+            qry_args = [" ".join('"{}"'.format(term) for term in terms)]
+        else:
+            search_cond = [SCT_QUERY_AUDIT_TEXT_LIKE] * len(terms)
+            qry_args = ["%{}%".format(term) for term in terms]
+        if page_cursor:
+            key_values = decode_page_cursor(page_cursor, 1)[1]
+            search_cond.append("audit_id < ?")
+            qry_args.append(int(key_values[0]))
+        time_cond = audit_time_condition(audit_from, audit_to)
+        if time_cond:
+            search_cond.append(time_cond)
+
+        curs.execute(SCT_QUERY_AUDIT_TEXT_SEARCH.format(audit_table, " AND ".join(search_cond)),
+                     qry_args + [page_size + 1])
+        audit_rows = curs.fetchall()
+
+        audit_columns = ["audit_user", "audit_time", "operation_performed",
+                         "table_name", "operation_status", "operation_metadata"]
+        meta_dict["audits_data"] = tuple_to_dict(audit_columns, [rec[1:] for rec in audit_rows[:page_size]])
+        if len(audit_rows) > page_size:
+            meta_dict["next_cursor"] = encode_page_cursor("next", [audit_rows[page_size - 1][0]])
+        return meta_dict
+
+    def add_audit(self, audit_table: str, audit_user: str, operation_performed: str, table_name: str,
+                  status: str, operation_metadata: dict):
+        """
+        Insert a Audit record as audit policy of operation requires
+
+        :param audit_table: Audit table name
+        :param audit_user: Audit user
+        :param operation_performed: Audit operation
+        :param table_name: Table impacted
         :param status: Audit operation status
+        :param operation_metadata: Operation detail
+        :return: None
+        """
+        self._audit_policy.record(audit_table, audit_user, operation_performed, table_name, status,
+                                  operation_metadata)
+
+    def _write_audit(self, audit_table: str, audit_user: str, operation_performed: str, table_name: str,
+                     status: str, operation_metadata: dict):
+        """
+        Write a Audit record, queued for audit writer unless audits are written synchronously
+
+        :param audit_table: Audit table name
         :param audit_user: Audit user
         :param operation_performed: Audit operation
         :param table_name: Table impacted
+        :param status: Audit operation status
         :param operation_metadata: Operation detail
         :return: None
         """
-        curs = self.get_cursor
-        query_str = SCT_QUERY_AUDIT_PUT.format(
-            audit_table,
-            audit_user if audit_user else "ANONYMOUS",
+        audit_row = (
             operation_performed,
             table_name,
             status,
-            json.dumps(operation_metadata)
+            audit_user if audit_user else "ANONYMOUS",
+            json.dumps(operation_metadata, default=str)
         )
 
-        curs.execute(query_str)
-        self.db_connection.commit()
+        audit_writer = self._get_audit_writer()
+        if audit_writer:
+            audit_writer.submit(audit_table, audit_row)
+        else:
+            self.insert_audits(audit_table, [audit_row])
 
-    def get_pending_bulk_loading(self, audit_table, max_failure):
+    def insert_audits(self, audit_table: str, audit_rows: list):
         """
-        List of files pending for processing
+        Insert Audit records with a single multi row insert
 
         :param audit_table: Audit table name
-        :param max_failure: Max number of failure before we discard a file
-        :return: dictionary with keys for table name and file to load
+        :param audit_rows: List of audit column values
+        :return: None
         """
-        # Fetch data
-        curs = self.get_cursor
-        curs.execute(
-            SCT_QUERY_AUDIT_BULK_LOAD.format(
-                audit_table
-            )
-        )
+        query_str = SCT_QUERY_AUDIT_PUT.format(audit_table)
+        self._write(lambda curs: curs.executemany(query_str, audit_rows))
+        self._count_cache.invalidate_table(self._database, self._schema, audit_table)
 
-        # Group data
-        all_records = dict()
-        for rec in curs.fetchall():
-            table_name, file_name, action_name = (rec[0], json.loads(rec[2])["file_name"], rec[1])
-            if table_name not in all_records:
-                all_records[table_name] = dict()
-            if file_name not in all_records[table_name]:
-                all_records[table_name][file_name] = []
-            (all_records[table_name][file_name]).append(action_name)
-
-        # Filter out files that need to be considered
-        result_dict = dict()
-        for tbl in all_records.keys():
-            for fl in all_records[tbl]:
-                if ("SUCCESS" not in all_records[tbl][fl] and
-                        len([st for st in all_records[tbl][fl] if st == "FAILED"]) <= int(max_failure)):
-                    if tbl not in result_dict:
-                        result_dict[tbl] = [fl]
-                    else:
-                        result_dict[tbl].append(fl)
-
-        return result_dict
-
-    def bulk_load_table_records(self, table: str, file_path: str):
+    def _get_audit_writer(self):
         """
-        Add row to table
+        Audit writer, started on first audit
+
+        :return: AuditWriter, None if audits are written synchronously
+        """
+        if not sct_audit_async or not self._writer:
+            return None
+        with self._audit_lock:
+            if self._audit_writer is None:
+                self._audit_writer = AuditWriter(self.insert_audits, self.release)
+        return self._audit_writer
+
+    def create_bulk_job_table(self, job_table: str):
+        """
+        Create a Bulk load job table
+
+        :param job_table: Bulk load job table name
+        :return: None
+        """
+        def create_table(curs):
+            curs.execute(SCT_QUERY_BULK_JOB_TABLE_CREATION.format(job_table))
+            curs.execute(SCT_QUERY_BULK_JOB_INDEX_CREATION.format(job_table))
+
+        self._write(create_table)
+
+    def add_bulk_job(self, job_table: str, table_name: str, file_name: str, job_user: str):
+        """
+        Add a pending Bulk load job
+
+        :param job_table: Bulk load job table name
+        :param table_name: Table to load
+        :param file_name: Uploaded file name
+        :param job_user: User uploading file
+        :return: None
+        """
+        query_str = SCT_QUERY_BULK_JOB_PUT.format(job_table)
+        self._write(lambda curs: curs.execute(query_str, (table_name, file_name, job_user or "ANONYMOUS")))
+
+    def claim_bulk_jobs(self, job_table: str, max_jobs: int, timeout: int) -> list:
+        """
+        Claim pending Bulk load jobs, moving them to RUNNING state
+
+        :param job_table: Bulk load job table name
+        :param max_jobs: Max jobs claimed
+        :param timeout: Seconds after which a RUNNING job is considered abandoned and claimed again
+        :return: List of claimed job dictionaries
+        """
+        def claim_jobs(curs):
+            curs.execute(SCT_QUERY_BULK_JOB_PENDING.format(job_table),
+                         ("-{} seconds".format(int(timeout)), int(max_jobs)))
+            jobs = tuple_to_dict(["job_id", "table_name", "file_name", "job_user", "attempts", "rows_loaded"],
+                                 curs.fetchall())
+            curs.executemany(SCT_QUERY_BULK_JOB_CLAIM.format(job_table), [(job["job_id"],) for job in jobs])
+            return jobs
+
+        return self._write(claim_jobs)
+
+    def finish_bulk_job(self, job_table: str, job_id: int, job_state: str, rows_loaded: int = None,
+                        job_error: str = None):
+        """
+        Move a claimed Bulk load job out of RUNNING state
+
+        :param job_table: Bulk load job table name
+        :param job_id: Job id
+        :param job_state: New job state (SUCCESS, PENDING for retry, FAILED)
+        :param rows_loaded: Number of rows loaded, recorded progress is kept if not provided
+        :param job_error: Load error
+        :return: None
+        """
+        query_str = SCT_QUERY_BULK_JOB_FINISH.format(job_table)
+        self._write(lambda curs: curs.execute(query_str, (job_state, rows_loaded, job_error, job_id)))
+
+    def set_bulk_job_progress(self, job_table: str, job_id: int, rows_loaded: int):
+        """
+        Record rows of a claimed Bulk load job committed so far, a retry of job resumes past them
+
+        :param job_table: Bulk load job table name
+        :param job_id: Job id
+        :param rows_loaded: Number of file rows committed
+        :return: None
+        """
+        query_str = SCT_QUERY_BULK_JOB_PROGRESS.format(job_table)
+        self._write(lambda curs: curs.execute(query_str, (rows_loaded, job_id)))
+
+    @timed_operation("bulk_load")
+    def bulk_load_table_records(self, table: str, file_path: str, batch_size: int = sct_bulk_load_batch_size,
+                                skip_rows: int = 0, progress=None):
+        """
+        Add rows of a CSV file to table, inserting and committing them in batches
 
         :param table: Table name
         :param file_path: File name to load table from
-        :return: None
+        :param batch_size: Rows inserted with one executemany and committed together
+        :param skip_rows: Number of leading file rows committed by an earlier attempt
+        :param progress: Called with number of file rows committed after each batch
+        :return: Number of file rows loaded, skipped rows included
         """
-        total_rec = 0
-        curs = self.get_cursor
-        table_details = self.get_table_columns(table)["columns"]
+        table_details = self.get_table_columns(table)["insert"]
 
         # Read in CSV
-        with open(file_path, mode='r') as file:
-            csv_file = csv.reader(file)
-            column_list = []
-            for i, row in enumerate(csv_file):
-                if not i:
-                    column_list = row
-                else:
-                    qry_args = []
-                    for c, col in enumerate(column_list):
-                        if (("int" in (table_details[col]["type"]).lower() and
-                             "point" not in (table_details[col]["type"]).lower()) or
-                                ("double" in (table_details[col]["type"]).lower() or
-                                 "numeric" in (table_details[col]["type"]).lower() or
-                                 "float" in (table_details[col]["type"]).lower())):
-                            qry_args.append("{}".format(row[c]))
-                        else:
-                            qry_args.append("'{}'".format(row[c]))
-                    insert_qry = SCT_QUERY_INSERT_ROW.format(
-                        table,
-                        ",".join(column_list),
-                        ",".join(qry_args)
-                    )
-
-                    curs.execute(insert_qry)
-                    total_rec = total_rec + 1
-
-        self.db_connection.commit()
-        return total_rec
+        with open(file_path, mode='r', newline='') as file:
+            csv_file = CsvBulkReader(file, table_details, skip_rows)
+            insert_qry = SCT_QUERY_INSERT_ROW.format(
+                table,
+                ",".join(csv_file.columns),
+                ",".join(["?"] * len(csv_file.columns))
+            )
+            try:
+                for batch in csv_file.batches(batch_size):
+                    self._write(lambda curs: curs.executemany(insert_qry, batch))
+                    if progress:
+                        progress(csv_file.row_count)
+            finally:
+                self._lookup_cache.invalidate_table(self._database, self._schema, table)
+                self._count_cache.invalidate_table(self._database, self._schema, table)
+
+        return csv_file.row_count
@@ -49,7 +49,39 @@ PRAGMA foreign_key_list({});
 """
 
 SCT_QUERY_GET_FK_LOOKUP = """
-SELECT DISTINCT {} FROM {}
+SELECT {0} FROM {1} WHERE {2} ORDER BY {0} LIMIT ? OFFSET ?
+"""
+
+SCT_QUERY_GET_INDEX_LIST = """
+PRAGMA index_list({})
+"""
+
+SCT_QUERY_GET_INDEX_INFO = """
+PRAGMA index_info({})
+"""
+
+SCT_QUERY_SEARCH_PREFIX = """
+{0} >= upper(?) AND {0} LIKE ? ESCAPE '\\'
+"""
+
+SCT_QUERY_SEARCH_CONTAINS = """
+{0} LIKE ? ESCAPE '\\'
+"""
+
+SCT_QUERY_SEARCH_SAMPLE = """
+{0} <= (SELECT max({0}) FROM (SELECT {0} FROM {1} ORDER BY {0} LIMIT {2}) sct_sample)
+"""
+
+SCT_QUERY_FK_LOOKUP_PREFIX = """
+{0} >= upper(?) AND {0} LIKE ? ESCAPE '\\'
+"""
+
+SCT_QUERY_FK_LOOKUP_SEEK = """
+{0} >= ?
+"""
+
+SCT_QUERY_GET_ROW = """
+SELECT {} FROM {} WHERE {}
 """
 
 SCT_QUERY_INSERT_ROW = """
@@ -64,6 +96,10 @@ SCT_QUERY_UPDATE_ROW = """
 UPDATE {} SET {} WHERE {}
 """
 
+SCT_QUERY_RETURNING = """
+RETURNING {}
+"""
+
 SCT_QUERY_AUDIT_GET = """
 SELECT audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {}
 ORDER BY audit_id LIMIT {},{}
@@ -77,14 +113,10 @@ ORDER BY audit_id LIMIT {},{}
 
 SCT_QUERY_AUDIT_PUT = """
 INSERT INTO {0}(operation_performed, table_name, operation_status, audit_user, operation_metadata) VALUES (
-    '{1}', '{2}', '{3}', '{4}', '{5}'
+    ?, ?, ?, ?, ?
 )
 """
 
-SCT_QUERY_AUDIT_BULK_LOAD = """
-SELECT table_name, operation_status, operation_metadata FROM {} WHERE operation_performed = 'BULK_UPLOAD'
-"""
-
 SCT_QUERY_GET_PAGINATE_DATA = """
 SELECT {} FROM {} ORDER BY {} LIMIT {},{}
 """
@@ -103,4 +135,104 @@ create table IF NOT EXISTS sct_audits (
     operation_status VARCHAR (15) not null,
     operation_metadata VARCHAR (5000)
 );
-"""
\ No newline at end of file
+"""
+
+SCT_QUERY_AUDIT_INDEX_CREATION = """
+CREATE INDEX IF NOT EXISTS {1} ON {0} ({2})
+"""
+
+SCT_QUERY_AUDIT_FTS_EXISTS = """
+SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = ?
+"""
+
+SCT_QUERY_AUDIT_FTS_TABLE_CREATION = """
+CREATE VIRTUAL TABLE IF NOT EXISTS {0}_fts USING fts5(operation_metadata, content='{0}', content_rowid='audit_id')
+"""
+
+SCT_QUERY_AUDIT_FTS_INSERT_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {0}_fts_insert AFTER INSERT ON {0} BEGIN
+    INSERT INTO {0}_fts(rowid, operation_metadata) VALUES (new.audit_id, new.operation_metadata);
+END
+"""
+
+SCT_QUERY_AUDIT_FTS_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {0}_fts_delete AFTER DELETE ON {0} BEGIN
+    INSERT INTO {0}_fts({0}_fts, rowid, operation_metadata) VALUES ('delete', old.audit_id, old.operation_metadata);
+END
+"""
+
+SCT_QUERY_AUDIT_FTS_REBUILD = """
+INSERT INTO {0}_fts({0}_fts) VALUES ('rebuild')
+"""
+
+SCT_QUERY_AUDIT_TEXT_MATCH = "audit_id IN (SELECT rowid FROM {0}_fts WHERE {0}_fts MATCH ?)"
+
+SCT_QUERY_AUDIT_TEXT_LIKE = "operation_metadata LIKE ?"
+
+SCT_QUERY_AUDIT_TEXT_SEARCH = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {0}
+WHERE {1}
+ORDER BY audit_id DESC LIMIT ?
+"""
+
+SCT_QUERY_AUDIT_OLDEST = """
+SELECT min(audit_time) FROM {} WHERE audit_time < ?
+"""
+
+SCT_QUERY_AUDIT_PERIOD_ARCHIVE = """
+SELECT audit_id, audit_user, audit_time, operation_performed, table_name, operation_status, operation_metadata FROM {} WHERE audit_time >= ? AND audit_time < ? ORDER BY audit_id
+"""
+
+SCT_QUERY_AUDIT_PERIOD_DELETE = """
+DELETE FROM {} WHERE audit_time >= ? AND audit_time < ?
+"""
+
+SCT_QUERY_BULK_JOB_TABLE_CREATION = """
+create table IF NOT EXISTS {0} (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name VARCHAR (100) not null UNIQUE,
+    table_name VARCHAR (100) not null,
+    job_user VARCHAR (100) not null,
+    job_state VARCHAR (15) not null DEFAULT 'PENDING',
+    attempts INTEGER not null DEFAULT 0,
+    rows_loaded INTEGER,
+    job_error VARCHAR (5000),
+    created_time timestamp NOT NULL DEFAULT current_timestamp,
+    updated_time timestamp NOT NULL DEFAULT current_timestamp
+);
+"""
+
+SCT_QUERY_BULK_JOB_INDEX_CREATION = """
+CREATE INDEX IF NOT EXISTS {0}_state_idx ON {0} (job_state, updated_time)
+"""
+
+SCT_QUERY_BULK_JOB_PUT = """
+INSERT INTO {}(table_name, file_name, job_user) VALUES (?, ?, ?)
+"""
+
+SCT_QUERY_BULK_JOB_PENDING = """
+SELECT job_id, table_name, file_name, job_user, attempts + 1, COALESCE(rows_loaded, 0) FROM {}
+WHERE job_state = 'PENDING' OR (job_state = 'RUNNING' AND updated_time < datetime('now', ?))
+ORDER BY job_id LIMIT ?
+"""
+
+SCT_QUERY_BULK_JOB_CLAIM = """
+UPDATE {} SET job_state = 'RUNNING', attempts = attempts + 1, updated_time = current_timestamp WHERE job_id = ?
+"""
+
+SCT_QUERY_BULK_JOB_FINISH = """
+UPDATE {} SET job_state = ?, rows_loaded = COALESCE(?, rows_loaded), job_error = ?, updated_time = current_timestamp
+WHERE job_id = ?
+"""
+
+SCT_QUERY_BULK_JOB_PROGRESS = """
+UPDATE {} SET rows_loaded = ?, updated_time = current_timestamp WHERE job_id = ?
+"""
+
+SCT_QUERY_GET_SCHEMA_VERSION = """
+PRAGMA schema_version
+"""
+
+SCT_QUERY_ESTIMATE_COUNT = """
+SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1
+"""
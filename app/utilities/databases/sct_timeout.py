@@ -0,0 +1,67 @@
+"""
+    sct_timeout.py
+    -------
+    This module consists of query timeout helpers shared by all SCT database backends
+"""
+import functools
+
+from app.utilities.sct_env import (
+    sct_db_timeout_browse,
+    sct_db_timeout_search,
+    sct_db_timeout_export,
+    sct_db_timeout_bulk_load
+)
+
+# # Operation classes and seconds their queries may run (0 for no limit)
+SCT_QUERY_TIMEOUTS = {
+    "browse": sct_db_timeout_browse,
+    "search": sct_db_timeout_search,
+    "export": sct_db_timeout_export,
+    "bulk_load": sct_db_timeout_bulk_load
+}
+
+
+class QueryTimeoutError(Exception):
+    """
+        Raised when a query is cancelled for running longer than timeout of its operation class.
+    """
+
+    def __init__(self, operation: str, timeout: float):
+        """
+        QueryTimeoutError constructor
+
+        :param operation: Operation class of cancelled query
+        :param timeout: Seconds query was allowed to run
+        """
+        super().__init__("{} query cancelled after running for {:g} seconds".format(
+            operation.replace("_", " ").capitalize(), timeout))
+        self.operation = operation
+        self.timeout = timeout
+
+
+def get_query_timeout(operation: str) -> float:
+    """
+    Timeout of an operation class
+
+    :param operation: Operation class (browse, search, export, bulk_load)
+    :return: Seconds queries of operation may run, 0 for no limit
+    """
+    if operation not in SCT_QUERY_TIMEOUTS:
+        raise ValueError("Invalid operation class {}".format(operation))
+    return max(SCT_QUERY_TIMEOUTS[operation], 0)
+
+
+def timed_operation(operation: str):
+    """
+    Decorator running a DbBackEnd method under query timeout of its operation class
+
+    :param operation: Operation class (browse, search, export, bulk_load)
+    :return: Method decorator
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with self.query_timeout(operation):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorator
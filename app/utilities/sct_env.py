@@ -33,16 +33,86 @@ sct_table_auto_populated_column_comment = "NO_DIRECT_UPDATE"
 sct_table_referenced_column_in_lookup_view = "IS_LOOKED_UP"
 # # Table to be blacklisted
 sct_table_table_blacklist = os.environ.get("SCT_DB_TABLE_BLACKLIST", "sct_,sqlite_")
+# # Connections opened while pool is created (postgres, mysql)
+sct_db_pool_min_size = int(os.environ.get("SCT_DB_POOL_MIN_SIZE", "1"))
+# # Max connections open at a time per database (postgres, mysql)
+sct_db_pool_max_size = int(os.environ.get("SCT_DB_POOL_MAX_SIZE", "10"))
+# # Seconds to wait for a free connection before failing request
+sct_db_pool_timeout = float(os.environ.get("SCT_DB_POOL_TIMEOUT", "30"))
+# # Health check connection before handing it to a request (yes/no)
+sct_db_pool_pre_ping = os.environ.get("SCT_DB_POOL_PRE_PING", "yes").lower() == "yes"
+# # Number of retries while opening a connection
+sct_db_pool_retry = int(os.environ.get("SCT_DB_POOL_RETRY", "3"))
+# # Seconds waited before first connection retry, doubled on every retry
+sct_db_pool_backoff = float(os.environ.get("SCT_DB_POOL_BACKOFF", "0.5"))
+# # Rows inserted and committed per batch by bulk loader (mysql, sqlite)
+sct_bulk_load_batch_size = int(os.environ.get("SCT_BULK_LOAD_BATCH_SIZE", "1000"))
+# # Use WAL journal, pooled reader connections and a single writer for file based SQLite (yes/no)
+sct_sqlite_concurrent = os.environ.get("SCT_SQLITE_CONCURRENT", "yes").lower() == "yes"
+# # SQLite memory mapped I/O size in bytes
+sct_sqlite_mmap_size = int(os.environ.get("SCT_SQLITE_MMAP_SIZE", "268435456"))
+# # SQLite page cache size (negative value is size in KiB)
+sct_sqlite_cache_size = int(os.environ.get("SCT_SQLITE_CACHE_SIZE", "-65536"))
+# # SQLite synchronous mode for writer (OFF, NORMAL, FULL)
+sct_sqlite_synchronous = os.environ.get("SCT_SQLITE_SYNCHRONOUS", "NORMAL")
+# # Seconds a SQLite connection waits on a locked database
+sct_sqlite_busy_timeout = float(os.environ.get("SCT_SQLITE_BUSY_TIMEOUT", "30"))
+# # Max queued SQLite mutations committed together by writer
+sct_sqlite_write_batch_size = int(os.environ.get("SCT_SQLITE_WRITE_BATCH_SIZE", "64"))
+# # Seconds a table or audit page query may run before it is cancelled (0 for no limit)
+sct_db_timeout_browse = float(os.environ.get("SCT_DB_TIMEOUT_BROWSE", "30"))
+# # Seconds a table or audit search query may run before it is cancelled (0 for no limit)
+sct_db_timeout_search = float(os.environ.get("SCT_DB_TIMEOUT_SEARCH", "60"))
+# # Seconds a CSV download query may run before it is cancelled (0 for no limit)
+sct_db_timeout_export = float(os.environ.get("SCT_DB_TIMEOUT_EXPORT", "600"))
+# # Seconds a bulk load may run before it is cancelled (0 for no limit)
+sct_db_timeout_bulk_load = float(os.environ.get("SCT_DB_TIMEOUT_BULK_LOAD", "0"))
+#######################################################################
+
+#######################################################################
+# Cache Related
+# # Max number of tables whose metadata is cached
+sct_metadata_cache_size = int(os.environ.get("SCT_METADATA_CACHE_SIZE", "128"))
+# # Seconds between schema version checks for metadata cache invalidation
+sct_metadata_cache_check_interval = int(os.environ.get("SCT_METADATA_CACHE_CHECK_INTERVAL", "10"))
+# # Max number of FK lookup pages cached
+sct_lookup_cache_size = int(os.environ.get("SCT_LOOKUP_CACHE_SIZE", "256"))
+# # Seconds for which a cached FK lookup page is served
+sct_lookup_cache_ttl = int(os.environ.get("SCT_LOOKUP_CACHE_TTL", "60"))
+# # Row count strategy used for pager (exact, estimate, cached, window)
+sct_count_strategy = os.environ.get("SCT_COUNT_STRATEGY", "cached")
+# # Per table row count strategy overrides (Comma Separated List of table:strategy)
+sct_count_strategy_tables = os.environ.get("SCT_COUNT_STRATEGY_TABLES", "")
+# # Estimated row count below which exact count is used
+sct_count_exact_threshold = int(os.environ.get("SCT_COUNT_EXACT_THRESHOLD", "10000"))
+# # Max number of row counts cached
+sct_count_cache_size = int(os.environ.get("SCT_COUNT_CACHE_SIZE", "512"))
+# # Seconds for which a cached row count is served
+sct_count_cache_ttl = int(os.environ.get("SCT_COUNT_CACHE_TTL", "60"))
 #######################################################################
 
 #######################################################################
 # UI Related
 # # Max record to show per page
 sct_ui_pagesize = int(os.environ.get("SCT_UI_PAGESIZE", "5"))
-# # Max record in downloaded CSV
-sct_ui_download_size = int(os.environ.get("SCT_UI_DOWNLOAD_SIZE", "2000"))
+# # Max record in downloaded CSV (0 for no limit)
+sct_ui_download_size = int(os.environ.get("SCT_UI_DOWNLOAD_SIZE", "0"))
+# # Record fetched from database per batch while streaming downloaded CSV
+sct_ui_download_fetch_size = int(os.environ.get("SCT_UI_DOWNLOAD_FETCH_SIZE", "1000"))
 # # Max record that can be appended uploaded feature
 sct_ui_upload_size = int(os.environ.get("SCT_UI_UPLOAD_SIZE", "500"))
+# # Max rows edited or deleted per bulk change request
+sct_ui_bulk_change_size = int(os.environ.get("SCT_UI_BULK_CHANGE_SIZE", "1000"))
+# # Max FK lookup values returned per typeahead page
+sct_ui_lookup_size = int(os.environ.get("SCT_UI_LOOKUP_SIZE", "20"))
+# # Days of audits shown by default in audit page (0 for all)
+sct_ui_audit_days = int(os.environ.get("SCT_UI_AUDIT_DAYS", "30"))
+# # Search of a large table no index serves (allow, refuse, sample)
+sct_ui_search_scan_policy = os.environ.get("SCT_UI_SEARCH_SCAN_POLICY", "sample")
+# # Estimated row count from which search scan policy applies
+sct_ui_search_scan_threshold = int(os.environ.get("SCT_UI_SEARCH_SCAN_THRESHOLD", "1000000"))
+# # Rows, in primary key order, scanned by a sampled search
+sct_ui_search_sample_size = int(os.environ.get("SCT_UI_SEARCH_SAMPLE_SIZE", "100000"))
 #######################################################################
 
 #######################################################################
@@ -65,6 +135,34 @@ sct_audit_db_pwd = os.environ.get("SCT_AUDIT_DB_PWD", "")
 sct_audit_db_table = os.environ.get("SCT_AUDIT_DB_TABLE", "sct_audits")
 # # Create audit table
 sct_audit_table_create = os.environ.get("SCT_AUDIT_TABLE_CREATE", "yes")
+# # Add missing audit table indexes while app initiation (yes/no)
+sct_audit_table_migrate = os.environ.get("SCT_AUDIT_TABLE_MIGRATE", "yes")
+# # Write audits in batches from a background thread (yes/no)
+sct_audit_async = os.environ.get("SCT_AUDIT_ASYNC", "yes").lower() == "yes"
+# # Max audits queued in memory before requests wait for audit writer
+sct_audit_queue_size = int(os.environ.get("SCT_AUDIT_QUEUE_SIZE", "10000"))
+# # Seconds a request waits for room in a full audit queue before failing
+sct_audit_queue_timeout = float(os.environ.get("SCT_AUDIT_QUEUE_TIMEOUT", "30"))
+# # Max audits inserted per batch
+sct_audit_batch_size = int(os.environ.get("SCT_AUDIT_BATCH_SIZE", "200"))
+# # Seconds between audit batch flushes
+sct_audit_flush_interval = float(os.environ.get("SCT_AUDIT_FLUSH_INTERVAL", "1"))
+# # Audit policy of read operations (Comma Separated List of operation:policy, policy being full, sample or aggregate)
+sct_audit_policy = os.environ.get("SCT_AUDIT_POLICY", "")
+# # One in N read audits kept by sample policy
+sct_audit_sample_rate = int(os.environ.get("SCT_AUDIT_SAMPLE_RATE", "10"))
+# # Seconds covered by one counter audit of aggregate policy
+sct_audit_aggregate_window = int(os.environ.get("SCT_AUDIT_AGGREGATE_WINDOW", "60"))
+# # Create audit table partitioned by month (yes/no, postgres, mysql)
+sct_audit_partition = os.environ.get("SCT_AUDIT_PARTITION", "no").lower() == "yes"
+# # Months of audit partitions created ahead of current month
+sct_audit_partition_ahead = int(os.environ.get("SCT_AUDIT_PARTITION_AHEAD", "2"))
+# # Months of audits kept besides current month, older audits are archived and removed (0 keeps all audits)
+sct_audit_retention_months = int(os.environ.get("SCT_AUDIT_RETENTION_MONTHS", "0"))
+# # Directory of archived audit files (empty to remove audits without archiving)
+sct_audit_archive_dir = os.environ.get("SCT_AUDIT_ARCHIVE_DIR", "audit_archive")
+# # Seconds between audit partition and retention maintenance runs
+sct_audit_maintenance_interval = int(os.environ.get("SCT_AUDIT_MAINTENANCE_INTERVAL", "86400"))
 #######################################################################
 
 #######################################################################
@@ -73,6 +171,12 @@ sct_audit_table_create = os.environ.get("SCT_AUDIT_TABLE_CREATE", "yes")
 sct_scheduler_interval_value = os.environ.get("SCT_SCHEDULER_INTERVAL_VALUE", "720")
 # # Max failed attempt
 sct_scheduler_job_max_attempt = os.environ.get("SCT_SCHEDULER_JOB_MAX_ATTEMPT", "1")
+# # Bulk load job table (created in audit database)
+sct_scheduler_job_table = os.environ.get("SCT_SCHEDULER_JOB_TABLE", "sct_bulk_jobs")
+# # Max bulk load jobs claimed per scheduler run
+sct_scheduler_job_batch_size = int(os.environ.get("SCT_SCHEDULER_JOB_BATCH_SIZE", "10"))
+# # Seconds after which a running bulk load job is considered abandoned and claimed again
+sct_scheduler_job_timeout = int(os.environ.get("SCT_SCHEDULER_JOB_TIMEOUT", "3600"))
 #######################################################################
 
 #######################################################################
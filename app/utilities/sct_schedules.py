@@ -7,6 +7,7 @@ import datetime
 import json
 from app.utilities.sct_env import *
 from app.utilities.sct_mail import send_mail
+from app.utilities.databases.sct_timeout import QueryTimeoutError
 
 
 def sct_scheduled_bulk_loader(app):
@@ -19,25 +20,56 @@ def sct_scheduled_bulk_loader(app):
     db = app.config["SCT_DATA_DB"]
     audit_db = app.config["SCT_AUDIT_DB"]
     app.logger.info("Scheduled Job (sct_scheduled_bulk_loader) started")
-    pending_files = db.get_pending_bulk_loading(sct_audit_db_table, sct_scheduler_job_max_attempt)
-    app.logger.info("List of pending files to be processed are - {}".format(pending_files))
+    pending_jobs = audit_db.claim_bulk_jobs(sct_scheduler_job_table, sct_scheduler_job_batch_size,
+                                            sct_scheduler_job_timeout)
+    app.logger.info("List of bulk load jobs to be processed are - {}".format(pending_jobs))
+    if not pending_jobs:
+        return
     table_list = []
     metadata_dict = []
-    for tb in pending_files.keys():
-        for fl in pending_files[tb]:
-            table_list.append(tb)
-            app_root = os.path.dirname(app.instance_path)
-            rec_inserted = db.bulk_load_table_records(tb, os.path.join(app_root, 'static', 'uploads', fl))
-            app.logger.info("Total record inserted in {} table with file {} is {}".format(tb, fl, rec_inserted))
-            audit_db.add_audit(sct_audit_db_table, 'SYSTEM', "BULK_UPLOAD", tb, "SUCCESS", {
+    job_status = "SUCCESS"
+    app_root = os.path.dirname(app.instance_path)
+    for job in pending_jobs:
+        tb, fl = job["table_name"], job["file_name"]
+        table_list.append(tb)
+        try:
+            # Batches are committed as they load, so a retry resumes past rows an earlier attempt committed
+            rec_inserted = db.bulk_load_table_records(
+                tb, os.path.join(app_root, 'static', 'uploads', fl), skip_rows=job["rows_loaded"],
+                progress=lambda rows, job_id=job["job_id"]: audit_db.set_bulk_job_progress(
+                    sct_scheduler_job_table, job_id, rows))
+        except Exception as e:
+            app.logger.error("Bulk load of {} table with file {} failed, attempt {}: {}".format(
+                tb, fl, job["attempts"], e))
+            # A cancelled load would run into its timeout again, so it is not retried
+            cancelled = isinstance(e, QueryTimeoutError)
+            job_state = ("FAILED" if cancelled or job["attempts"] >= int(sct_scheduler_job_max_attempt) else
+                         "PENDING")
+            audit_db.finish_bulk_job(sct_scheduler_job_table, job["job_id"], job_state, job_error=str(e))
+            load_status = "CANCELLED" if cancelled else "FAILED"
+            audit_db.add_audit(sct_audit_db_table, 'SYSTEM', "BULK_UPLOAD", tb, load_status, {
                 "file_name": fl,
-                "total_record_inserted": rec_inserted
+                "attempt": job["attempts"],
+                "error": str(e)
             })
             metadata_dict.append({
                 "table": tb,
                 "file_name": fl,
-                "total_record_inserted": rec_inserted
+                "error": str(e)
             })
+            job_status = "FAILED"
+            continue
+        app.logger.info("Total record inserted in {} table with file {} is {}".format(tb, fl, rec_inserted))
+        audit_db.finish_bulk_job(sct_scheduler_job_table, job["job_id"], "SUCCESS", rows_loaded=rec_inserted)
+        audit_db.add_audit(sct_audit_db_table, 'SYSTEM', "BULK_UPLOAD", tb, "SUCCESS", {
+            "file_name": fl,
+            "total_record_inserted": rec_inserted
+        })
+        metadata_dict.append({
+            "table": tb,
+            "file_name": fl,
+            "total_record_inserted": rec_inserted
+        })
 
     send_mail(app,
               mail_type="job",
@@ -45,5 +77,21 @@ def sct_scheduled_bulk_loader(app):
               table_name=",".join(table_list),
               audit_user="SYSTEM",
               audit_time=datetime.datetime.now().strftime("%d %B, %Y %H:%M:%S (%A)"),
-              operation_status="SUCCESS",
+              operation_status=job_status,
               operation_metadata=json.dumps(metadata_dict))
+
+
+def sct_scheduled_audit_maintenance(app):
+    """
+    SCT Audit maintenance, creating upcoming audit partitions and archiving audits older than retention
+
+    :param app: Application instance
+    :return: None
+    """
+    audit_db = app.config["SCT_AUDIT_DB"]
+    app.logger.info("Scheduled Job (sct_scheduled_audit_maintenance) started")
+    maintenance = audit_db.maintain_audit_table(sct_audit_db_table)
+    app.logger.info("Audit partitions created {}, audit periods archived {}".format(
+        maintenance["partitions_created"], maintenance["periods_archived"]))
+    if maintenance["partitions_created"] or maintenance["periods_archived"]:
+        audit_db.add_audit(sct_audit_db_table, 'SYSTEM', "MAINTAIN_AUDIT", sct_audit_db_table, "SUCCESS", maintenance)
@@ -3,6 +3,21 @@
     -------
     This module consists of utility functions used by other module
 """
+import io
+import csv
+import json
+import base64
+from itertools import zip_longest
+from datetime import datetime, timedelta
+
+from app.utilities.sct_env import sct_count_strategy, sct_count_strategy_tables, sct_ui_audit_days
+
+SCT_COUNT_STRATEGIES = ["exact", "estimate", "cached", "window"]
+SCT_SEARCH_OPERATORS = ["=", "!=", ">", ">=", "<", "<=", "like", "in", "not in", "between", "is null", "is not null"]
+SCT_SEARCH_OPERATOR_ALIASES = {"==": "=", "<>": "!="}
+SCT_SEARCH_NULL_OPERATORS = ["is null", "is not null"]
+SCT_SEARCH_MATCHES = {"all": " AND ", "any": " OR "}
+SCT_SEARCH_INDEXED_OPERATORS = ["=", ">", ">=", "<", "<=", "like", "in", "between", "is null"]
 
 
 def tuple_to_dict(key_list: list, tuple_list: list) -> list:
@@ -30,3 +45,338 @@ def tuple_to_list(tuple_list: list) -> list:
     :return: List of elements
     """
     return [t[0] for t in tuple_list]
+
+
+def is_numeric_type(col_type: str) -> bool:
+    """
+    Checks whether a column type holds numeric values, whose values are used in SQL without quotes
+
+    :param col_type: Column data type
+    :return: True for numeric column type
+    """
+    col_type = str(col_type).lower()
+    return (("int" in col_type and "point" not in col_type) or
+            "double" in col_type or "numeric" in col_type or "float" in col_type or "decimal" in col_type)
+
+
+def escape_like(value: str) -> str:
+    """
+    Escapes LIKE pattern wildcards in a value, using backslash as escape character
+
+    :param value: Value to be matched literally
+    :return: Escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_page_cursor(direction: str, key_values: list = None) -> str:
+    """
+    Encodes a keyset pagination position as an opaque URL safe token
+
+    :param direction: Page direction, one of next (rows after key), prev (rows before key) or last (last page)
+    :param key_values: Primary key values of row bounding the page
+    :return: Page cursor token
+    """
+    page_cursor = json.dumps({"d": direction, "k": key_values}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(page_cursor.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(page_cursor: str, key_count: int) -> tuple:
+    """
+    Decodes a page cursor token created by encode_page_cursor
+
+    :param page_cursor: Page cursor token
+    :param key_count: Number of primary key columns of table being paged
+    :return: Tuple of direction and primary key values
+    """
+    try:
+        padded = page_cursor + "=" * (-len(page_cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        direction, key_values = decoded["d"], decoded["k"]
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValueError("Invalid page cursor")
+    if direction == "last" and key_values is None:
+        return direction, None
+    if direction not in ("next", "prev") or not isinstance(key_values, list) or len(key_values) != key_count:
+        raise ValueError("Invalid page cursor")
+    return direction, key_values
+
+
+def encode_row_key(key_values: list) -> str:
+    """
+    Encodes primary key values of a row as an opaque URL safe token
+
+    :param key_values: Primary key values of row
+    :return: Row key token
+    """
+    row_key = json.dumps(key_values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(row_key.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_row_key(row_key: str, key_count: int) -> list:
+    """
+    Decodes a row key token created by encode_row_key
+
+    :param row_key: Row key token
+    :param key_count: Number of primary key columns of table
+    :return: Primary key values of row
+    """
+    try:
+        padded = row_key + "=" * (-len(row_key) % 4)
+        key_values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid row key")
+    if not isinstance(key_values, list) or len(key_values) != key_count:
+        raise ValueError("Invalid row key")
+    return key_values
+
+
+def keyset_page(fetch_rows, project_list: list, key_list: list, page_size: int,
+                page_cursor: str = None, offset: int = 0, last_page_size: int = None) -> dict:
+    """
+    Fetches a page of rows seeking on primary key columns, so that any page costs the same as first page
+
+    :param fetch_rows: Callable taking limit, seek key values, reverse flag and offset returning rows in key order
+    :param project_list: List of projected columns
+    :param key_list: List of primary key columns, all of which are projected
+    :param page_size: Max record per page
+    :param page_cursor: Page cursor token, offset is used when not provided
+    :param offset: Rows skipped when no page cursor is provided
+    :param last_page_size: Number of rows on last page
+    :return: Dictionary of page rows, next/prev page cursors (None when there is no such page) and last page cursor
+    """
+    if page_cursor:
+        direction, key_values = decode_page_cursor(page_cursor, len(key_list))
+        offset = 0
+    else:
+        direction, key_values = "next", None
+    reverse = direction != "next"
+    limit = last_page_size if direction == "last" and last_page_size else page_size
+
+    # Fetch one extra row to know whether a page exists beyond this one
+    rows = list(fetch_rows(limit + 1, key_values, reverse, offset))
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[1:] if reverse else rows[:limit]
+
+    rows_after = has_more if not reverse else direction == "prev"
+    rows_before = has_more if reverse else (key_values is not None or offset > 0)
+    key_pos = [list(project_list).index(k) for k in key_list]
+    return {
+        "rows": rows,
+        "next_cursor": encode_page_cursor("next", [rows[-1][p] for p in key_pos]) if rows and rows_after else None,
+        "prev_cursor": encode_page_cursor("prev", [rows[0][p] for p in key_pos]) if rows and rows_before else None,
+        "last_cursor": encode_page_cursor("last")
+    }
+
+
+def get_page_order(columns: dict, pk_columns: list, sort_column: str = None) -> tuple:
+    """
+    Order columns of a table page, primary key columns breaking ties of sorted column
+    .. admonition:: Note
+        Pages seek on order columns only when table has a primary key and sorted column holds no NULL, as NULL
+        does not compare with a seek position. Other pages are fetched by offset.
+
+    :param columns: View column details of table
+    :param pk_columns: Primary key columns of table
+    :param sort_column: Sorted column, primary key order if not provided
+    :return: Tuple of order columns and whether pages seek on them
+    """
+    if sort_column and sort_column not in columns:
+        raise ValueError("Invalid sort column {}".format(sort_column))
+    order_list = ([sort_column] if sort_column else []) + [k for k in pk_columns if k != sort_column]
+    keyset = (bool(pk_columns) and all(k in columns for k in order_list) and
+              not columns[order_list[0]].get("nullable"))
+    return order_list, keyset
+
+
+def get_count_strategy(table: str) -> str:
+    """
+    Row count strategy of a table, per table override taking precedence over default strategy
+
+    :param table: Table name
+    :return: Count strategy, one of exact, estimate, cached or window
+    """
+    strategy = sct_count_strategy
+    for table_strategy in sct_count_strategy_tables.split(","):
+        if ":" in table_strategy and table_strategy.split(":")[0].strip() == table:
+            strategy = table_strategy.split(":")[1].strip()
+    strategy = strategy.lower()
+    return strategy if strategy in SCT_COUNT_STRATEGIES else "exact"
+
+
+def csv_chunks(header: list, row_batches, counter: dict = None):
+    """
+    Converts batches of rows to CSV text chunks, one chunk per batch
+
+    :param header: CSV header columns
+    :param row_batches: Iterable of row batches
+    :param counter: Dictionary whose rows key is updated with number of rows written
+    :return: Generator of CSV chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for rows in row_batches:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(rows)
+        if counter is not None:
+            counter["rows"] = counter.get("rows", 0) + len(rows)
+        yield buffer.getvalue()
+
+
+def get_audit_range(audit_from: str = None, audit_to: str = None) -> tuple:
+    """
+    Audit date range shown in audit page, last configured days unless a range is selected
+
+    :param audit_from: Oldest audit date (YYYY-MM-DD)
+    :param audit_to: Newest audit date (YYYY-MM-DD)
+    :return: Tuple of valid oldest and newest audit dates, None for no bound
+    """
+    audit_range = []
+    for audit_date in (audit_from, audit_to):
+        try:
+            audit_range.append(datetime.strptime(audit_date, "%Y-%m-%d").strftime("%Y-%m-%d") if audit_date else None)
+        except ValueError:
+            audit_range.append(None)
+    if audit_from is None and audit_to is None and sct_ui_audit_days > 0:
+        audit_range[0] = (datetime.now() - timedelta(days=sct_ui_audit_days)).strftime("%Y-%m-%d")
+    return tuple(audit_range)
+
+
+def get_search_filter(search_cols: list, search_ops: list, search_vals: list) -> list:
+    """
+    Compound search filter from column, operator and value lists of a search request, predicates missing column,
+    operator or value (besides null checks) being ignored
+
+    :param search_cols: Searched Table Columns
+    :param search_ops: Search Operations
+    :param search_vals: Search Values
+    :return: List of predicates (column, operator, value)
+    """
+    search_filter = []
+    for search_col, search_op, search_val in zip_longest(search_cols, search_ops, search_vals, fillvalue=""):
+        search_op = SCT_SEARCH_OPERATOR_ALIASES.get(search_op.strip().lower(), search_op.strip().lower())
+        if search_col and search_op and (search_val or search_op in SCT_SEARCH_NULL_OPERATORS):
+            search_filter.append((search_col.strip(), search_op, search_val))
+    return search_filter
+
+
+def is_text_type(col_type: str) -> bool:
+    """
+    Checks whether a column type holds character strings
+
+    :param col_type: Column data type
+    :return: True for text column type
+    """
+    return "char" in str(col_type).lower() or "text" in str(col_type).lower()
+
+
+def is_search_indexed(search_filter: list, indexed_columns: list, search_match: str = "all") -> bool:
+    """
+    Checks whether indexes can serve a compound search filter, that is one of its predicates when every predicate
+    must match, or each of them when any may match, being an indexable comparison on leading column of an index
+
+    :param search_filter: List of predicates (column, operator, value)
+    :param indexed_columns: Leading index columns of table
+    :param search_match: all to match every predicate, any to match at least one
+    :return: True if search does not need to scan whole table
+    """
+    indexed = [search_col in indexed_columns and search_op in SCT_SEARCH_INDEXED_OPERATORS
+               for search_col, search_op, _ in search_filter]
+    return bool(indexed) and (all(indexed) if search_match == "any" else any(indexed))
+
+
+def get_prefix_search_columns(search_filter: list, columns: dict, indexed_columns: list) -> list:
+    """
+    Columns whose like predicates of a compound search filter are matched as prefix, being text columns leading an
+    index
+
+    :param search_filter: List of predicates (column, operator, value)
+    :param columns: Column details of table, keyed by column name
+    :param indexed_columns: Leading index columns of table
+    :return: List of column names
+    """
+    return [search_col for search_col, search_op, _ in search_filter
+            if search_op == "like" and search_col in indexed_columns and search_col in columns and
+            is_text_type(columns[search_col].get("type"))]
+
+
+def build_search_condition(search_filter: list, columns: dict, placeholder: str, search_match: str = "all",
+                           indexed_columns: list = (), prefix_condition: str = None,
+                           contains_condition: str = None) -> tuple:
+    """
+    Compiles a compound search filter into a single parameterized search condition
+    .. admonition:: Note
+        Columns and operators are checked against table columns and supported operators, and values of numeric
+        columns are checked to be numbers, so only values reach query as arguments. like matches text columns
+        starting with value when column leads an index (as prefix condition, so index serves it), text columns
+        containing value otherwise and numeric columns equal to it, in and not in take comma separated values and
+        between two comma separated bounds.
+
+    :param search_filter: List of predicates (column, operator, value)
+    :param columns: Column details of table, keyed by column name
+    :param placeholder: Query argument placeholder of database
+    :param search_match: all to match every predicate, any to match at least one
+    :param indexed_columns: Leading index columns of table
+    :param prefix_condition: Prefix match condition of database, formatted with column and bound to value LIKE
+        pattern, preceded by value when condition has a lower bound placeholder too
+    :param contains_condition: Contains match condition of database, formatted with column and bound to value LIKE
+        pattern escaped with backslash, standard LIKE ESCAPE condition if not provided
+    :return: Tuple of search condition and query arguments
+    """
+    if search_match not in SCT_SEARCH_MATCHES:
+        raise ValueError("Invalid search match {}".format(search_match))
+    cond_list = []
+    qry_args = []
+    prefix_columns = get_prefix_search_columns(search_filter, columns, indexed_columns) if prefix_condition else []
+    for search_col, search_op, search_val in search_filter:
+        if search_col not in columns:
+            raise ValueError("Invalid search column {}".format(search_col))
+        if search_op not in SCT_SEARCH_OPERATORS:
+            raise ValueError("Invalid search operator {}".format(search_op))
+        if search_op in SCT_SEARCH_NULL_OPERATORS:
+            cond_list.append("{} {}".format(search_col, search_op))
+            continue
+
+        numeric = is_numeric_type(str(columns[search_col].get("type")))
+        values = ([v.strip() for v in next(csv.reader([search_val], skipinitialspace=True), [])]
+                  if search_op in ["in", "not in", "between"] else [search_val])
+        if search_op == "between" and len(values) != 2:
+            raise ValueError("Search between on column {} needs two values".format(search_col))
+        if not values:
+            raise ValueError("Search {} on column {} needs values".format(search_op, search_col))
+        if numeric:
+            for value in values:
+                try:
+                    float(value)
+                except ValueError:
+                    raise ValueError("Invalid numeric value {} for column {}".format(value, search_col))
+
+        if search_op == "like" and search_col in prefix_columns:
+            # Value is bound as lower bound of column only where planner of database can not range scan LIKE itself
+            prefix_args = [search_val, escape_like(search_val) + "%"]
+            cond_list.append(prefix_condition.format(search_col).strip())
+            qry_args.extend(prefix_args[-prefix_condition.count(placeholder):])
+        elif search_op == "like" and not numeric:
+            cond_list.append((contains_condition or "{{0}} LIKE {} ESCAPE '\\'".format(placeholder))
+                             .format(search_col).strip())
+            qry_args.append("%{}%".format(escape_like(search_val)))
+        elif search_op == "like":
+            cond_list.append("{} = {}".format(search_col, placeholder))
+            qry_args.append(search_val)
+        elif search_op in ["in", "not in"]:
+            cond_list.append("{} {} ({})".format(search_col, search_op, ",".join([placeholder] * len(values))))
+            qry_args.extend(values)
+        elif search_op == "between":
+            cond_list.append("{0} between {1} and {1}".format(search_col, placeholder))
+            qry_args.extend(values)
+        else:
+            cond_list.append("{} {} {}".format(search_col, search_op, placeholder))
+            qry_args.append(search_val)
+
+    if not cond_list:
+        raise ValueError("Search filter has no condition")
+    return SCT_SEARCH_MATCHES[search_match].join(["({})".format(c) for c in cond_list]), qry_args